@@ -1,15 +1,48 @@
 """Data layer for BalanceWheel."""
 
-from balancewheel.data.interfaces import AdjustType, DataProvider, DataRequest
-from balancewheel.data.repository import CsvRepository
+from balancewheel.data.batch import BatchResult, ProviderLimit, RetryPolicy
+from balancewheel.data.calendar import TradingCalendar, find_gaps
+from balancewheel.data.catalog import MetaCatalog
+from balancewheel.data.interfaces import AdjustType, DataProvider, DataRequest, Frequency
+from balancewheel.data.panel import Panel, build_panel
+from balancewheel.data.periods import resample_bars
+from balancewheel.data.quality import QualityReport, check_frames, check_panel
+from balancewheel.data.reconcile import ReconcileReport, ReconciliationError, Tolerance, reconcile
+from balancewheel.data.repository import CsvRepository, ParquetRepository, Repository
 from balancewheel.data.service import DataService
+from balancewheel.data.stats import PipelineStats
+from balancewheel.data.symbols import NotListedError, SymbolMaster
 from balancewheel.data.validation import validate_ohlcv
+from balancewheel.data.verification import VerificationPolicy
 
 __all__ = [
     "AdjustType",
+    "BatchResult",
     "DataProvider",
     "DataRequest",
+    "Frequency",
     "CsvRepository",
+    "MetaCatalog",
+    "NotListedError",
+    "Panel",
+    "ParquetRepository",
+    "PipelineStats",
+    "ProviderLimit",
+    "QualityReport",
+    "Repository",
+    "RetryPolicy",
+    "SymbolMaster",
     "DataService",
+    "ReconcileReport",
+    "ReconciliationError",
+    "Tolerance",
+    "TradingCalendar",
+    "VerificationPolicy",
+    "build_panel",
+    "check_frames",
+    "check_panel",
+    "find_gaps",
+    "reconcile",
+    "resample_bars",
     "validate_ohlcv",
 ]
@@ -1,12 +1,25 @@
-"""Run a quick schema normalization check."""
+"""Command line entry: schema check (default), refresh, symbol master, periods, stats and benchmarks."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
 
 import pandas as pd
 
+from balancewheel.data.bench import BENCH_CASES, PRESETS, compare_results, run_benchmarks, write_results
+from balancewheel.data.catalog import MetaCatalog
 from balancewheel.data.normalize import normalize_ohlcv
+from balancewheel.data.refresh import default_universe, load_universe, run_refresh
+from balancewheel.data.repository import CsvRepository, ParquetRepository
+from balancewheel.data.service import DataService
+from balancewheel.data.stats import breakdown
 from balancewheel.data.validation import validate_ohlcv
+from balancewheel.data.verification import VERIFY_MODES, VerificationPolicy
 
 
-def main() -> None:
+def check() -> None:
     sample = pd.DataFrame(
         {
             "date": ["2024-01-01"],
@@ -21,5 +34,222 @@ def main() -> None:
     print(normalized.dtypes)
 
 
+def stats(root: str, symbol: str | None = None, last: int | None = None) -> None:
+    """Print the stage breakdown and counters recorded with catalog writes."""
+    path = Path(root) / "_meta" / "catalog.sqlite"
+    if not path.exists():
+        raise SystemExit(f"No catalog under {root}")
+    runs = MetaCatalog(path).run_stats(symbol=symbol, limit=last)
+    if not runs:
+        print("No pipeline stats recorded")
+        return
+    counters: dict[str, float] = {}
+    for run in runs:
+        for name, value in run.get("counters", {}).items():
+            counters[name] = counters.get(name, 0) + value
+    table = breakdown(runs)
+    with pd.option_context("display.float_format", "{:.3f}".format, "display.width", 120):
+        print(f"{len(runs)} runs")
+        print(table.to_string(index=False))
+        if counters:
+            print()
+            print(pd.Series(counters, name="total").sort_index().to_string())
+
+
+def bench(
+    preset: str,
+    out: str,
+    symbols: list[int] | None = None,
+    years: list[int] | None = None,
+    cases: list[str] | None = None,
+    baseline: str | None = None,
+    threshold: float = 0.2,
+) -> int:
+    """Run the offline benchmarks; returns 1 when `baseline` shows a regression."""
+    sizes = PRESETS[preset]
+    results = run_benchmarks(
+        symbols=symbols or sizes["symbols"],
+        years=years or sizes["years"],
+        cases=cases or BENCH_CASES,
+        progress=lambda result: print(
+            f"{result.case:<17}{result.symbols:>6} symbols {result.years:>3}y "
+            f"{result.seconds:>9.3f}s {result.per_symbol_ms:>9.3f} ms/symbol"
+        ),
+    )
+    path = write_results(results, out)
+    print(f"Results written to {path}")
+    if baseline is None:
+        return 0
+    table = compare_results(baseline, path, threshold)
+    with pd.option_context("display.float_format", "{:.3f}".format, "display.width", 120):
+        print(table.to_string(index=False))
+    return int(table["regressed"].any())
+
+
+def refresh(
+    root: str,
+    storage: str = "csv",
+    universe: str | None = None,
+    provider: str = "akshare",
+    start: str = "20100101",
+    end: str | None = None,
+    adjust: str = "none",
+    workers: int = 8,
+    max_attempts: int = 3,
+    retry_delay: float = 60.0,
+    deadline: str | None = None,
+    restart: bool = False,
+    verify: str = "full",
+    verify_rate: float = 0.1,
+) -> int:
+    """Refresh the universe with the akshare/baostock providers; returns 1 if tasks failed."""
+    from balancewheel.data.providers import AkshareProvider, BaostockProvider
+
+    repository = ParquetRepository(root) if storage == "parquet" else CsvRepository(root)
+    service = DataService(
+        {"akshare": AkshareProvider(), "baostock": BaostockProvider()},
+        repository,
+        verification=VerificationPolicy(mode=verify, rate=verify_rate),
+    )
+    series = load_universe(universe) if universe else default_universe(repository)
+    try:
+        counts = run_refresh(
+            service,
+            series,
+            provider,
+            start=start,
+            end=end,
+            adjust=adjust,
+            workers=workers,
+            max_attempts=max_attempts,
+            retry_delay=retry_delay,
+            deadline=_deadline(deadline),
+            restart=restart,
+            progress=lambda counts: print(" ".join(f"{key}={value}" for key, value in sorted(counts.items()))),
+        )
+    finally:
+        service.close()
+    print(f"Refresh finished: {counts}")
+    return int(bool(counts.get("failed")))
+
+
+def update_symbols(root: str, provider: str = "baostock") -> None:
+    """Download the security list into `<root>/_meta/symbols.csv`."""
+    from balancewheel.data.providers import AkshareProvider, BaostockProvider
+
+    providers = {"akshare": AkshareProvider(), "baostock": BaostockProvider()}
+    service = DataService(providers, CsvRepository(root))
+    try:
+        symbols = service.update_symbols(provider)
+    finally:
+        service.close()
+    print(symbols.frame.groupby(["asset_type", "board"]).size().to_string())
+
+
+def rebuild_periods(root: str, storage: str = "csv") -> None:
+    """Rebuild the weekly and monthly bars of every stored daily series."""
+    repository = ParquetRepository(root) if storage == "parquet" else CsvRepository(root)
+    service = DataService({}, repository)
+    try:
+        count = service.rebuild_periods()
+    finally:
+        service.close()
+    print(f"Rebuilt weekly and monthly bars of {count} series")
+
+
+def _deadline(value: str | None) -> pd.Timestamp | None:
+    """Next occurrence of a HH:MM wall-clock time."""
+    if value is None:
+        return None
+    now = pd.Timestamp.now()
+    deadline = pd.Timestamp(f"{now:%Y-%m-%d} {value}")
+    return deadline if deadline > now else deadline + pd.Timedelta(days=1)
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m balancewheel.data")
+    commands = parser.add_subparsers(dest="command")
+    stats_parser = commands.add_parser("stats", help="per-stage timings recorded in the catalog")
+    stats_parser.add_argument("--root", default="data", help="repository root")
+    stats_parser.add_argument("--symbol", help="only runs of this symbol")
+    stats_parser.add_argument("--last", type=int, help="only the most recent N runs")
+    refresh_parser = commands.add_parser("refresh", help="resumable refresh of missing and stale series")
+    refresh_parser.add_argument("--root", default="data", help="repository root")
+    refresh_parser.add_argument("--storage", choices=["csv", "parquet"], default="csv")
+    refresh_parser.add_argument("--universe", help="CSV with symbol and asset_type columns")
+    refresh_parser.add_argument("--provider", default="akshare", help="primary provider")
+    refresh_parser.add_argument("--start", default="20100101", help="history start for missing series")
+    refresh_parser.add_argument(
+        "--end", help="last date to fetch (default: resume the unfinished job's end, else today)"
+    )
+    refresh_parser.add_argument("--adjust", choices=["none", "qfq", "hfq"], default="none")
+    refresh_parser.add_argument("--workers", type=int, default=8)
+    refresh_parser.add_argument("--max-attempts", type=int, default=3)
+    refresh_parser.add_argument("--retry-delay", type=float, default=60.0, help="seconds, doubled per attempt")
+    refresh_parser.add_argument("--deadline", help="stop claiming new work at HH:MM")
+    refresh_parser.add_argument("--restart", action="store_true", help="re-plan instead of resuming")
+    refresh_parser.add_argument("--verify", choices=VERIFY_MODES, default="full", help="cross-validation policy")
+    refresh_parser.add_argument("--verify-rate", type=float, default=0.1, help="share of symbols sampled")
+    symbols_parser = commands.add_parser("symbols", help="download the symbol master")
+    symbols_parser.add_argument("--root", default="data", help="repository root")
+    symbols_parser.add_argument("--provider", default="baostock")
+    periods_parser = commands.add_parser("periods", help="rebuild weekly and monthly bars")
+    periods_parser.add_argument("--root", default="data", help="repository root")
+    periods_parser.add_argument("--storage", choices=["csv", "parquet"], default="csv")
+    bench_parser = commands.add_parser("bench", help="offline benchmarks on synthetic data")
+    bench_parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    bench_parser.add_argument("--symbols", type=_int_list, help="comma separated symbol counts")
+    bench_parser.add_argument("--years", type=_int_list, help="comma separated history lengths")
+    bench_parser.add_argument("--cases", type=lambda value: value.split(","), help=",".join(BENCH_CASES))
+    bench_parser.add_argument("--out", default="bench.json", help="JSON results file")
+    bench_parser.add_argument("--baseline", help="earlier results file to compare against")
+    bench_parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown ratio")
+    args = parser.parse_args(argv)
+
+    if args.command == "stats":
+        stats(args.root, symbol=args.symbol, last=args.last)
+    elif args.command == "refresh":
+        sys.exit(
+            refresh(
+                args.root,
+                storage=args.storage,
+                universe=args.universe,
+                provider=args.provider,
+                start=args.start,
+                end=args.end,
+                adjust=args.adjust,
+                workers=args.workers,
+                max_attempts=args.max_attempts,
+                retry_delay=args.retry_delay,
+                deadline=args.deadline,
+                restart=args.restart,
+                verify=args.verify,
+                verify_rate=args.verify_rate,
+            )
+        )
+    elif args.command == "symbols":
+        update_symbols(args.root, args.provider)
+    elif args.command == "periods":
+        rebuild_periods(args.root, args.storage)
+    elif args.command == "bench":
+        sys.exit(
+            bench(
+                args.preset,
+                args.out,
+                symbols=args.symbols,
+                years=args.years,
+                cases=args.cases,
+                baseline=args.baseline,
+                threshold=args.threshold,
+            )
+        )
+    else:
+        check()
+
+
 if __name__ == "__main__":
     main()
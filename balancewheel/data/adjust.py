@@ -0,0 +1,61 @@
+"""Derive forward/backward adjusted prices from unadjusted bars and factors."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from balancewheel.data.normalize import PRICE_COLUMNS
+
+FACTOR_COLUMNS = ["datetime", "factor"]
+
+
+def normalize_factors(frame: pd.DataFrame) -> pd.DataFrame:
+    """Coerce a factor table to sorted, unique (datetime, factor) rows.
+
+    `factor` is the cumulative backward (hfq) factor effective from `datetime`
+    on: hfq price = unadjusted price × factor.
+    """
+    data = pd.DataFrame(
+        {
+            "datetime": pd.to_datetime(frame["datetime"]).to_numpy(dtype="datetime64[ns]"),
+            "factor": pd.to_numeric(frame["factor"], errors="coerce").to_numpy(dtype="float64"),
+        }
+    )
+    data = data[data["factor"].notna() & (data["factor"] > 0)]
+    data = data.sort_values("datetime", kind="stable").drop_duplicates("datetime", keep="last")
+    return data.reset_index(drop=True)
+
+
+def factor_values(dates: pd.Series | np.ndarray, factors: pd.DataFrame) -> np.ndarray:
+    """Factor in effect on each date (1.0 before the first ex-date)."""
+    dates = np.asarray(dates, dtype="datetime64[ns]")
+    if factors.empty:
+        return np.ones(len(dates))
+    ex_dates = factors["datetime"].to_numpy(dtype="datetime64[ns]")
+    values = factors["factor"].to_numpy(dtype="float64")
+    positions = np.searchsorted(ex_dates, dates, side="right") - 1
+    return np.where(positions >= 0, values[np.maximum(positions, 0)], 1.0)
+
+
+def apply_adjustment(data: pd.DataFrame, factors: pd.DataFrame, adjust: str) -> pd.DataFrame:
+    """Return `data` with prices adjusted to `adjust` ("none", "qfq" or "hfq").
+
+    qfq is anchored at the latest factor, so it equals what a provider would
+    return today; volume and amount are left unadjusted, as providers do.
+    """
+    if adjust == "none":
+        return data
+    if adjust not in ("qfq", "hfq"):
+        raise ValueError(f"Unsupported adjust value: {adjust}")
+
+    scale = factor_values(data["datetime"], factors)
+    if adjust == "qfq" and not factors.empty:
+        scale = scale / factors["factor"].iloc[-1]
+    columns = {}
+    for column in data.columns:
+        values = data[column]
+        if column in PRICE_COLUMNS:
+            values = values.to_numpy(dtype="float64") * scale
+        columns[column] = values
+    return pd.DataFrame(columns, index=data.index)
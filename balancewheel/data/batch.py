@@ -0,0 +1,134 @@
+"""Concurrency, rate limiting and retry helpers for batch fetching."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, TypeVar
+
+import pandas as pd
+
+from balancewheel.data.interfaces import DataRequest
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ProviderLimit:
+    """Per-provider concurrency and request-rate limits."""
+
+    max_concurrency: int = 4
+    rate: float | None = None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff for transient provider errors.
+
+    `NotImplementedError` (a `RuntimeError`) is never retried.
+    """
+
+    attempts: int = 3
+    backoff: float = 1.0
+    max_backoff: float = 30.0
+    retry_on: tuple[type[BaseException], ...] = (OSError, RuntimeError)
+
+    def delay(self, attempt: int) -> float:
+        return min(self.backoff * (2 ** attempt), self.max_backoff)
+
+
+class RateLimiter:
+    """Space calls at least `1 / rate` seconds apart across threads."""
+
+    def __init__(self, rate: float | None) -> None:
+        self.interval = 0.0 if not rate else 1.0 / rate
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class ProviderGate:
+    """Bound concurrency, rate and retries for calls to a single provider."""
+
+    def __init__(self, limit: ProviderLimit, retry: RetryPolicy) -> None:
+        self.retry = retry
+        self.retries = 0
+        self._semaphore = threading.BoundedSemaphore(max(limit.max_concurrency, 1))
+        self._limiter = RateLimiter(limit.rate)
+
+    def call(self, func: Callable[[], T], on_retry: Callable[[], None] | None = None) -> T:
+        attempts = max(self.retry.attempts, 1)
+        for attempt in range(attempts):
+            try:
+                with self._semaphore:
+                    self._limiter.wait()
+                    return func()
+            except NotImplementedError:
+                # 数据源未实现的可选接口不是瞬时错误，重试只会白白等待
+                raise
+            except self.retry.retry_on:
+                if attempt == attempts - 1:
+                    raise
+                self.retries += 1
+                if on_retry is not None:
+                    on_retry()
+                time.sleep(self.retry.delay(attempt))
+        raise AssertionError("unreachable")
+
+
+@dataclass
+class BatchResult:
+    """Per-request outcome of a batch fetch."""
+
+    # 日线为保存的 DataFrame，分钟线为写入的行数
+    results: dict[DataRequest, pd.DataFrame | int] = field(default_factory=dict)
+    errors: dict[DataRequest, Exception] = field(default_factory=dict)
+    # 完全落在上市区间之外、未请求数据源的请求
+    skipped: list[DataRequest] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def summary(self) -> pd.DataFrame:
+        rows = [
+            {
+                "symbol": request.symbol,
+                "asset_type": request.asset_type,
+                "status": "ok",
+                "rows": data if isinstance(data, int) else len(data),
+                "error": None,
+            }
+            for request, data in self.results.items()
+        ]
+        rows.extend(
+            {
+                "symbol": request.symbol,
+                "asset_type": request.asset_type,
+                "status": "error",
+                "rows": 0,
+                "error": f"{type(error).__name__}: {error}",
+            }
+            for request, error in self.errors.items()
+        )
+        rows.extend(
+            {
+                "symbol": request.symbol,
+                "asset_type": request.asset_type,
+                "status": "skipped",
+                "rows": 0,
+                "error": None,
+            }
+            for request in self.skipped
+        )
+        return pd.DataFrame(rows, columns=["symbol", "asset_type", "status", "rows", "error"])
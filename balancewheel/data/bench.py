@@ -0,0 +1,272 @@
+"""Offline benchmarks of the data layer hot paths on synthetic histories."""
+
+from __future__ import annotations
+
+import json
+import platform
+import shutil
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from balancewheel.data.interfaces import DataProvider, DataRequest
+from balancewheel.data.normalize import normalize_ohlcv
+from balancewheel.data.periods import resample_bars
+from balancewheel.data.providers.baostock_provider import frame_from_rows
+from balancewheel.data.repository import CsvRepository, file_fingerprint
+from balancewheel.data.service import DataService
+from balancewheel.data.validation import validate_ohlcv
+
+BENCH_CASES = ("normalize", "validate", "cross_validation", "save", "fingerprint", "periods")
+
+PRESETS = {
+    "quick": {"symbols": (1, 10, 100), "years": (1, 5)},
+    "full": {"symbols": (1, 100, 1000, 10000), "years": (1, 5, 20)},
+}
+
+SESSIONS_PER_YEAR = 242
+
+# 合成数据的不同样本数；更多标的循环复用，避免为 10000 个标的常驻内存
+TEMPLATES = 16
+
+_AKSHARE_COLUMNS = ["日期", "开盘", "收盘", "最高", "最低", "成交量", "成交额", "振幅", "涨跌幅", "涨跌额", "换手率"]
+_BAOSTOCK_FIELDS = ["date", "open", "high", "low", "close", "volume", "amount"]
+
+
+@dataclass
+class BenchResult:
+    case: str
+    symbols: int
+    years: int
+    rows: int
+    seconds: float
+
+    @property
+    def per_symbol_ms(self) -> float:
+        return self.seconds / self.symbols * 1000
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else float("inf")
+
+    def to_dict(self) -> dict:
+        return {
+            **asdict(self),
+            "per_symbol_ms": round(self.per_symbol_ms, 4),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+def synthetic_bars(years: int, seed: int, end: str = "20251231") -> pd.DataFrame:
+    """A random-walk daily history in the normalized schema (volume in 手)."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=end, periods=years * SESSIONS_PER_YEAR)
+    close = np.round(10.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, len(dates)))), 2)
+    previous = np.concatenate([[close[0]], close[:-1]])
+    open_ = np.round(previous * (1 + rng.normal(0.0, 0.005, len(dates))), 2)
+    high = np.round(np.maximum(open_, close) * (1 + rng.uniform(0.0, 0.02, len(dates))), 2)
+    low = np.round(np.minimum(open_, close) * (1 - rng.uniform(0.0, 0.02, len(dates))), 2)
+    lots = rng.integers(10_000, 2_000_000, len(dates))
+    return pd.DataFrame(
+        {
+            "datetime": dates,
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": lots,
+            "amount": np.round(lots * 100 * close, 2),
+            "amplitude": np.round((high - low) / previous * 100, 2),
+            "change_pct": np.round((close / previous - 1) * 100, 2),
+            "change": np.round(close - previous, 2),
+            "turnover": np.round(rng.uniform(0.1, 5.0, len(dates)), 2),
+        }
+    )
+
+
+def akshare_frame(bars: pd.DataFrame) -> pd.DataFrame:
+    """Bars shaped like `ak.stock_zh_a_hist`: Chinese headers, string dates, volume in 手."""
+    frame = pd.DataFrame(
+        {
+            "日期": bars["datetime"].dt.strftime("%Y-%m-%d"),
+            "开盘": bars["open"],
+            "收盘": bars["close"],
+            "最高": bars["high"],
+            "最低": bars["low"],
+            "成交量": bars["volume"],
+            "成交额": bars["amount"],
+            "振幅": bars["amplitude"],
+            "涨跌幅": bars["change_pct"],
+            "涨跌额": bars["change"],
+            "换手率": bars["turnover"],
+        }
+    )
+    return frame[_AKSHARE_COLUMNS]
+
+
+def baostock_rows(bars: pd.DataFrame) -> list[list[str]]:
+    """Bars as baostock result rows: every field a string, volume in shares."""
+    columns = [
+        bars["datetime"].dt.strftime("%Y-%m-%d").tolist(),
+        *(bars[column].map("{:.4f}".format).tolist() for column in ["open", "high", "low", "close"]),
+        (bars["volume"] * 100).astype(str).tolist(),
+        bars["amount"].map("{:.4f}".format).tolist(),
+    ]
+    return [list(row) for row in zip(*columns)]
+
+
+class StubProvider(DataProvider):
+    """Offline provider serving synthetic histories in a provider-native shape.
+
+    `shape` is "akshare" (frame with Chinese columns, volume in 手) or
+    "baostock" (string rows parsed with `frame_from_rows` on every call, as
+    the real session does). Symbols cycle through `TEMPLATES` histories.
+    """
+
+    def __init__(self, shape: str, years: int) -> None:
+        if shape not in ("akshare", "baostock"):
+            raise ValueError(f"Unknown provider shape: {shape}")
+        self.name = shape
+        self.shape = shape
+        bars = [synthetic_bars(years, seed) for seed in range(TEMPLATES)]
+        if shape == "akshare":
+            self._frames = [akshare_frame(frame) for frame in bars]
+        else:
+            self._rows = [baostock_rows(frame) for frame in bars]
+
+    def volume_multiplier(self, asset_type: str) -> int:
+        return 100 if self.shape == "akshare" else 1
+
+    def fetch_daily_ohlcv(self, request: DataRequest) -> pd.DataFrame:
+        index = int(request.symbol) % TEMPLATES
+        if self.shape == "akshare":
+            return self._frames[index].copy()
+        return frame_from_rows(self._rows[index], _BAOSTOCK_FIELDS)
+
+
+def run_benchmarks(
+    symbols: Sequence[int] = PRESETS["quick"]["symbols"],
+    years: Sequence[int] = PRESETS["quick"]["years"],
+    cases: Iterable[str] = BENCH_CASES,
+    root: str | Path | None = None,
+    progress: Callable[[BenchResult], None] | None = None,
+) -> list[BenchResult]:
+    """Time each case over every (symbols, years) size.
+
+    Only the measured call is timed; synthetic data is generated up front and
+    files written by `save` are removed once fingerprinted. CSV files go to a
+    temporary directory unless `root` is given.
+    """
+    cases = list(cases)
+    unknown = set(cases) - set(BENCH_CASES)
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {sorted(unknown)}")
+
+    workdir = Path(tempfile.mkdtemp(prefix="balancewheel-bench-", dir=root))
+    results = []
+    try:
+        for year_count in years:
+            akshare = StubProvider("akshare", year_count)
+            baostock = StubProvider("baostock", year_count)
+            raw = [
+                akshare.fetch_daily_ohlcv(DataRequest(f"{i:06d}", "stock", "20000101", "20251231"))
+                for i in range(TEMPLATES)
+            ]
+            normalized = [normalize_ohlcv(frame, volume_multiplier=100) for frame in raw]
+            for symbol_count in symbols:
+                service = DataService(
+                    {"akshare": akshare, "baostock": baostock},
+                    CsvRepository(workdir / f"{year_count}y_{symbol_count}"),
+                    calendar=None,
+                    instrument=False,
+                )
+                try:
+                    for case in cases:
+                        seconds, rows = _time_case(case, service, raw, normalized, symbol_count)
+                        result = BenchResult(case, symbol_count, year_count, rows, seconds)
+                        results.append(result)
+                        if progress is not None:
+                            progress(result)
+                finally:
+                    service.close()
+                    shutil.rmtree(service.repository.root, ignore_errors=True)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def write_results(results: Sequence[BenchResult], path: str | Path) -> Path:
+    """Write results with environment details as JSON for later comparison."""
+    path = Path(path)
+    payload = {
+        "created": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+        },
+        "results": [result.to_dict() for result in results],
+    }
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return path
+
+
+def compare_results(baseline: str | Path, current: str | Path, threshold: float = 0.2) -> pd.DataFrame:
+    """Join two result files on (case, symbols, years) and flag slowdowns.
+
+    `ratio` is current over baseline seconds; rows with a ratio above
+    `1 + threshold` are marked `regressed`.
+    """
+    keys = ["case", "symbols", "years"]
+    old = _load_results(baseline)[[*keys, "seconds"]]
+    new = _load_results(current)[[*keys, "seconds"]]
+    table = old.merge(new, on=keys, suffixes=("_baseline", "_current"))
+    table["ratio"] = table["seconds_current"] / table["seconds_baseline"]
+    table["regressed"] = table["ratio"] > 1 + threshold
+    return table
+
+
+def _load_results(path: str | Path) -> pd.DataFrame:
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    return pd.DataFrame(payload["results"])
+
+
+def _time_case(
+    case: str,
+    service: DataService,
+    raw: list[pd.DataFrame],
+    normalized: list[pd.DataFrame],
+    symbol_count: int,
+) -> tuple[float, int]:
+    repository = service.repository
+    elapsed = 0.0
+    rows = 0
+    for i in range(symbol_count):
+        symbol = f"{i:06d}"
+        frame = normalized[i % TEMPLATES]
+        path = repository.save(symbol, "stock", frame) if case == "fingerprint" else None
+        started = time.perf_counter()
+        if case == "normalize":
+            normalize_ohlcv(raw[i % TEMPLATES], volume_multiplier=100)
+        elif case == "validate":
+            validate_ohlcv(frame)
+        elif case == "cross_validation":
+            service._fetch_with_cross_validation(DataRequest(symbol, "stock", "20000101", "20251231"), "akshare")
+        elif case == "save":
+            path = repository.save(symbol, "stock", frame)
+        elif case == "periods":
+            resample_bars(frame, "w")
+            resample_bars(frame, "m")
+        else:
+            file_fingerprint(path)
+        elapsed += time.perf_counter() - started
+        rows += len(frame)
+        if path is not None:
+            path.unlink()
+    return elapsed, rows
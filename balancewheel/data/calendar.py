@@ -0,0 +1,197 @@
+"""A-share trading calendar with precomputed session lookups."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from balancewheel.data.repository import Repository
+
+CALENDAR_FILE = "calendar.csv"
+
+GAP_COLUMNS = [
+    "asset_type",
+    "symbol",
+    "first_date",
+    "last_date",
+    "expected",
+    "stored",
+    "missing",
+    "off_calendar",
+]
+
+
+class TradingCalendar:
+    """Sorted SSE/SZSE trading sessions with O(1) date → session lookups.
+
+    A day-offset table covering [first, last] is built once, so mapping any
+    array of dates to session positions is a single vectorized lookup instead
+    of a search or set operation per date.
+    """
+
+    def __init__(self, sessions: Sequence | pd.DatetimeIndex) -> None:
+        days = np.unique(pd.DatetimeIndex(sessions).to_numpy(dtype="datetime64[D]"))
+        if not len(days):
+            raise ValueError("Trading calendar needs at least one session")
+        self._days = days
+        self._base = days[0]
+        offsets = (days - self._base).astype("int64")
+        span = int(offsets[-1]) + 1
+        # 每个自然日 -> 当日交易日序号（非交易日为 -1）以及不早于当日的首个交易日序号
+        self._index = np.full(span, -1, dtype="int64")
+        self._index[offsets] = np.arange(len(days))
+        self._next = np.searchsorted(offsets, np.arange(span), side="left")
+        self.sessions = pd.DatetimeIndex(days.astype("datetime64[ns]"))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "TradingCalendar":
+        frame = pd.read_csv(path, parse_dates=["datetime"])
+        return cls(frame["datetime"])
+
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame({"datetime": self.sessions.strftime("%Y-%m-%d")}).to_csv(path, index=False)
+        return path
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    @property
+    def first(self) -> pd.Timestamp:
+        return self.sessions[0]
+
+    @property
+    def last(self) -> pd.Timestamp:
+        return self.sessions[-1]
+
+    def covers(self, date: str | pd.Timestamp) -> bool:
+        """Whether `date` falls inside the stored calendar range."""
+        return self.first <= pd.Timestamp(date) <= self.last
+
+    def session_index(self, dates: Sequence | pd.Series | np.ndarray) -> np.ndarray:
+        """Session position of each date; -1 for non-trading or out-of-range days."""
+        offsets = self._offsets(dates)
+        inside = (offsets >= 0) & (offsets < len(self._index))
+        result = np.full(offsets.shape, -1, dtype="int64")
+        result[inside] = self._index[offsets[inside]]
+        return result
+
+    def is_session(self, dates: Sequence | pd.Series | np.ndarray) -> np.ndarray:
+        return self.session_index(dates) >= 0
+
+    def next_index(self, dates: Sequence | pd.Series | np.ndarray) -> np.ndarray:
+        """Position of the first session on or after each date (len(self) past the end)."""
+        offsets = self._offsets(dates)
+        clipped = np.clip(offsets, 0, len(self._next) - 1)
+        result = self._next[clipped]
+        result[offsets < 0] = 0
+        result[offsets >= len(self._next)] = len(self)
+        return result
+
+    def sessions_in_range(
+        self, start: str | pd.Timestamp | None = None, end: str | pd.Timestamp | None = None
+    ) -> pd.DatetimeIndex:
+        return self.sessions[self._range(start, end)]
+
+    def next_session(self, date: str | pd.Timestamp) -> pd.Timestamp | None:
+        """First session strictly after `date`, or None past the end of the calendar."""
+        position = int(self.next_index([pd.Timestamp(date) + pd.Timedelta(days=1)])[0])
+        return self.sessions[position] if position < len(self) else None
+
+    def previous_session(self, date: str | pd.Timestamp) -> pd.Timestamp | None:
+        """Last session strictly before `date`, or None before the start of the calendar."""
+        position = int(self.next_index([date])[0]) - 1
+        return self.sessions[position] if position >= 0 else None
+
+    def missing_sessions(
+        self,
+        dates: Sequence | pd.Series | np.ndarray,
+        start: str | pd.Timestamp | None = None,
+        end: str | pd.Timestamp | None = None,
+    ) -> pd.DatetimeIndex:
+        """Sessions in [start, end] (default: the span of `dates`) absent from `dates`."""
+        indices = self.session_index(dates)
+        window = self._range(start, end) if start is not None or end is not None else None
+        if window is None:
+            known = indices[indices >= 0]
+            if not len(known):
+                return pd.DatetimeIndex([])
+            window = slice(int(known.min()), int(known.max()) + 1)
+        present = np.zeros(len(self), dtype=bool)
+        present[indices[indices >= 0]] = True
+        positions = np.flatnonzero(~present[window]) + window.start
+        return self.sessions[positions]
+
+    def reindex(
+        self,
+        values: np.ndarray,
+        dates: Sequence | pd.Series | np.ndarray,
+        start: str | pd.Timestamp | None = None,
+        end: str | pd.Timestamp | None = None,
+        fill: float = np.nan,
+    ) -> tuple[pd.DatetimeIndex, np.ndarray]:
+        """Place rows of `values` (aligned with `dates`) onto the sessions in [start, end].
+
+        Works on 1-D series and 2-D date × symbol arrays; sessions without a row
+        are filled with `fill` and rows on non-session dates are dropped.
+        """
+        values = np.asarray(values)
+        window = self._range(start, end)
+        indices = self.session_index(dates) - window.start
+        keep = (indices >= 0) & (indices < window.stop - window.start)
+        dtype = np.result_type(values.dtype, np.asarray(fill).dtype)
+        result = np.full((window.stop - window.start, *values.shape[1:]), fill, dtype=dtype)
+        result[indices[keep]] = values[keep]
+        return self.sessions[window], result
+
+    def _offsets(self, dates: Sequence | pd.Series | np.ndarray) -> np.ndarray:
+        days = pd.DatetimeIndex(np.asarray(dates)).to_numpy(dtype="datetime64[D]")
+        return (days - self._base).astype("int64")
+
+    def _range(
+        self, start: str | pd.Timestamp | None, end: str | pd.Timestamp | None
+    ) -> slice:
+        lo = 0 if start is None else int(self.next_index([pd.Timestamp(start)])[0])
+        hi = len(self) if end is None else int(self.next_index([pd.Timestamp(end) + pd.Timedelta(days=1)])[0])
+        return slice(lo, max(lo, hi))
+
+
+def load_calendar(repository: Repository) -> TradingCalendar | None:
+    """Calendar stored under the repository's `_meta`, if one has been fetched."""
+    path = repository.meta_root / CALENDAR_FILE
+    return TradingCalendar.load(path) if path.exists() else None
+
+
+def find_gaps(
+    repository: Repository,
+    calendar: TradingCalendar,
+    series: Sequence[tuple[str, str]] | None = None,
+) -> pd.DataFrame:
+    """Count sessions missing between the first and last stored date of each series.
+
+    `series` is a list of (asset_type, symbol) and defaults to every series in
+    the repository. `off_calendar` counts stored rows on non-session dates.
+    """
+    rows = []
+    for asset_type, symbol in series if series is not None else repository.list_series():
+        dates = repository.load(symbol, asset_type, columns=["datetime"])["datetime"]
+        indices = calendar.session_index(dates.to_numpy())
+        known = np.unique(indices[indices >= 0])
+        expected = int(known[-1] - known[0] + 1) if len(known) else 0
+        rows.append(
+            {
+                "asset_type": asset_type,
+                "symbol": symbol,
+                "first_date": dates.iloc[0] if len(dates) else pd.NaT,
+                "last_date": dates.iloc[-1] if len(dates) else pd.NaT,
+                "expected": expected,
+                "stored": len(dates),
+                "missing": expected - len(known),
+                "off_calendar": int((indices < 0).sum()),
+            }
+        )
+    return pd.DataFrame(rows, columns=GAP_COLUMNS)
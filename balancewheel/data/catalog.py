@@ -0,0 +1,245 @@
+"""SQLite-backed catalog of stored series metadata."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import pandas as pd
+
+CATALOG_FIELDS = [
+    "timestamp",
+    "symbol",
+    "asset_type",
+    "adjust",
+    "source",
+    "path",
+    "start",
+    "end",
+    "rows",
+    "first_date",
+    "last_date",
+    "fingerprint",
+]
+
+_COLUMNS_SQL = """
+    timestamp TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    asset_type TEXT NOT NULL,
+    adjust TEXT NOT NULL,
+    source TEXT,
+    path TEXT,
+    start TEXT,
+    "end" TEXT,
+    rows INTEGER,
+    first_date TEXT,
+    last_date TEXT,
+    fingerprint TEXT,
+    extra TEXT
+"""
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS series_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    {_COLUMNS_SQL}
+);
+CREATE TABLE IF NOT EXISTS series_current (
+    {_COLUMNS_SQL},
+    PRIMARY KEY (symbol, asset_type, adjust)
+);
+CREATE INDEX IF NOT EXISTS idx_history_series ON series_history (symbol, asset_type, adjust, id);
+CREATE INDEX IF NOT EXISTS idx_history_fingerprint ON series_history (fingerprint);
+CREATE INDEX IF NOT EXISTS idx_current_last_date ON series_current (last_date);
+CREATE INDEX IF NOT EXISTS idx_current_fingerprint ON series_current (fingerprint);
+"""
+
+_QUOTED = ", ".join(f'"{field}"' for field in [*CATALOG_FIELDS, "extra"])
+_PLACEHOLDERS = ", ".join("?" for _ in range(len(CATALOG_FIELDS) + 1))
+
+
+class MetaCatalog:
+    """Latest state and full history of every stored series.
+
+    `series_current` holds one row per (symbol, asset_type, adjust) and
+    `series_history` every record ever written. Writes made inside
+    `transaction()` are buffered and committed atomically when the outermost
+    block exits, from whichever threads produced them.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._pending: list[dict] = []
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator["MetaCatalog"]:
+        with self._lock:
+            self._depth += 1
+        try:
+            yield self
+        except BaseException:
+            with self._lock:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._pending.clear()
+            raise
+        with self._lock:
+            self._depth -= 1
+            if self._depth == 0:
+                pending, self._pending = self._pending, []
+                self._write(pending)
+
+    def record(self, record: dict) -> None:
+        self.record_many([record])
+
+    def record_many(self, records: Iterable[dict]) -> None:
+        rows = [normalize_record(record) for record in records]
+        with self._lock:
+            if self._depth:
+                self._pending.extend(rows)
+            else:
+                self._write(rows)
+
+    def latest(self, symbol: str, asset_type: str, adjust: str) -> dict | None:
+        with self._lock:
+            for record in reversed(self._pending):
+                if (record["symbol"], record["asset_type"], record["adjust"]) == (symbol, asset_type, adjust):
+                    return _row_to_record(record)
+            row = self._conn.execute(
+                "SELECT * FROM series_current WHERE symbol = ? AND asset_type = ? AND adjust = ?",
+                (symbol, asset_type, adjust),
+            ).fetchone()
+        return None if row is None else _row_to_record(row)
+
+    def history(self, symbol: str, asset_type: str, adjust: str) -> pd.DataFrame:
+        return self._query(
+            "SELECT * FROM series_history WHERE symbol = ? AND asset_type = ? AND adjust = ? ORDER BY id",
+            (symbol, asset_type, adjust),
+        )
+
+    def current(self) -> pd.DataFrame:
+        return self._query("SELECT * FROM series_current ORDER BY asset_type, symbol, adjust")
+
+    def stale(self, as_of: str) -> pd.DataFrame:
+        """Series whose last stored date is before `as_of`."""
+        return self._query(
+            "SELECT * FROM series_current WHERE last_date < ? ORDER BY last_date",
+            (_iso(as_of),),
+        )
+
+    def coverage_gaps(self, start: str, end: str) -> pd.DataFrame:
+        """Series whose stored range does not cover [start, end]."""
+        return self._query(
+            "SELECT * FROM series_current "
+            "WHERE COALESCE(first_date, '') > ? OR COALESCE(last_date, '') < ? "
+            "ORDER BY asset_type, symbol",
+            (_iso(start), _iso(end)),
+        )
+
+    def find_fingerprint(self, fingerprint: str) -> pd.DataFrame:
+        return self._query(
+            "SELECT * FROM series_history WHERE fingerprint = ? ORDER BY id", (fingerprint,)
+        )
+
+    def run_stats(self, symbol: str | None = None, limit: int | None = None) -> list[dict]:
+        """Pipeline stats recorded with the most recent writes, newest first."""
+        sql = "SELECT extra FROM series_history WHERE extra LIKE '%\"stats\"%'"
+        params: tuple = ()
+        if symbol is not None:
+            sql += " AND symbol = ?"
+            params = (symbol,)
+        sql += " ORDER BY id DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(row["extra"])["stats"] for row in rows]
+
+    def fingerprint_for(self, filename: str) -> str | None:
+        """Latest fingerprint recorded for a stored file name."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, fingerprint FROM series_current WHERE path LIKE ?",
+                (f"%{filename}",),
+            ).fetchall()
+        for row in rows:
+            if record_filename(row["path"]) == filename:
+                return row["fingerprint"]
+        return None
+
+    def import_manifest(self, manifest_path: str | Path) -> int:
+        """Load records from a legacy `manifest.jsonl`; returns the number imported."""
+        manifest_path = Path(manifest_path)
+        if not manifest_path.exists():
+            return 0
+        with manifest_path.open("r", encoding="utf-8") as handle:
+            records = [json.loads(line) for line in handle if line.strip()]
+        self.record_many(records)
+        return len(records)
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM series_history LIMIT 1").fetchone() is None
+
+    def _write(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+        values = [
+            [row.get(field) for field in CATALOG_FIELDS] + [row.get("extra")] for row in rows
+        ]
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT INTO series_history ({_QUOTED}) VALUES ({_PLACEHOLDERS})", values
+            )
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO series_current ({_QUOTED}) VALUES ({_PLACEHOLDERS})",
+                values,
+            )
+
+    def _query(self, sql: str, params: tuple = ()) -> pd.DataFrame:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return pd.DataFrame([_row_to_record(row) for row in rows], columns=CATALOG_FIELDS)
+
+
+def normalize_record(record: dict) -> dict:
+    """Map a meta record onto catalog columns; unknown keys go to `extra`."""
+    row = {field: record.get(field) for field in CATALOG_FIELDS}
+    if not row["asset_type"]:
+        # 旧记录没有 asset_type，从文件名（<asset_type>_<symbol>.csv）推断
+        row["asset_type"] = record_filename(record.get("path") or "").partition("_")[0]
+    row["adjust"] = row["adjust"] or "none"
+    extra = {key: value for key, value in record.items() if key not in CATALOG_FIELDS}
+    row["extra"] = json.dumps(extra, ensure_ascii=False) if extra else None
+    return row
+
+
+def _row_to_record(row: sqlite3.Row | dict) -> dict:
+    record = {field: row[field] for field in CATALOG_FIELDS}
+    extra = row["extra"]
+    if extra:
+        record.update(json.loads(extra))
+    return record
+
+
+def record_filename(path: str) -> str:
+    """File name of a recorded path (records may carry Windows separators)."""
+    return Path(path.replace("\\", "/")).name
+
+
+def _iso(value: str) -> str:
+    return pd.Timestamp(value).isoformat()
@@ -10,6 +10,9 @@ import pandas as pd
 
 AssetType = Literal["stock", "etf", "index"]
 AdjustType = Literal["none", "qfq", "hfq"]
+Frequency = Literal["d", "1", "5", "15", "30", "60"]
+
+INTRADAY_FREQUENCIES = ("1", "5", "15", "30", "60")
 
 
 @dataclass(frozen=True)
@@ -19,6 +22,11 @@ class DataRequest:
     start: str
     end: str
     adjust: AdjustType = "none"
+    frequency: Frequency = "d"
+
+    @property
+    def intraday(self) -> bool:
+        return self.frequency != "d"
 
 
 class DataProvider(ABC):
@@ -29,3 +37,44 @@ class DataProvider(ABC):
     @abstractmethod
     def fetch_daily_ohlcv(self, request: DataRequest) -> pd.DataFrame:
         """Return daily OHLCV data with provider-specific columns."""
+
+    def fetch_intraday_ohlcv(self, request: DataRequest) -> pd.DataFrame:
+        """Return minute bars of `request.frequency` for [start, end]."""
+        raise NotImplementedError(f"{type(self).__name__} does not provide intraday data")
+
+    def supports_frequency(self, frequency: str, asset_type: str) -> bool:
+        return frequency == "d"
+
+    def fetch_ohlcv(self, request: DataRequest) -> pd.DataFrame:
+        """Dispatch on `request.frequency` to the daily or intraday fetch."""
+        if not request.intraday:
+            return self.fetch_daily_ohlcv(request)
+        if not self.supports_frequency(request.frequency, request.asset_type):
+            raise ValueError(
+                f"{self.name} does not support {request.frequency}-minute {request.asset_type} bars"
+            )
+        return self.fetch_intraday_ohlcv(request)
+
+    def volume_multiplier(self, asset_type: str) -> int:
+        """Factor converting this provider's volume unit to shares (股)."""
+        return 1
+
+    def fetch_trade_dates(self, start: str, end: str) -> pd.DatetimeIndex:
+        """Return the exchange trading sessions in [start, end]."""
+        raise NotImplementedError(f"{type(self).__name__} does not provide a trading calendar")
+
+    def fetch_symbols(self) -> pd.DataFrame:
+        """Return listed and delisted securities.
+
+        Columns: symbol, asset_type, name, list_date, delist_date (NaT while
+        still listed); exchange and board are optional.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not provide a symbol list")
+
+    def has_adjust_factors(self, asset_type: str) -> bool:
+        """Whether `fetch_adjust_factors` is available for this asset type."""
+        return False
+
+    def fetch_adjust_factors(self, request: DataRequest) -> pd.DataFrame:
+        """Return (datetime, factor) rows of cumulative backward adjustment factors."""
+        raise NotImplementedError(f"{type(self).__name__} does not provide adjustment factors")
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+from typing import Iterable, Iterator
+
+import numpy as np
 import pandas as pd
 
-from balancewheel.data.schema import STANDARD_COLUMNS
+from balancewheel.data.schema import STANDARD_COLUMNS, STANDARD_DTYPES
 
 COLUMN_ALIASES = {
     "date": "datetime",
@@ -32,35 +35,100 @@ COLUMN_ALIASES = {
     "换手率": "turnover",
 }
 
+PRICE_COLUMNS = ["open", "high", "low", "close"]
 
-def normalize_ohlcv(frame: pd.DataFrame) -> pd.DataFrame:
-    """Normalize OHLCV data to standard columns."""
-    renamed = {
-        column: COLUMN_ALIASES.get(column, column)
-        for column in frame.columns
-        if column in COLUMN_ALIASES
-    }
-    data = frame.rename(columns=renamed)
 
-    for column in STANDARD_COLUMNS:
-        if column not in data.columns:
-            data[column] = 0
-
-    data = data[STANDARD_COLUMNS]
-    data["datetime"] = pd.to_datetime(data["datetime"])
-    numeric_cols = [col for col in STANDARD_COLUMNS if col != "datetime"]
-    data[numeric_cols] = data[numeric_cols].apply(pd.to_numeric, errors="coerce")
-    data = apply_missing_strategy(data)
+def normalize_ohlcv(frame: pd.DataFrame, volume_multiplier: int = 1) -> pd.DataFrame:
+    """Normalize OHLCV data to standard columns.
+
+    Each column is converted once into its `STANDARD_DTYPES` dtype, with the
+    missing value strategy and the volume unit conversion (e.g. 手 -> 股 with
+    `volume_multiplier=100`) applied in the same pass.
+    """
+    data, _ = _normalize_chunk(frame, volume_multiplier, {})
     return data
 
 
+def normalize_chunks(
+    chunks: Iterable[pd.DataFrame], volume_multiplier: int = 1
+) -> Iterator[pd.DataFrame]:
+    """Normalize a long history chunk by chunk with bounded memory.
+
+    Forward-filled prices carry over chunk boundaries, so the concatenated
+    output equals `normalize_ohlcv` on the whole frame.
+    """
+    carry: dict[str, float] = {}
+    for chunk in chunks:
+        data, carry = _normalize_chunk(chunk, volume_multiplier, carry)
+        yield data
+
+
 def apply_missing_strategy(data: pd.DataFrame) -> pd.DataFrame:
     """Apply fixed missing value strategy."""
-    data = data.copy()
-    price_cols = ["open", "high", "low", "close"]
-    data[price_cols] = data[price_cols].ffill()
-    data[price_cols] = data[price_cols].fillna(0)
-    data[["volume", "amount", "amplitude", "change_pct", "change", "turnover"]] = (
-        data[["volume", "amount", "amplitude", "change_pct", "change", "turnover"]].fillna(0)
-    )
-    return data
+    columns = {}
+    for column in data.columns:
+        values = data[column]
+        if column in STANDARD_DTYPES and column != "datetime":
+            values, _ = _fill_missing(column, values.to_numpy(dtype="float64"), None)
+        columns[column] = values
+    return pd.DataFrame(columns, index=data.index)
+
+
+def _normalize_chunk(
+    frame: pd.DataFrame, volume_multiplier: int, carry: dict[str, float]
+) -> tuple[pd.DataFrame, dict[str, float]]:
+    sources: dict[str, str] = {}
+    for column in frame.columns:
+        target = COLUMN_ALIASES.get(column, column if column in STANDARD_DTYPES else None)
+        if target is not None and target not in sources:
+            sources[target] = column
+
+    length = len(frame)
+    columns: dict[str, np.ndarray | pd.Series] = {}
+    next_carry = dict(carry)
+    for column in STANDARD_COLUMNS:
+        dtype = STANDARD_DTYPES[column]
+        source = sources.get(column)
+        if column == "datetime":
+            if source is None:
+                values = np.full(length, np.datetime64("NaT"), dtype=dtype)
+            else:
+                values = pd.to_datetime(frame[source].to_numpy()).to_numpy(dtype=dtype)
+            columns[column] = values
+            continue
+
+        if source is None:
+            values = np.zeros(length, dtype="float64")
+        else:
+            values = pd.to_numeric(frame[source], errors="coerce").to_numpy(dtype="float64")
+        values, last = _fill_missing(column, values, carry.get(column))
+        if last is not None:
+            next_carry[column] = last
+        if column == "volume":
+            if volume_multiplier != 1:
+                values = values * volume_multiplier
+            values = np.round(values)
+        columns[column] = values.astype(dtype, copy=False)
+
+    return pd.DataFrame(columns, index=pd.RangeIndex(length)), next_carry
+
+
+def _fill_missing(
+    column: str, values: np.ndarray, carry: float | None
+) -> tuple[np.ndarray, float | None]:
+    """Forward-fill prices (seeded with `carry`), zero-fill everything else."""
+    missing = np.isnan(values)
+    if column not in PRICE_COLUMNS:
+        return np.where(missing, 0.0, values) if missing.any() else values, None
+
+    if missing.any():
+        positions = np.where(missing, 0, np.arange(len(values)))
+        np.maximum.accumulate(positions, out=positions)
+        filled = values[positions]
+        leading = np.isnan(filled)
+        if leading.any():
+            filled[leading] = 0.0 if carry is None else carry
+        values = filled
+    valid = ~missing
+    last = float(values[valid][-1]) if valid.any() else carry
+    return values, last
@@ -0,0 +1,170 @@
+"""Universe × date panels stored as memory-mapped `.npy` arrays."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from balancewheel.data.calendar import TradingCalendar
+from balancewheel.data.repository import Repository
+
+PANEL_FIELDS = ["open", "high", "low", "close", "volume", "amount", "turnover"]
+SymbolSelector = Union[str, Sequence[str], slice, None]
+
+
+def build_panel(
+    repository: Repository,
+    root: str | Path,
+    series: Sequence[tuple[str, str]] | None = None,
+    fields: Sequence[str] = PANEL_FIELDS,
+    dates: Sequence | None = None,
+    calendar: TradingCalendar | None = None,
+    adjust: str = "qfq",
+) -> "Panel":
+    """Compile stored series into aligned date × symbol arrays under `root`.
+
+    `series` is a list of (asset_type, symbol) and defaults to every series in
+    the repository. `dates` defaults to the union of all stored dates, or with
+    a `calendar` to every session between the earliest and latest stored date,
+    so suspended days appear as masked rows. Each field is written column by
+    column into an `open_memmap` file, so the full panel never has to be held
+    in memory. Prices of series stored with adjustment factors are adjusted
+    as `adjust` ("qfq" by default, so returns are continuous across
+    dividends and splits); the mode is recorded in `panel.json`.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    series = list(series if series is not None else repository.list_series())
+    symbols = [symbol for _, symbol in series]
+    if len(set(symbols)) != len(symbols):
+        raise ValueError("Panel symbols must be unique across asset types")
+
+    columns = list(dict.fromkeys(["datetime", *fields]))
+    if dates is None and calendar is not None:
+        bounds = []
+        for asset_type, symbol in series:
+            loaded = repository.load(symbol, asset_type, columns=["datetime"])["datetime"]
+            if len(loaded):
+                bounds.extend([loaded.iloc[0], loaded.iloc[-1]])
+        sessions = calendar.sessions_in_range(min(bounds), max(bounds)) if bounds else calendar.sessions[:0]
+        index = sessions.to_numpy(dtype="datetime64[D]")
+    elif dates is None:
+        stored_dates: set = set()
+        for asset_type, symbol in series:
+            loaded = repository.load(symbol, asset_type, columns=["datetime"])
+            stored_dates.update(loaded["datetime"].to_numpy(dtype="datetime64[D]"))
+        index = np.array(sorted(stored_dates), dtype="datetime64[D]")
+    else:
+        index = np.asarray(pd.DatetimeIndex(dates).to_numpy(dtype="datetime64[D]"))
+
+    shape = (len(index), len(series))
+    arrays = {
+        field: np.lib.format.open_memmap(root / f"{field}.npy", mode="w+", dtype="float64", shape=shape)
+        for field in fields
+    }
+    mask = np.lib.format.open_memmap(root / "mask.npy", mode="w+", dtype="bool", shape=shape)
+    for array in arrays.values():
+        array[:] = np.nan
+    mask[:] = False
+
+    for column, (asset_type, symbol) in enumerate(series):
+        if not len(index):
+            break
+        series_adjust = repository.series_adjust(symbol, asset_type, adjust)
+        frame = repository.load(symbol, asset_type, columns=columns, adjust=series_adjust)
+        frame_dates = frame["datetime"].to_numpy(dtype="datetime64[D]")
+        rows = np.searchsorted(index, frame_dates)
+        found = (rows < len(index)) & (index[np.minimum(rows, len(index) - 1)] == frame_dates)
+        rows = rows[found]
+        for field, array in arrays.items():
+            array[rows, column] = frame[field].to_numpy(dtype="float64")[found]
+        valid = np.ones(len(rows), dtype=bool)
+        if "volume" in frame.columns:
+            # 停牌日：无成交量视为无效
+            valid = frame["volume"].to_numpy(dtype="float64")[found] > 0
+        mask[rows, column] = valid
+
+    for array in (*arrays.values(), mask):
+        array.flush()
+    np.save(root / "dates.npy", index)
+    meta = {
+        "fields": list(fields),
+        "symbols": symbols,
+        "asset_types": [asset_type for asset_type, _ in series],
+        "adjust": adjust,
+    }
+    (root / "panel.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    return Panel(root)
+
+
+class Panel:
+    """Read-only, memory-mapped view of a panel written by `build_panel`.
+
+    Arrays are opened with `mmap_mode="r"`, so many processes can share the
+    same pages of one on-disk copy. Slices by date range and by contiguous
+    symbol range are zero-copy views; selecting a list of symbols copies.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        meta = json.loads((self.root / "panel.json").read_text(encoding="utf-8"))
+        self.fields: list[str] = meta["fields"]
+        self.symbols: list[str] = meta["symbols"]
+        self.asset_types: list[str] = meta["asset_types"]
+        self.adjust: str = meta.get("adjust", "none")
+        self.dates = pd.DatetimeIndex(np.load(self.root / "dates.npy"))
+        self._symbol_index = {symbol: idx for idx, symbol in enumerate(self.symbols)}
+        self._arrays: dict[str, np.ndarray] = {}
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.dates), len(self.symbols)
+
+    def array(self, field: str) -> np.ndarray:
+        """Return the full memory-mapped date × symbol array for a field."""
+        if field not in self._arrays:
+            if field != "mask" and field not in self.fields:
+                raise KeyError(f"Unknown panel field: {field}")
+            self._arrays[field] = np.load(self.root / f"{field}.npy", mmap_mode="r")
+        return self._arrays[field]
+
+    def view(
+        self,
+        field: str,
+        symbols: SymbolSelector = None,
+        start: str | pd.Timestamp | None = None,
+        end: str | pd.Timestamp | None = None,
+    ) -> np.ndarray:
+        """Slice a field by date range and symbols."""
+        return self.array(field)[self.date_slice(start, end), self.symbol_slice(symbols)]
+
+    def mask(
+        self,
+        symbols: SymbolSelector = None,
+        start: str | pd.Timestamp | None = None,
+        end: str | pd.Timestamp | None = None,
+    ) -> np.ndarray:
+        """Validity mask (False on missing or suspended bars)."""
+        return self.view("mask", symbols, start, end)
+
+    def date_slice(
+        self, start: str | pd.Timestamp | None = None, end: str | pd.Timestamp | None = None
+    ) -> slice:
+        lo = 0 if start is None else int(self.dates.searchsorted(pd.Timestamp(start), side="left"))
+        hi = len(self.dates) if end is None else int(self.dates.searchsorted(pd.Timestamp(end), side="right"))
+        return slice(lo, hi)
+
+    def symbol_slice(self, symbols: SymbolSelector) -> slice | int | list[int]:
+        if symbols is None:
+            return slice(None)
+        if isinstance(symbols, slice):
+            start = self._symbol_index[symbols.start] if isinstance(symbols.start, str) else symbols.start
+            stop = self._symbol_index[symbols.stop] + 1 if isinstance(symbols.stop, str) else symbols.stop
+            return slice(start, stop, symbols.step)
+        if isinstance(symbols, str):
+            return self._symbol_index[symbols]
+        return [self._symbol_index[symbol] for symbol in symbols]
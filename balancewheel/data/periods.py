@@ -0,0 +1,175 @@
+"""Weekly and monthly bars derived from stored daily series."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from balancewheel.data.calendar import TradingCalendar
+
+# 频率 -> 仓库中的目录名
+PERIOD_FREQUENCIES = {"w": "weekly", "m": "monthly"}
+
+# 列 -> 周期内的聚合方式；涨跌额、涨跌幅与振幅按上一周期收盘价重新计算
+AGGREGATIONS = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+    "amount": "sum",
+    "turnover": "sum",
+}
+
+
+def period_keys(dates: pd.Series | np.ndarray, frequency: str) -> np.ndarray:
+    """Integer period of each date: Monday-based weeks or calendar months since 1970."""
+    values = np.asarray(dates, dtype="datetime64[ns]")
+    if frequency == "w":
+        # 1970-01-01 是周四，偏移 3 天使每周从周一开始
+        return (values.astype("datetime64[D]").astype("int64") + 3) // 7
+    if frequency == "m":
+        return values.astype("datetime64[M]").astype("int64")
+    raise ValueError(f"Unknown period frequency: {frequency}")
+
+
+def period_start(date: str | pd.Timestamp, frequency: str) -> pd.Timestamp:
+    """First day (Monday or the 1st) of the period containing `date`."""
+    day = pd.Timestamp(date).normalize()
+    if frequency == "w":
+        return day - pd.Timedelta(days=day.weekday())
+    if frequency == "m":
+        return day.replace(day=1)
+    raise ValueError(f"Unknown period frequency: {frequency}")
+
+
+def resample_bars(
+    data: pd.DataFrame,
+    frequency: str,
+    calendar: TradingCalendar | None = None,
+    previous_close: float | None = None,
+) -> pd.DataFrame:
+    """Aggregate sorted daily bars into weekly (`"w"`) or monthly (`"m"`) bars.
+
+    Periods are found with one pass over the period keys and every column is
+    aggregated with `ufunc.reduceat`, so the cost is linear in the number of
+    days whatever the number of periods. A bar is labelled with its last
+    session; with a calendar, a period that has ended is labelled with the
+    calendar's last session of the period, so bars of a security suspended
+    at the end of a week line up with everyone else's. change, change_pct
+    and amplitude are recomputed against the previous period's close
+    (`previous_close` for the first period, NaN when not given).
+    """
+    if data.empty:
+        return data.iloc[0:0].copy()
+    dates = data["datetime"].to_numpy(dtype="datetime64[ns]")
+    keys = period_keys(dates, frequency)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)] - 1
+
+    columns: dict[str, np.ndarray] = {"datetime": _labels(dates, keys[starts], ends, frequency, calendar)}
+    for column, how in AGGREGATIONS.items():
+        if column not in data.columns:
+            continue
+        values = data[column].to_numpy()
+        if how == "first":
+            columns[column] = values[starts]
+        elif how == "last":
+            columns[column] = values[ends]
+        elif how == "max":
+            columns[column] = np.fmax.reduceat(values.astype("float64"), starts)
+        elif how == "min":
+            columns[column] = np.fmin.reduceat(values.astype("float64"), starts)
+        else:
+            columns[column] = _sum(values, starts)
+
+    if "close" in columns:
+        close = columns["close"].astype("float64")
+        previous = np.r_[np.nan if previous_close is None else previous_close, close[:-1]]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            derived = {
+                "amplitude": (columns.get("high", close) - columns.get("low", close)) / previous * 100,
+                "change_pct": (close / previous - 1) * 100,
+                "change": close - previous,
+            }
+        for column, values in derived.items():
+            if column in data.columns:
+                columns[column] = values
+    return pd.DataFrame(columns)[[column for column in data.columns if column in columns]]
+
+
+def update_periods(
+    existing: pd.DataFrame | None,
+    daily: pd.DataFrame,
+    frequency: str,
+    calendar: TradingCalendar | None = None,
+    since: str | pd.Timestamp | None = None,
+) -> pd.DataFrame:
+    """Recompute the periods of `existing` from the one containing `since` on.
+
+    `daily` is the whole daily series; only its bars from the first period to
+    recompute on are aggregated and earlier periods are kept as they are.
+    The last kept period is recomputed too when its label is not the
+    calendar's last session of the period: it was labelled while still open
+    and the security has not traded since, so a full resample would label it
+    differently. Without `existing` or `since` every period is rebuilt.
+    """
+    if existing is None or existing.empty or since is None:
+        return resample_bars(daily, frequency, calendar)
+    first = period_keys([pd.Timestamp(since)], frequency)[0]
+    existing_keys = period_keys(existing["datetime"], frequency)
+    count = int(np.searchsorted(existing_keys, first))
+    if count and calendar is not None:
+        key = existing_keys[count - 1 : count]
+        end, covered = _calendar_ends(key, frequency, calendar)
+        # 仍在进行中时打上的临时标签（最后交易日早于日历周期末）需要重新计算
+        if covered[0] and existing["datetime"].to_numpy(dtype="datetime64[ns]")[count - 1] != end[0]:
+            count -= 1
+            first = key[0]
+    kept = existing.iloc[:count]
+    daily = daily[period_keys(daily["datetime"], frequency) >= first]
+    if daily.empty:
+        return existing
+    previous_close = float(kept["close"].iloc[-1]) if len(kept) else None
+    bars = resample_bars(daily, frequency, calendar, previous_close)
+    return pd.concat([kept, bars], ignore_index=True)
+
+
+def _labels(
+    dates: np.ndarray,
+    keys: np.ndarray,
+    ends: np.ndarray,
+    frequency: str,
+    calendar: TradingCalendar | None,
+) -> np.ndarray:
+    labels = dates[ends]
+    if calendar is None:
+        return labels
+    calendar_end, covered = _calendar_ends(keys, frequency, calendar)
+    ended = covered & (calendar_end <= dates[-1])
+    return np.where(ended, calendar_end, labels)
+
+
+def _calendar_ends(
+    keys: np.ndarray, frequency: str, calendar: TradingCalendar
+) -> tuple[np.ndarray, np.ndarray]:
+    """Calendar's last session of each period, and whether the calendar has the period at all."""
+    sessions = calendar.sessions.to_numpy(dtype="datetime64[ns]")
+    session_keys = period_keys(sessions, frequency)
+    last = np.r_[session_keys[1:] != session_keys[:-1], True]
+    end_keys, end_sessions = session_keys[last], sessions[last]
+    positions = np.minimum(np.searchsorted(end_keys, keys), len(end_keys) - 1)
+    return end_sessions[positions], end_keys[positions] == keys
+
+
+def _sum(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Per-period sum ignoring NaN; NaN where a period has no valid value."""
+    if values.dtype.kind in "iu":
+        return np.add.reduceat(values, starts)
+    values = values.astype("float64")
+    valid = ~np.isnan(values)
+    totals = np.add.reduceat(np.where(valid, values, 0.0), starts)
+    return np.where(np.add.reduceat(valid.astype("int64"), starts) > 0, totals, np.nan)
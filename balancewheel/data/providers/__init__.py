@@ -1,6 +1,14 @@
 """Data providers for BalanceWheel."""
 
 from balancewheel.data.providers.akshare_provider import AkshareEtfSinaProvider, AkshareProvider
-from balancewheel.data.providers.baostock_provider import BaostockProvider
+from balancewheel.data.providers.baostock_provider import BaostockProvider, BaostockSession
+from balancewheel.data.providers.cache import CachedProvider, ProviderCache
 
-__all__ = ["AkshareProvider", "AkshareEtfSinaProvider", "BaostockProvider"]
+__all__ = [
+    "AkshareProvider",
+    "AkshareEtfSinaProvider",
+    "BaostockProvider",
+    "BaostockSession",
+    "CachedProvider",
+    "ProviderCache",
+]
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import pandas as pd
 
-from balancewheel.data.interfaces import DataProvider, DataRequest
+from balancewheel.data.interfaces import INTRADAY_FREQUENCIES, DataProvider, DataRequest
 from balancewheel.data.utils import format_symbol_for_sina
 
 
@@ -40,11 +40,76 @@ class AkshareProvider(DataProvider):
 
         return data.copy()
 
+    def supports_frequency(self, frequency: str, asset_type: str) -> bool:
+        return frequency == "d" or frequency in INTRADAY_FREQUENCIES
+
+    def fetch_intraday_ohlcv(self, request: DataRequest) -> pd.DataFrame:
+        import akshare as ak
+
+        start = f"{pd.Timestamp(request.start):%Y-%m-%d} 09:00:00"
+        end = f"{pd.Timestamp(request.end):%Y-%m-%d} 15:30:00"
+        # 分钟线只存不复权价格（东财 1 分钟线本身也不支持复权）
+        adjust = map_adjust_for_akshare("none")
+        if request.asset_type == "stock":
+            data = ak.stock_zh_a_hist_min_em(
+                symbol=request.symbol,
+                start_date=start,
+                end_date=end,
+                period=request.frequency,
+                adjust=adjust,
+            )
+        elif request.asset_type == "etf":
+            data = ak.fund_etf_hist_min_em(
+                symbol=request.symbol,
+                start_date=start,
+                end_date=end,
+                period=request.frequency,
+                adjust=adjust,
+            )
+        elif request.asset_type == "index":
+            data = ak.index_zh_a_hist_min_em(
+                symbol=request.symbol,
+                period=request.frequency,
+                start_date=start,
+                end_date=end,
+            )
+        else:
+            raise ValueError(f"Unsupported asset type: {request.asset_type}")
+
+        return data.copy()
+
+    def volume_multiplier(self, asset_type: str) -> int:
+        # 东财个股与 ETF 成交量单位为“手”；指数与 Baostock 口径一致，不做换算
+        return 1 if asset_type == "index" else 100
+
+    def fetch_trade_dates(self, start: str, end: str) -> pd.DatetimeIndex:
+        import akshare as ak
+
+        data = ak.tool_trade_date_hist_sina()
+        dates = pd.DatetimeIndex(pd.to_datetime(data["trade_date"]))
+        return dates[(dates >= pd.to_datetime(start)) & (dates <= pd.to_datetime(end))]
+
+    def has_adjust_factors(self, asset_type: str) -> bool:
+        return asset_type == "stock"
+
+    def fetch_adjust_factors(self, request: DataRequest) -> pd.DataFrame:
+        import akshare as ak
+
+        if request.asset_type != "stock":
+            raise ValueError(f"Adjustment factors are only available for stocks: {request.asset_type}")
+        data = ak.stock_zh_a_daily(symbol=format_symbol_for_sina(request.symbol), adjust="hfq-factor")
+        return pd.DataFrame({"datetime": data["date"], "factor": data["hfq_factor"]})
+
 
 class AkshareEtfSinaProvider(DataProvider):
     name = "akshare_sina"
 
     def fetch_daily_ohlcv(self, request: DataRequest) -> pd.DataFrame:
+        data = self.fetch_full_history(request)
+        return filter_raw_by_date(data, request.start, request.end)
+
+    def fetch_full_history(self, request: DataRequest) -> pd.DataFrame:
+        """Download the complete ETF history; Sina has no date range parameter."""
         import akshare as ak
 
         if request.asset_type != "etf":
@@ -52,17 +117,21 @@ class AkshareEtfSinaProvider(DataProvider):
 
         symbol = format_symbol_for_sina(request.symbol)
         data = ak.fund_etf_hist_sina(symbol=symbol)
-        data = data.copy()
-        start = pd.to_datetime(request.start)
-        end = pd.to_datetime(request.end)
-        if "日期" in data.columns:
-            dates = pd.to_datetime(data["日期"])
-        elif "date" in data.columns:
-            dates = pd.to_datetime(data["date"])
-        else:
-            dates = pd.to_datetime(data.iloc[:, 0])
-        data = data[(dates >= start) & (dates <= end)].reset_index(drop=True)
-        return data
+        return data.copy()
+
+
+def filter_raw_by_date(data: pd.DataFrame, start: str, end: str) -> pd.DataFrame:
+    """Filter a raw provider frame to [start, end] using its date column."""
+    if data.empty:
+        return data.reset_index(drop=True)
+    if "日期" in data.columns:
+        dates = pd.to_datetime(data["日期"])
+    elif "date" in data.columns:
+        dates = pd.to_datetime(data["date"])
+    else:
+        dates = pd.to_datetime(data.iloc[:, 0])
+    mask = (dates >= pd.to_datetime(start)) & (dates <= pd.to_datetime(end))
+    return data[mask].reset_index(drop=True)
 
 
 def map_adjust_for_akshare(adjust: str) -> str:
@@ -2,45 +2,213 @@
 
 from __future__ import annotations
 
+import atexit
+import threading
+from typing import Any, Callable
+
 import pandas as pd
 
 from balancewheel.data.interfaces import DataProvider, DataRequest
 from balancewheel.data.utils import format_symbol_for_baostock
 
+# 保持字符串的字段，其余按数值解析
+STRING_FIELDS = {"date", "time", "code", "code_name", "calendar_date", "dividOperateDate", "ipoDate", "outDate"}
 
-class BaostockProvider(DataProvider):
-    name = "baostock"
+# query_stock_basic 的 type 字段：1 股票、2 指数、5 ETF（其余类型不使用）
+BAOSTOCK_SECURITY_TYPES = {"1": "stock", "2": "index", "5": "etf"}
 
-    def fetch_daily_ohlcv(self, request: DataRequest) -> pd.DataFrame:
+# 10001001: 用户未登录；10002xxx: 网络/连接错误，均需重新登录
+SESSION_ERROR_CODES = ("10001001", "10002")
+BAOSTOCK_FREQUENCIES = ("d", "5", "15", "30", "60")
+
+
+class BaostockSession:
+    """Shared baostock login reused across queries.
+
+    The baostock client keeps a single module-level connection, so queries are
+    serialized with a lock; the session logs in lazily, re-authenticates when
+    the server reports an expired session and logs out on `close()` or exit.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._logged_in = False
+        self._depth = 0
+        atexit.register(self.close)
+
+    def __enter__(self) -> "BaostockSession":
+        with self._lock:
+            self._depth += 1
+            self._ensure_login()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        with self._lock:
+            self._depth -= 1
+            if self._depth == 0:
+                self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._logged_in:
+                return
+            import baostock as bs
+
+            self._logged_in = False
+            bs.logout()
+
+    def query(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> pd.DataFrame:
+        """Run a baostock query and collect all pages into a DataFrame."""
+        with self._lock:
+            self._ensure_login()
+            result = func(*args, **kwargs)
+            if is_session_error(result.error_code):
+                self._logged_in = False
+                self._ensure_login()
+                result = func(*args, **kwargs)
+            if result.error_code != "0":
+                raise RuntimeError(f"Baostock query failed: {result.error_msg}")
+
+            rows = []
+            while result.next():
+                rows.append(result.get_row_data())
+        return frame_from_rows(rows, result.fields)
+
+    def _ensure_login(self) -> None:
+        if self._logged_in:
+            return
         import baostock as bs
 
         login = bs.login()
         if login.error_code != "0":
             raise RuntimeError(f"Baostock login failed: {login.error_msg}")
+        self._logged_in = True
 
-        try:
-            fields = "date,open,high,low,close,volume,amount"
-            symbol = format_baostock_symbol(request.symbol, request.asset_type)
-            start_date = format_baostock_date(request.start)
-            end_date = format_baostock_date(request.end)
-            adjustflag = map_adjust_for_baostock(request.adjust)
-            result = bs.query_history_k_data_plus(
-                symbol,
-                fields,
-                start_date=start_date,
-                end_date=end_date,
-                frequency="d",
-                adjustflag=adjustflag,
-            )
 
-            rows = []
-            while result.next():
-                rows.append(result.get_row_data())
-        finally:
-            bs.logout()
+_DEFAULT_SESSION: BaostockSession | None = None
+_DEFAULT_SESSION_LOCK = threading.Lock()
+
+
+def default_session() -> BaostockSession:
+    """Return the process-wide baostock session."""
+    global _DEFAULT_SESSION
+    with _DEFAULT_SESSION_LOCK:
+        if _DEFAULT_SESSION is None:
+            _DEFAULT_SESSION = BaostockSession()
+        return _DEFAULT_SESSION
+
+
+class BaostockProvider(DataProvider):
+    name = "baostock"
+
+    def __init__(self, session: BaostockSession | None = None) -> None:
+        self.session = session or default_session()
+
+    def __enter__(self) -> "BaostockProvider":
+        self.session.__enter__()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.session.__exit__(*exc_info)
+
+    def fetch_daily_ohlcv(self, request: DataRequest) -> pd.DataFrame:
+        import baostock as bs
+
+        fields = "date,open,high,low,close,volume,amount"
+        symbol = format_baostock_symbol(request.symbol, request.asset_type)
+        start_date = format_baostock_date(request.start)
+        end_date = format_baostock_date(request.end)
+        adjustflag = map_adjust_for_baostock(request.adjust)
+        return self.session.query(
+            bs.query_history_k_data_plus,
+            symbol,
+            fields,
+            start_date=start_date,
+            end_date=end_date,
+            frequency="d",
+            adjustflag=adjustflag,
+        )
+
+    def supports_frequency(self, frequency: str, asset_type: str) -> bool:
+        # Baostock 仅提供个股与 ETF 的 5/15/30/60 分钟线
+        return frequency in BAOSTOCK_FREQUENCIES and (frequency == "d" or asset_type != "index")
+
+    def fetch_intraday_ohlcv(self, request: DataRequest) -> pd.DataFrame:
+        import baostock as bs
+
+        data = self.session.query(
+            bs.query_history_k_data_plus,
+            format_baostock_symbol(request.symbol, request.asset_type),
+            "date,time,open,high,low,close,volume,amount",
+            start_date=format_baostock_date(request.start),
+            end_date=format_baostock_date(request.end),
+            frequency=request.frequency,
+            # 分钟线只存不复权价格
+            adjustflag=map_adjust_for_baostock("none"),
+        )
+        # time 形如 20240102093500000，为 K 线结束时刻
+        datetimes = pd.to_datetime(data["time"], format="%Y%m%d%H%M%S%f")
+        return pd.concat([datetimes.rename("datetime"), data.drop(columns=["date", "time"])], axis=1)
+
+    def fetch_trade_dates(self, start: str, end: str) -> pd.DatetimeIndex:
+        import baostock as bs
+
+        data = self.session.query(
+            bs.query_trade_dates,
+            start_date=format_baostock_date(start),
+            end_date=format_baostock_date(end),
+        )
+        trading = data[data["is_trading_day"] == 1]
+        return pd.DatetimeIndex(pd.to_datetime(trading["calendar_date"]))
+
+    def fetch_symbols(self) -> pd.DataFrame:
+        import baostock as bs
+
+        data = self.session.query(bs.query_stock_basic)
+        asset_types = data["type"].map(lambda value: BAOSTOCK_SECURITY_TYPES.get(f"{value:.0f}"))
+        data = data[asset_types.notna()]
+        return pd.DataFrame(
+            {
+                "symbol": data["code"].str[3:],
+                "asset_type": asset_types[asset_types.notna()],
+                "exchange": data["code"].str[:2],
+                "name": data["code_name"],
+                "list_date": pd.to_datetime(data["ipoDate"], errors="coerce"),
+                "delist_date": pd.to_datetime(data["outDate"], errors="coerce"),
+            }
+        ).reset_index(drop=True)
+
+    def has_adjust_factors(self, asset_type: str) -> bool:
+        return asset_type == "stock"
+
+    def fetch_adjust_factors(self, request: DataRequest) -> pd.DataFrame:
+        import baostock as bs
 
-        data = pd.DataFrame(rows, columns=result.fields)
-        return data
+        data = self.session.query(
+            bs.query_adjust_factor,
+            code=format_baostock_symbol(request.symbol, request.asset_type),
+            start_date="1990-01-01",
+            end_date=format_baostock_date(request.end),
+        )
+        return pd.DataFrame({"datetime": data["dividOperateDate"], "factor": data["backAdjustFactor"]})
+
+
+def is_session_error(error_code: str) -> bool:
+    return error_code.startswith(SESSION_ERROR_CODES)
+
+
+def frame_from_rows(rows: list[list[str]], fields: list[str]) -> pd.DataFrame:
+    """Build a frame column-wise from baostock string rows."""
+    if not rows:
+        return pd.DataFrame(columns=fields)
+    data = {}
+    for field, values in zip(fields, zip(*rows)):
+        series = pd.Series(values, dtype=object)
+        if field in STRING_FIELDS:
+            data[field] = series
+        else:
+            data[field] = pd.to_numeric(series, errors="coerce").astype("float64")
+    return pd.DataFrame(data, columns=fields)
 
 
 def format_baostock_symbol(symbol: str, asset_type: str) -> str:
@@ -0,0 +1,215 @@
+"""On-disk cache for raw provider responses."""
+
+from __future__ import annotations
+
+import json
+import os
+import pickle
+import threading
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from hashlib import sha256
+from pathlib import Path
+
+import pandas as pd
+
+from balancewheel.data.interfaces import DataProvider, DataRequest
+from balancewheel.data.providers.akshare_provider import filter_raw_by_date
+
+PICKLE_COMPRESSION = {"method": "gzip", "compresslevel": 1}
+
+# 条目文件缺失、截断或损坏时读取可能抛出的异常
+READ_ERRORS = (OSError, EOFError, pickle.UnpicklingError, zlib.error)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    bytes: int = 0
+    entries: int = 0
+
+
+class ProviderCache:
+    """Size-bounded LRU cache of raw provider frames with a TTL.
+
+    Entries are stored as compressed pickles under `root`; the index of keys,
+    sizes and access times is kept in `root/index.json`. Entry files are
+    replaced atomically, so readers never see a partial write, and an entry
+    whose file cannot be read is dropped and counted as a miss.
+    """
+
+    def __init__(
+        self,
+        root: str | Path = "data/_cache",
+        ttl: float = 24 * 3600,
+        max_bytes: int = 1 << 30,
+    ) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._index_path = self.root / "index.json"
+        self._index: dict[str, dict] = {}
+        if self._index_path.exists():
+            self._index = json.loads(self._index_path.read_text(encoding="utf-8"))
+        self._refresh_size()
+
+    def get(self, key: str) -> tuple[pd.DataFrame, dict] | None:
+        """Return (frame, entry) for a fresh entry or None."""
+        with self._lock:
+            entry = self._index.get(key)
+            path = self.root / f"{key}.pkl.gz"
+            if entry is None or not path.exists():
+                self.stats.misses += 1
+                return None
+            if time.time() - entry["created"] > self.ttl:
+                self._remove(key)
+                self._save_index()
+                self.stats.misses += 1
+                return None
+            entry["accessed"] = time.time()
+        try:
+            data = pd.read_pickle(path, compression=PICKLE_COMPRESSION)
+        except READ_ERRORS:
+            # 读取时文件已被淘汰/过期删除，或是中断写入留下的损坏文件：按未命中处理并丢弃该条目
+            with self._lock:
+                if self._index.get(key) is entry:
+                    self._remove(key)
+                    self._save_index()
+                self.stats.misses += 1
+            return None
+        with self._lock:
+            self.stats.hits += 1
+        return data, entry
+
+    def put(self, key: str, data: pd.DataFrame, **info: object) -> None:
+        """Store `data` under `key`; the file is written aside and renamed into place."""
+        path = self.root / f"{key}.pkl.gz"
+        tmp_path = self.root / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            data.to_pickle(tmp_path, compression=PICKLE_COMPRESSION)
+            size = tmp_path.stat().st_size
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        now = time.time()
+        with self._lock:
+            tmp_path.replace(path)
+            self._remove(key, unlink=False)
+            self._index[key] = {
+                "created": now,
+                "accessed": now,
+                "size": size,
+                **info,
+            }
+            self._evict()
+            self._save_index()
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._index):
+                self._remove(key)
+            self._save_index()
+
+    def _evict(self) -> None:
+        total = sum(entry["size"] for entry in self._index.values())
+        for key in sorted(self._index, key=lambda k: self._index[k]["accessed"]):
+            if total <= self.max_bytes:
+                break
+            total -= self._index[key]["size"]
+            self._remove(key)
+            self.stats.evictions += 1
+        self._refresh_size()
+
+    def _remove(self, key: str, unlink: bool = True) -> None:
+        self._index.pop(key, None)
+        if unlink:
+            (self.root / f"{key}.pkl.gz").unlink(missing_ok=True)
+        self._refresh_size()
+
+    def _refresh_size(self) -> None:
+        self.stats.entries = len(self._index)
+        self.stats.bytes = sum(entry["size"] for entry in self._index.values())
+
+    def _save_index(self) -> None:
+        tmp_path = self._index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._index), encoding="utf-8")
+        tmp_path.replace(self._index_path)
+
+
+class CachedProvider(DataProvider):
+    """Wrap a provider and serve repeated requests from a `ProviderCache`.
+
+    Providers exposing `fetch_full_history` (e.g. `AkshareEtfSinaProvider`) are
+    cached once per symbol and any sub-range is filtered from that download.
+    """
+
+    def __init__(self, provider: DataProvider, cache: ProviderCache) -> None:
+        self.provider = provider
+        self.cache = cache
+        self.name = provider.name
+
+    def volume_multiplier(self, asset_type: str) -> int:
+        return self.provider.volume_multiplier(asset_type)
+
+    def supports_frequency(self, frequency: str, asset_type: str) -> bool:
+        return self.provider.supports_frequency(frequency, asset_type)
+
+    def fetch_intraday_ohlcv(self, request: DataRequest) -> pd.DataFrame:
+        key = cache_key(self.name, asdict(request))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached[0]
+        data = self.provider.fetch_intraday_ohlcv(request)
+        self.cache.put(key, data)
+        return data
+
+    def fetch_trade_dates(self, start: str, end: str) -> pd.DatetimeIndex:
+        return self.provider.fetch_trade_dates(start, end)
+
+    def fetch_symbols(self) -> pd.DataFrame:
+        return self.provider.fetch_symbols()
+
+    def has_adjust_factors(self, asset_type: str) -> bool:
+        return self.provider.has_adjust_factors(asset_type)
+
+    def fetch_adjust_factors(self, request: DataRequest) -> pd.DataFrame:
+        return self.provider.fetch_adjust_factors(request)
+
+    def fetch_daily_ohlcv(self, request: DataRequest) -> pd.DataFrame:
+        fetch_full = getattr(self.provider, "fetch_full_history", None)
+        if fetch_full is None:
+            key = cache_key(self.name, asdict(request))
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached[0]
+            data = self.provider.fetch_daily_ohlcv(request)
+            self.cache.put(key, data)
+            return data
+
+        key = cache_key(
+            self.name,
+            {"symbol": request.symbol, "asset_type": request.asset_type, "adjust": request.adjust},
+        )
+        cached = self.cache.get(key)
+        if cached is not None and covers(cached[1], request.end):
+            return filter_raw_by_date(cached[0], request.start, request.end)
+        data = fetch_full(request)
+        self.cache.put(key, data, fetched_on=time.strftime("%Y%m%d"))
+        return filter_raw_by_date(data, request.start, request.end)
+
+
+def cache_key(provider_name: str, fields: dict) -> str:
+    payload = json.dumps({"provider": provider_name, **fields}, sort_keys=True)
+    return sha256(payload.encode("utf-8")).hexdigest()
+
+
+def covers(entry: dict, end: str) -> bool:
+    """A full-history download covers `end` if it was fetched on or after it."""
+    fetched_on = entry.get("fetched_on")
+    return fetched_on is not None and fetched_on >= end.replace("-", "")
@@ -0,0 +1,230 @@
+"""Vectorized data quality checks over many series at once."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from balancewheel.data.panel import Panel
+from balancewheel.data.repository import Repository
+from balancewheel.data.utils import board_limit_pct
+
+# 检查项 -> 严重程度；error 行可隔离，warning 仅报告
+CHECKS = {
+    "missing_datetime": "error",
+    "duplicate": "error",
+    "non_monotonic": "error",
+    "ohlc": "error",
+    "non_positive": "error",
+    "zero_volume": "warning",
+    "limit_breach": "warning",
+    "stale": "warning",
+}
+
+ISSUE_COLUMNS = ["symbol", "row", "datetime", "check", "severity", "value"]
+
+_CHECK_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+@dataclass
+class QualityReport:
+    """Row-level issues found by `check_frames` / `check_panel`.
+
+    `issues` has one row per (symbol, row, check); `row` is the positional
+    index within that symbol's frame. `value` carries the offending return
+    for `limit_breach` and the run length for `stale`.
+    """
+
+    issues: pd.DataFrame
+    rows: dict[str, int]
+
+    @property
+    def ok(self) -> bool:
+        return not (self.issues["severity"] == "error").any()
+
+    def summary(self) -> pd.DataFrame:
+        """Issue counts per symbol and check, with the number of rows checked."""
+        counts = pd.crosstab(self.issues["symbol"], self.issues["check"])
+        counts = counts.reindex(index=list(self.rows), columns=list(CHECKS), fill_value=0)
+        counts.insert(0, "rows", pd.Series(self.rows))
+        counts.index.name = "symbol"
+        counts.columns.name = None
+        return counts.reset_index()
+
+    def quarantine(
+        self,
+        frames: Mapping[str, pd.DataFrame],
+        severities: Sequence[str] = ("error",),
+    ) -> tuple[dict[str, pd.DataFrame], pd.DataFrame]:
+        """Split frames into (clean frames, quarantined rows).
+
+        Rows with an issue of the given severities are removed from their
+        frame; the quarantined rows carry `symbol` and a `checks` column
+        listing what they failed.
+        """
+        flagged = self.issues[self.issues["severity"].isin(severities)]
+        clean = dict(frames)
+        quarantined = []
+        for symbol, issues in flagged.groupby("symbol", sort=False):
+            frame = frames[symbol]
+            checks = issues.groupby("row")["check"].agg(",".join)
+            bad = np.zeros(len(frame), dtype=bool)
+            bad[checks.index.to_numpy()] = True
+            clean[symbol] = frame[~bad].reset_index(drop=True)
+            rows = frame[bad].reset_index(drop=True)
+            rows.insert(0, "symbol", symbol)
+            rows["checks"] = checks.to_numpy()
+            quarantined.append(rows)
+        if quarantined:
+            return clean, pd.concat(quarantined, ignore_index=True)
+        return clean, pd.DataFrame(columns=["symbol", "checks"])
+
+
+def check_frames(
+    frames: Mapping[str, pd.DataFrame],
+    limit_pcts: Mapping[str, float] | None = None,
+    stale_bars: int = 5,
+    limit_tolerance: float = 0.005,
+) -> QualityReport:
+    """Check a batch of normalized frames (keyed by symbol) in one pass.
+
+    All frames are concatenated into flat arrays and every check is a single
+    vectorized expression over the whole batch; per-symbol boundaries only
+    enter through the "previous row" mask.
+    """
+    symbols = list(frames)
+    lengths = np.array([len(frames[symbol]) for symbol in symbols], dtype="int64")
+    columns = {}
+    for column in _CHECK_COLUMNS:
+        parts = [
+            frames[symbol][column].to_numpy(dtype="float64")
+            if column in frames[symbol].columns
+            else np.full(len(frames[symbol]), np.nan)
+            for symbol in symbols
+        ]
+        columns[column] = np.concatenate(parts) if parts else np.empty(0)
+    datetimes = (
+        np.concatenate([frames[symbol]["datetime"].to_numpy(dtype="datetime64[ns]") for symbol in symbols])
+        if symbols
+        else np.empty(0, dtype="datetime64[ns]")
+    )
+    return _check(symbols, lengths, columns, datetimes, limit_pcts, stale_bars, limit_tolerance)
+
+
+def check_panel(
+    panel: Panel,
+    limit_pcts: Mapping[str, float] | None = None,
+    stale_bars: int = 5,
+    limit_tolerance: float = 0.005,
+) -> QualityReport:
+    """Check every symbol of a panel; dates without a close are not rows."""
+    present = ~np.isnan(np.asarray(panel.array("close"))).T
+    lengths = present.sum(axis=1)
+    columns = {}
+    for column in _CHECK_COLUMNS:
+        if column in panel.fields:
+            columns[column] = np.asarray(panel.array(column)).T[present]
+        else:
+            columns[column] = np.full(int(lengths.sum()), np.nan)
+    dates = panel.dates.to_numpy(dtype="datetime64[ns]")
+    datetimes = np.broadcast_to(dates, present.shape)[present]
+    return _check(panel.symbols, lengths, columns, datetimes, limit_pcts, stale_bars, limit_tolerance)
+
+
+def check_repository(
+    repository: Repository,
+    series: Sequence[tuple[str, str]] | None = None,
+    adjust: str = "qfq",
+    **kwargs: object,
+) -> QualityReport:
+    """Load stored series (default: all) and run `check_frames` over them.
+
+    Series stored with adjustment factors are checked on `adjust` prices
+    ("qfq" by default, like `build_panel`), so ex-dates of unadjusted bars
+    are not reported as limit breaches.
+    """
+    series = series if series is not None else repository.list_series()
+    frames = {
+        symbol: repository.load(
+            symbol,
+            asset_type,
+            columns=["datetime", *_CHECK_COLUMNS],
+            adjust=repository.series_adjust(symbol, asset_type, adjust),
+        )
+        for asset_type, symbol in series
+    }
+    return check_frames(frames, **kwargs)
+
+
+def _check(
+    symbols: Sequence[str],
+    lengths: np.ndarray,
+    columns: dict[str, np.ndarray],
+    datetimes: np.ndarray,
+    limit_pcts: Mapping[str, float] | None,
+    stale_bars: int,
+    limit_tolerance: float,
+) -> QualityReport:
+    total = int(lengths.sum())
+    codes = np.repeat(np.arange(len(symbols)), lengths)
+    starts = np.cumsum(lengths) - lengths
+    rows = np.arange(total) - np.repeat(starts, lengths)
+    has_prev = rows > 0
+
+    open_, high, low, close, volume = (columns[column] for column in _CHECK_COLUMNS)
+    prev_dt = np.roll(datetimes, 1)
+    prev_close = np.roll(close, 1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        masks = {
+            "missing_datetime": np.isnat(datetimes),
+            "duplicate": has_prev & (datetimes == prev_dt),
+            "non_monotonic": has_prev & (datetimes < prev_dt),
+            "ohlc": (high < np.fmax(open_, close)) | (low > np.fmin(open_, close)) | (high < low),
+            "non_positive": (open_ <= 0) | (high <= 0) | (low <= 0) | (close <= 0),
+            "zero_volume": volume == 0,
+        }
+        overrides = limit_pcts or {}
+        limits = np.array(
+            [overrides.get(symbol, board_limit_pct(symbol)) for symbol in symbols], dtype="float64"
+        )
+        change = close / prev_close - 1.0
+        masks["limit_breach"] = (
+            has_prev & (prev_close > 0) & (np.abs(change) > limits[codes] + limit_tolerance)
+        )
+
+        # 连续未变动的收盘价（停牌的零成交日打断计数）
+        unchanged = has_prev & (close == prev_close) & (volume != 0)
+        positions = np.arange(total)
+        run_start = np.maximum.accumulate(np.where(unchanged, 0, positions)) if total else positions
+        run_length = positions - run_start
+        masks["stale"] = run_length >= stale_bars
+
+    values = {"limit_breach": change, "stale": run_length.astype("float64")}
+    symbol_array = np.asarray(symbols, dtype=object)
+    parts = []
+    for check, mask in masks.items():
+        index = np.flatnonzero(mask)
+        if not len(index):
+            continue
+        parts.append(
+            pd.DataFrame(
+                {
+                    "symbol": symbol_array[codes[index]],
+                    "row": rows[index],
+                    "datetime": datetimes[index],
+                    "check": check,
+                    "severity": CHECKS[check],
+                    "value": values[check][index] if check in values else np.nan,
+                }
+            )
+        )
+    if parts:
+        issues = pd.concat(parts, ignore_index=True).sort_values(["symbol", "row"], kind="stable")
+        issues = issues.reset_index(drop=True)
+    else:
+        issues = pd.DataFrame(columns=ISSUE_COLUMNS)
+    return QualityReport(issues=issues, rows=dict(zip(symbols, lengths.tolist())))
@@ -0,0 +1,192 @@
+"""Vectorized reconciliation of OHLCV datasets from different providers."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+COMPARE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+MISMATCH_COLUMNS = [
+    "provider",
+    "datetime",
+    "kind",
+    "column",
+    "primary_value",
+    "other_value",
+]
+
+
+@dataclass(frozen=True)
+class Tolerance:
+    """Allowed absolute/relative difference for one column."""
+
+    abs: float = 0.0
+    rel: float = 0.0
+
+
+DEFAULT_TOLERANCES: dict[str, Tolerance] = {
+    "open": Tolerance(abs=1e-6),
+    "high": Tolerance(abs=1e-6),
+    "low": Tolerance(abs=1e-6),
+    "close": Tolerance(abs=1e-6),
+    # 成交量统一为“股”，各数据源按“手”取整，允许 1 手（100 股）的误差
+    "volume": Tolerance(abs=100.0),
+}
+
+
+@dataclass
+class ReconcileReport:
+    """Structured result of comparing a primary dataset against other providers."""
+
+    primary: str
+    mismatches: pd.DataFrame
+    summary: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.mismatches.empty
+
+    def describe(self, limit: int = 20) -> str:
+        """Render a short human readable description of the mismatches."""
+        lines = []
+        for provider, counts in self.summary.items():
+            lines.append(
+                f"{self.primary} vs {provider}: rows={counts['rows']} "
+                f"value={counts['value']} "
+                f"missing_in_primary={counts['missing_in_primary']} "
+                f"missing_in_other={counts['missing_in_other']}"
+            )
+        for row in self.mismatches.head(limit).itertuples(index=False):
+            if row.kind == "value":
+                lines.append(
+                    f"{row.datetime}: {row.provider} {row.column}: "
+                    f"{row.primary_value} != {row.other_value}"
+                )
+            else:
+                lines.append(f"{row.datetime}: {row.provider} {row.kind}")
+        if len(self.mismatches) > limit:
+            lines.append(f"... {len(self.mismatches) - limit} more")
+        return "\n".join(lines)
+
+
+class ReconciliationError(ValueError):
+    """Raised when provider datasets disagree beyond tolerance."""
+
+    def __init__(self, report: ReconcileReport) -> None:
+        super().__init__(f"Data mismatch detected:\n{report.describe()}")
+        self.report = report
+
+
+def compare_frames(
+    primary: pd.DataFrame,
+    other: pd.DataFrame,
+    provider: str,
+    columns: list[str] | None = None,
+    tolerances: Mapping[str, Tolerance] | None = None,
+) -> tuple[pd.DataFrame, dict[str, int]]:
+    """Align two frames on datetime and return (mismatches, counts)."""
+    columns = list(columns or COMPARE_COLUMNS)
+    tolerances = DEFAULT_TOLERANCES if tolerances is None else tolerances
+
+    merged = pd.merge(
+        primary[["datetime", *columns]],
+        other[["datetime", *columns]],
+        on="datetime",
+        how="outer",
+        suffixes=("_p", "_o"),
+        indicator=True,
+        sort=True,
+    )
+    side = merged["_merge"].to_numpy()
+    both = side == "both"
+    dates = merged["datetime"].to_numpy()
+
+    parts: list[pd.DataFrame] = []
+    for kind, flag in (("missing_in_primary", "right_only"), ("missing_in_other", "left_only")):
+        mask = side == flag
+        if mask.any():
+            parts.append(
+                pd.DataFrame(
+                    {
+                        "provider": provider,
+                        "datetime": dates[mask],
+                        "kind": kind,
+                        "column": None,
+                        "primary_value": np.nan,
+                        "other_value": np.nan,
+                    }
+                )
+            )
+
+    value_count = 0
+    for column in columns:
+        left = merged[f"{column}_p"].to_numpy(dtype="float64")
+        right = merged[f"{column}_o"].to_numpy(dtype="float64")
+        tolerance = tolerances.get(column, Tolerance())
+        left_nan = np.isnan(left)
+        right_nan = np.isnan(right)
+        with np.errstate(invalid="ignore"):
+            exceeds = np.abs(left - right) > tolerance.abs + tolerance.rel * np.abs(right)
+        mask = both & ((left_nan != right_nan) | (exceeds & ~left_nan & ~right_nan))
+        if not mask.any():
+            continue
+        value_count += int(mask.sum())
+        parts.append(
+            pd.DataFrame(
+                {
+                    "provider": provider,
+                    "datetime": dates[mask],
+                    "kind": "value",
+                    "column": column,
+                    "primary_value": left[mask],
+                    "other_value": right[mask],
+                }
+            )
+        )
+
+    if parts:
+        mismatches = pd.concat(parts, ignore_index=True)
+        mismatches = mismatches.sort_values(["datetime", "kind"], kind="stable").reset_index(drop=True)
+    else:
+        mismatches = pd.DataFrame(columns=MISMATCH_COLUMNS)
+
+    counts = {
+        "rows": int(both.sum()),
+        "value": value_count,
+        "missing_in_primary": int((side == "right_only").sum()),
+        "missing_in_other": int((side == "left_only").sum()),
+    }
+    return mismatches, counts
+
+
+def reconcile(
+    datasets: Mapping[str, pd.DataFrame],
+    primary: str,
+    columns: list[str] | None = None,
+    tolerances: Mapping[str, Tolerance] | None = None,
+) -> ReconcileReport:
+    """Compare every dataset against the primary one."""
+    if primary not in datasets:
+        raise ValueError(f"Primary dataset not found: {primary}")
+
+    parts: list[pd.DataFrame] = []
+    summary: dict[str, dict[str, int]] = {}
+    for name, dataset in datasets.items():
+        if name == primary:
+            continue
+        mismatches, counts = compare_frames(
+            datasets[primary], dataset, name, columns=columns, tolerances=tolerances
+        )
+        summary[name] = counts
+        if not mismatches.empty:
+            parts.append(mismatches)
+
+    if parts:
+        mismatches = pd.concat(parts, ignore_index=True)
+    else:
+        mismatches = pd.DataFrame(columns=MISMATCH_COLUMNS)
+    return ReconcileReport(primary=primary, mismatches=mismatches, summary=summary)
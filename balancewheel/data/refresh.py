@@ -0,0 +1,293 @@
+"""Resumable refresh of a symbol universe through a persistent work queue."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Sequence
+
+import pandas as pd
+
+from balancewheel.data.interfaces import DataRequest
+from balancewheel.data.repository import Repository
+from balancewheel.data.service import DataService
+from balancewheel.data.symbols import load_symbols
+
+QUEUE_FILE = "refresh.sqlite"
+UNIVERSE_FILE = "universe.csv"
+
+# 优先级：缺失的序列最先拉取，其次为过期序列（按最后日期从旧到新）
+PRIORITY_MISSING = 0
+PRIORITY_STALE = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS job (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    symbol TEXT NOT NULL,
+    asset_type TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    last_date TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    updated TEXT,
+    PRIMARY KEY (symbol, asset_type)
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_claim ON tasks (status, priority, last_date);
+"""
+
+_UNFINISHED = ("pending", "running", "retry")
+
+
+class WorkQueue:
+    """SQLite work queue of (symbol, asset_type) tasks that survives crashes.
+
+    Tasks move pending -> running -> done; a failed task goes to `retry` with
+    an exponential delay and to `failed` once it has used all its attempts.
+    Every state change is committed immediately, so after a crash `recover()`
+    only has to put the tasks that were running back into the queue.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def job(self) -> dict:
+        """Parameters of the job the queued tasks belong to."""
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM job").fetchall()
+        return {row["key"]: json.loads(row["value"]) for row in rows}
+
+    def reset(self, job: dict, tasks: Iterable[tuple[str, str, int, str | None]]) -> int:
+        """Replace the queue with `tasks` (symbol, asset_type, priority, last_date) for `job`."""
+        updated = _now()
+        rows = [(symbol, asset_type, priority, last_date, updated) for symbol, asset_type, priority, last_date in tasks]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM tasks")
+            self._conn.execute("DELETE FROM job")
+            self._conn.executemany(
+                "INSERT INTO job (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in job.items()],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tasks (symbol, asset_type, priority, last_date, updated) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def recover(self) -> int:
+        """Requeue tasks left running by an interrupted run."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET status = 'pending', updated = ? WHERE status = 'running'", (_now(),)
+            )
+        return cursor.rowcount
+
+    def claim(self, limit: int) -> list[tuple[str, str]]:
+        """Mark up to `limit` runnable tasks as running, fresh tasks before retries."""
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT symbol, asset_type FROM tasks "
+                "WHERE status = 'pending' OR (status = 'retry' AND not_before <= ?) "
+                "ORDER BY status = 'retry', priority, last_date LIMIT ?",
+                (time.time(), limit),
+            ).fetchall()
+            keys = [(row["symbol"], row["asset_type"]) for row in rows]
+            self._conn.executemany(
+                "UPDATE tasks SET status = 'running', updated = ? WHERE symbol = ? AND asset_type = ?",
+                [(_now(), symbol, asset_type) for symbol, asset_type in keys],
+            )
+        return keys
+
+    def complete(self, keys: Iterable[tuple[str, str]]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE tasks SET status = 'done', error = NULL, updated = ? "
+                "WHERE symbol = ? AND asset_type = ?",
+                [(_now(), symbol, asset_type) for symbol, asset_type in keys],
+            )
+
+    def fail(self, key: tuple[str, str], error: BaseException, max_attempts: int, delay: float) -> str:
+        """Record a failure; returns the new status (`retry` or `failed`)."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT attempts FROM tasks WHERE symbol = ? AND asset_type = ?", key
+            ).fetchone()
+            attempts = (row["attempts"] if row else 0) + 1
+            status = "retry" if attempts < max_attempts else "failed"
+            self._conn.execute(
+                "UPDATE tasks SET status = ?, attempts = ?, not_before = ?, error = ?, updated = ? "
+                "WHERE symbol = ? AND asset_type = ?",
+                (status, attempts, time.time() + delay * 2 ** (attempts - 1), repr(error), _now(), *key),
+            )
+        return status
+
+    def next_retry(self) -> float | None:
+        """Epoch seconds at which the earliest waiting retry becomes runnable."""
+        with self._lock:
+            row = self._conn.execute("SELECT MIN(not_before) FROM tasks WHERE status = 'retry'").fetchone()
+        return row[0]
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+        return {status: int(count) for status, count in rows}
+
+    def unfinished(self) -> int:
+        counts = self.counts()
+        return sum(counts.get(status, 0) for status in _UNFINISHED)
+
+    def tasks(self, status: str | None = None) -> pd.DataFrame:
+        sql = "SELECT * FROM tasks"
+        params: tuple = ()
+        if status is not None:
+            sql += " WHERE status = ?"
+            params = (status,)
+        with self._lock:
+            return pd.read_sql_query(sql + " ORDER BY priority, last_date", self._conn, params=params)
+
+
+def load_universe(path: str | Path) -> list[tuple[str, str]]:
+    """Read (asset_type, symbol) pairs from a CSV with `symbol` and `asset_type` columns."""
+    frame = pd.read_csv(path, dtype={"symbol": str, "asset_type": str})
+    return list(dict.fromkeys(zip(frame["asset_type"], frame["symbol"])))
+
+
+def default_universe(repository: Repository) -> list[tuple[str, str]]:
+    """Universe used when none is given.
+
+    `_meta/universe.csv` when present, else the stocks and ETFs listed today
+    in the symbol master, else every stored series.
+    """
+    path = repository.meta_root / UNIVERSE_FILE
+    if path.exists():
+        return load_universe(path)
+    symbols = load_symbols(repository)
+    if symbols is not None:
+        return symbols.universe()
+    return repository.list_series()
+
+
+def plan_refresh(
+    service: DataService,
+    universe: Sequence[tuple[str, str]],
+    provider_name: str,
+    end: str,
+    adjust: str = "none",
+) -> list[tuple[str, str, int, str | None]]:
+    """Tasks for every series of `universe` that is missing or behind `end`.
+
+    With a trading calendar covering `end`, a series is up to date once it
+    holds the last session on or before `end`; with a symbol master, a
+    delisted series is up to date at its delisting date and securities listed
+    after `end` are left out. Missing series come first, then stale series
+    from the oldest last date.
+    """
+    target = pd.Timestamp(end)
+    calendar = service.calendar
+    if calendar is not None and calendar.covers(target):
+        target = calendar.previous_session(target + pd.Timedelta(days=1)) or target
+
+    tasks = []
+    for asset_type, symbol in universe:
+        info = None if service.symbols is None else service.symbols.get(symbol, asset_type)
+        series_target = target
+        if info is not None:
+            if info.list_date is not None and info.list_date > target:
+                continue
+            if info.delist_date is not None:
+                series_target = min(target, info.delist_date)
+        request = service.stored_request(DataRequest(symbol, asset_type, end, end, adjust), provider_name)
+        meta = service.repository.latest_meta(symbol, asset_type, request.adjust)
+        if meta is None or not service.repository.path_for(symbol, asset_type).exists():
+            tasks.append((symbol, asset_type, PRIORITY_MISSING, None))
+        elif pd.Timestamp(meta["last_date"]) < series_target:
+            tasks.append((symbol, asset_type, PRIORITY_STALE, meta["last_date"]))
+    tasks.sort(key=lambda task: (task[2], task[3] or ""))
+    return tasks
+
+
+def run_refresh(
+    service: DataService,
+    universe: Sequence[tuple[str, str]],
+    provider_name: str,
+    start: str,
+    end: str | None = None,
+    queue: WorkQueue | None = None,
+    adjust: str = "none",
+    workers: int = 8,
+    max_attempts: int = 3,
+    retry_delay: float = 60.0,
+    deadline: pd.Timestamp | None = None,
+    restart: bool = False,
+    progress: Callable[[dict[str, int]], None] | None = None,
+) -> dict[str, int]:
+    """Bring `universe` up to date through a resumable queue; returns task counts by status.
+
+    An unfinished queue of the same job (provider, start, end, adjust) is
+    resumed rather than re-planned unless `restart` is set. The resolved
+    `end` is stored with the job: without `end`, an unfinished job of the
+    same provider, start and adjust is resumed with its stored end (so a run
+    interrupted before midnight carries on the next day), and otherwise `end`
+    defaults to today. Work is claimed in batches of `2 * workers` and run
+    with `fetch_many(incremental=True)`; each finished batch is
+    checkpointed, so an interrupted run repeats at most one batch. Failures
+    are retried after `retry_delay` seconds, doubling per attempt, without
+    holding up other symbols. No new work is claimed after `deadline`; what
+    remains is picked up by the next run.
+    """
+    queue = queue or WorkQueue(service.repository.meta_root / QUEUE_FILE)
+    if end is None:
+        previous = queue.job()
+        wanted = {"provider": provider_name, "start": start, "adjust": adjust}
+        same = all(previous.get(key) == value for key, value in wanted.items())
+        resume = same and not restart and queue.unfinished()
+        end = previous["end"] if resume else pd.Timestamp.today().strftime("%Y%m%d")
+    job = {"provider": provider_name, "start": start, "end": end, "adjust": adjust}
+    if restart or queue.job() != job or not queue.unfinished():
+        queue.reset(job, plan_refresh(service, universe, provider_name, end, adjust))
+    else:
+        queue.recover()
+
+    batch_size = max(2 * workers, 1)
+    while deadline is None or pd.Timestamp.now() < deadline:
+        keys = queue.claim(batch_size)
+        if not keys:
+            wake = queue.next_retry()
+            if wake is None:
+                break
+            wait = wake - time.time()
+            if deadline is not None:
+                wait = min(wait, (deadline - pd.Timestamp.now()).total_seconds())
+            time.sleep(max(wait, 0.0))
+            continue
+
+        requests = {DataRequest(key[0], key[1], start, end, adjust): key for key in keys}
+        result = service.fetch_many(requests, provider_name, max_workers=workers, incremental=True)
+        queue.complete(requests[request] for request in [*result.results, *result.skipped])
+        for request, error in result.errors.items():
+            queue.fail(requests[request], error, max_attempts, retry_delay)
+        if progress is not None:
+            progress(queue.counts())
+    return queue.counts()
+
+
+def _now() -> str:
+    return pd.Timestamp.now().isoformat(timespec="seconds")
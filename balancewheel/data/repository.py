@@ -2,36 +2,489 @@
 
 from __future__ import annotations
 
-import json
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
 from datetime import datetime
 from hashlib import sha256
 from pathlib import Path
+from typing import ContextManager, Iterator
 
 import pandas as pd
 
+from balancewheel.data.adjust import apply_adjustment, normalize_factors
+from balancewheel.data.catalog import MetaCatalog, record_filename
+from balancewheel.data.normalize import PRICE_COLUMNS
+from balancewheel.data.periods import PERIOD_FREQUENCIES
+from balancewheel.data.schema import STANDARD_DTYPES
 
-class CsvRepository:
-    """Save normalized data to CSV files."""
 
-    def __init__(self, root: str | Path = "data") -> None:
+class Repository(ABC):
+    """Base class for normalized data stores sharing the `_meta` layout."""
+
+    suffix: str
+
+    def __init__(self, root: str | Path = "data", cache_bytes: int = 256 << 20) -> None:
         self.root = Path(root)
         self.root.mkdir(parents=True, exist_ok=True)
         self.meta_root = self.root / "_meta"
         self.meta_root.mkdir(parents=True, exist_ok=True)
+        self._meta_lock = threading.Lock()
+        self._fingerprints: dict[str, tuple[str, tuple[int, int]]] = {}
+        self.cache = FrameCache(cache_bytes)
+        self.catalog = MetaCatalog(self.meta_root / "catalog.sqlite")
+        legacy_manifest = self.meta_root / "manifest.jsonl"
+        if legacy_manifest.exists() and self.catalog.is_empty():
+            self.catalog.import_manifest(legacy_manifest)
+
+    def path_for(self, symbol: str, asset_type: str) -> Path:
+        return self.root / f"{asset_type}_{symbol}{self.suffix}"
+
+    def list_series(self) -> list[tuple[str, str]]:
+        """Return (asset_type, symbol) for every stored series."""
+        series = []
+        for path in sorted(self.root.glob(f"*{self.suffix}")):
+            asset_type, _, symbol = path.name[: -len(self.suffix)].partition("_")
+            if symbol:
+                series.append((asset_type, symbol))
+        return series
 
     def save(self, symbol: str, asset_type: str, data: pd.DataFrame) -> Path:
-        filename = f"{asset_type}_{symbol}.csv"
-        path = self.root / filename
+        """Persist normalized data and return the written path."""
+        path = self.path_for(symbol, asset_type)
+        self._write(path, data)
+        return path
+
+    @abstractmethod
+    def _write(self, path: Path, data: pd.DataFrame) -> None:
+        """Write a normalized frame to `path` in this repository's format."""
+
+    def load(
+        self,
+        symbol: str,
+        asset_type: str,
+        start: str | None = None,
+        end: str | None = None,
+        columns: list[str] | None = None,
+        adjust: str = "none",
+    ) -> pd.DataFrame:
+        """Load a stored series, optionally restricted to columns and a date range.
+
+        Results are kept in an in-process LRU cache keyed by the file
+        fingerprint recorded in `_meta`, so a rewritten file is never served
+        stale. Returned frames are shallow copies of the cached ones. With
+        `adjust="qfq"` or `"hfq"`, prices of the stored unadjusted bars are
+        scaled by the stored adjustment factors.
+        """
+        path = self.path_for(symbol, asset_type)
+        if not path.exists():
+            raise FileNotFoundError(f"No stored data for {asset_type} {symbol}")
+
+        read_columns = columns
+        if adjust != "none" and columns is not None and "datetime" not in columns:
+            read_columns = ["datetime", *columns]
+        fingerprint = self._fingerprint(path)
+        key = (path.name, fingerprint, start, end, None if read_columns is None else tuple(read_columns))
+        data = self.cache.get(key)
+        if data is None:
+            data = self._read(path, start, end, read_columns)
+            self.cache.put(key, data)
+        if adjust == "none":
+            return data.copy(deep=False)
+
+        factors = self.load_factors(symbol, asset_type)
+        if factors is None:
+            raise FileNotFoundError(f"No adjustment factors stored for {asset_type} {symbol}")
+        data = apply_adjustment(data, factors, adjust)
+        return data if columns is None else data[columns]
+
+    def partition_root(self, symbol: str, asset_type: str, frequency: str) -> Path:
+        """Directory holding the monthly partitions of an intraday series (unadjusted prices)."""
+        return self.root / f"{frequency}min" / f"{asset_type}_{symbol}"
+
+    def list_partitions(
+        self,
+        symbol: str,
+        asset_type: str,
+        frequency: str,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> list[Path]:
+        """Monthly partition files (named `YYYY-MM`) overlapping [start, end], in order."""
+        root = self.partition_root(symbol, asset_type, frequency)
+        first = None if start is None else pd.Timestamp(start).strftime("%Y-%m")
+        last = None if end is None else pd.Timestamp(end).strftime("%Y-%m")
+        paths = []
+        for path in sorted(root.glob(f"*{self.suffix}")):
+            month = path.name[: -len(self.suffix)]
+            if (first is None or month >= first) and (last is None or month <= last):
+                paths.append(path)
+        return paths
+
+    def save_bars(self, symbol: str, asset_type: str, frequency: str, data: pd.DataFrame) -> list[Path]:
+        """Merge intraday bars into their monthly partitions.
+
+        Only the months present in `data` are read and rewritten; bars already
+        stored at the same timestamp are replaced.
+        """
+        root = self.partition_root(symbol, asset_type, frequency)
+        root.mkdir(parents=True, exist_ok=True)
+        months = data["datetime"].dt.strftime("%Y-%m")
+        paths = []
+        for month, part in data.groupby(months.to_numpy(), sort=True):
+            path = root / f"{month}{self.suffix}"
+            if path.exists():
+                existing = self._read(path, None, None, None)
+                overlaps = not existing.empty and existing["datetime"].iloc[-1] >= part["datetime"].iloc[0]
+                part = pd.concat([existing, part], ignore_index=True)
+                if overlaps:
+                    part = part.drop_duplicates("datetime", keep="last").sort_values("datetime", kind="stable")
+            self._write(path, part.reset_index(drop=True))
+            paths.append(path)
+        return paths
+
+    def iter_bars(
+        self,
+        symbol: str,
+        asset_type: str,
+        frequency: str,
+        start: str | None = None,
+        end: str | None = None,
+        columns: list[str] | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Yield stored intraday bars one monthly partition at a time.
+
+        A date-only `end` (e.g. "20240131") includes the whole day.
+        """
+        end_ts = None if end is None else _end_of_day(end)
+        for path in self.list_partitions(symbol, asset_type, frequency, start, end):
+            part = self._read(path, start, None if end_ts is None else str(end_ts), columns)
+            if not part.empty:
+                yield part
+
+    def load_bars(
+        self,
+        symbol: str,
+        asset_type: str,
+        frequency: str,
+        start: str | None = None,
+        end: str | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        parts = list(self.iter_bars(symbol, asset_type, frequency, start, end, columns))
+        if not parts:
+            raise FileNotFoundError(
+                f"No stored {frequency}-minute data for {asset_type} {symbol} in range"
+            )
+        return pd.concat(parts, ignore_index=True)
+
+    def last_bar_time(self, symbol: str, asset_type: str, frequency: str) -> pd.Timestamp | None:
+        """Timestamp of the last stored intraday bar, reading only the last partition."""
+        partitions = self.list_partitions(symbol, asset_type, frequency)
+        if not partitions:
+            return None
+        dates = self._read(partitions[-1], None, None, ["datetime"])["datetime"]
+        return dates.iloc[-1] if len(dates) else None
+
+    def period_path_for(self, symbol: str, asset_type: str, frequency: str, adjust: str = "none") -> Path:
+        """Derived weekly/monthly series: `weekly/` holds bars as stored, `weekly_hfq/` hfq bars."""
+        if frequency not in PERIOD_FREQUENCIES:
+            raise ValueError(f"Unknown period frequency: {frequency}")
+        folder = PERIOD_FREQUENCIES[frequency]
+        if adjust != "none":
+            folder = f"{folder}_{adjust}"
+        return self.root / folder / f"{asset_type}_{symbol}{self.suffix}"
+
+    def save_periods(
+        self, symbol: str, asset_type: str, frequency: str, data: pd.DataFrame, adjust: str = "none"
+    ) -> Path:
+        path = self.period_path_for(symbol, asset_type, frequency, adjust)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._write(path, data)
+        return path
+
+    def load_periods(
+        self,
+        symbol: str,
+        asset_type: str,
+        frequency: str,
+        start: str | None = None,
+        end: str | None = None,
+        columns: list[str] | None = None,
+        adjust: str = "none",
+    ) -> pd.DataFrame:
+        """Load derived weekly (`"w"`) or monthly (`"m"`) bars.
+
+        `adjust="none"` returns bars built from the series as stored; "hfq"
+        and "qfq" need the hfq bars kept for series stored with adjustment
+        factors (qfq is hfq scaled by the latest factor). Cached like `load`,
+        keyed by file size and modification time.
+        """
+        path = self.period_path_for(symbol, asset_type, frequency, "hfq" if adjust == "qfq" else adjust)
+        if not path.exists():
+            raise FileNotFoundError(
+                f"No stored {adjust} {PERIOD_FREQUENCIES[frequency]} data for {asset_type} {symbol}"
+            )
+        stat = path.stat()
+        read_columns = None if columns is None else tuple(columns)
+        key = (f"{path.parent.name}/{path.name}", (stat.st_mtime_ns, stat.st_size), start, end, read_columns)
+        data = self.cache.get(key)
+        if data is None:
+            data = self._read(path, start, end, columns)
+            self.cache.put(key, data)
+        if adjust != "qfq":
+            return data.copy(deep=False)
+
+        factors = self.load_factors(symbol, asset_type)
+        if factors is None or factors.empty:
+            raise FileNotFoundError(f"No adjustment factors stored for {asset_type} {symbol}")
+        scale = 1.0 / factors["factor"].iloc[-1]
+        # 周期内的价格与涨跌额同为后复权口径，整体除以最新因子即为前复权
+        scaled = [column for column in [*PRICE_COLUMNS, "change"] if column in data.columns]
+        return data.assign(**{column: data[column] * scale for column in scaled})
+
+    def factors_path_for(self, symbol: str, asset_type: str) -> Path:
+        return self.meta_root / "factors" / f"{asset_type}_{symbol}.csv"
+
+    def series_adjust(self, symbol: str, asset_type: str, adjust: str) -> str:
+        """The `adjust` to pass to `load` for a series.
+
+        Series stored with adjustment factors are adjusted locally; series
+        without factors (ETF, index) are kept as fetched, so they load as "none".
+        """
+        if adjust == "none" or not self.factors_path_for(symbol, asset_type).exists():
+            return "none"
+        return adjust
+
+    def save_factors(self, symbol: str, asset_type: str, factors: pd.DataFrame) -> Path:
+        """Store the cumulative backward adjustment factors of a series."""
+        path = self.factors_path_for(symbol, asset_type)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        normalize_factors(factors).to_csv(path, index=False)
+        return path
+
+    def load_factors(self, symbol: str, asset_type: str) -> pd.DataFrame | None:
+        path = self.factors_path_for(symbol, asset_type)
+        if not path.exists():
+            return None
+        stat = path.stat()
+        key = (f"factors/{path.name}", (stat.st_mtime_ns, stat.st_size), None, None, None)
+        factors = self.cache.get(key)
+        if factors is None:
+            factors = normalize_factors(pd.read_csv(path))
+            self.cache.put(key, factors)
+        return factors
+
+    @abstractmethod
+    def _read(
+        self,
+        path: Path,
+        start: str | None,
+        end: str | None,
+        columns: list[str] | None,
+    ) -> pd.DataFrame:
+        """Read a stored file, touching as little of it as the format allows."""
+
+    def _fingerprint(self, path: Path) -> str:
+        """Fingerprint from `_meta`, re-hashed if the file changed since it was recorded."""
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._meta_lock:
+            known = self._fingerprints.get(path.name)
+        if known is not None and known[1] == signature:
+            return known[0]
+
+        fingerprint = None
+        if known is None:
+            fingerprint = self._recorded_fingerprint(path.name)
+        if fingerprint is None or known is not None:
+            fingerprint = file_fingerprint(path)
+        with self._meta_lock:
+            self._fingerprints[path.name] = (fingerprint, signature)
+        return fingerprint
+
+    def _recorded_fingerprint(self, filename: str) -> str | None:
+        return self.catalog.fingerprint_for(filename)
+
+    def append(self, symbol: str, asset_type: str, data: pd.DataFrame) -> Path:
+        """Append rows after the stored history; the default rewrites the file."""
+        existing = self.load(symbol, asset_type)
+        combined = pd.concat([existing, data], ignore_index=True)
+        return self.save(symbol, asset_type, combined)
+
+    def latest_meta(self, symbol: str, asset_type: str, adjust: str) -> dict | None:
+        """Return the most recent catalog record for a stored series."""
+        record = self.catalog.latest(symbol, asset_type, adjust)
+        if record is None:
+            return None
+        if record_filename(record.get("path") or "") != self.path_for(symbol, asset_type).name:
+            return None
+        return record
+
+    def write_meta(self, record: dict) -> None:
+        with self._meta_lock:
+            path = Path(record["path"])
+            if path.exists():
+                stat = path.stat()
+                self._fingerprints[path.name] = (
+                    record["fingerprint"],
+                    (stat.st_mtime_ns, stat.st_size),
+                )
+        self.catalog.record(record)
+
+    def transaction(self) -> ContextManager[MetaCatalog]:
+        """Group meta writes of a multi-symbol job into one atomic catalog commit."""
+        return self.catalog.transaction()
+
+
+class CsvRepository(Repository):
+    """Save normalized data to CSV files."""
+
+    suffix = ".csv"
+
+    def _write(self, path: Path, data: pd.DataFrame) -> None:
         data.to_csv(path, index=False)
+
+    def append(self, symbol: str, asset_type: str, data: pd.DataFrame) -> Path:
+        path = self.path_for(symbol, asset_type)
+        if not path.exists():
+            return self.save(symbol, asset_type, data)
+        data.to_csv(path, mode="a", header=False, index=False)
         return path
 
-    def write_meta(self, record: dict, batch: dict) -> None:
-        manifest_path = self.meta_root / "manifest.jsonl"
-        with manifest_path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+    chunk_rows = 50_000
+
+    def _read(
+        self,
+        path: Path,
+        start: str | None,
+        end: str | None,
+        columns: list[str] | None,
+    ) -> pd.DataFrame:
+        usecols = None if columns is None else list(dict.fromkeys(["datetime", *columns]))
+        if start is None and end is None:
+            data = pd.read_csv(path, usecols=usecols, parse_dates=["datetime"])
+            return data if columns is None else data[columns]
+
+        # 文件按日期递增保存：分块读取，只保留区间内的行，越过 end 后停止解析
+        parts = []
+        end_ts = None if end is None else pd.Timestamp(end)
+        reader = pd.read_csv(path, usecols=usecols, parse_dates=["datetime"], chunksize=self.chunk_rows)
+        with reader:
+            for chunk in reader:
+                parts.append(chunk[_date_mask(chunk["datetime"], start, end)])
+                if end_ts is not None and chunk["datetime"].iloc[-1] > end_ts:
+                    break
+        data = pd.concat(parts, ignore_index=True) if parts else pd.read_csv(
+            path, usecols=usecols, parse_dates=["datetime"], nrows=0
+        )
+        return data if columns is None else data[columns]
+
+
+class ParquetRepository(Repository):
+    """Save normalized data to typed, columnar Parquet files."""
+
+    suffix = ".parquet"
+    row_group_size = 1024
 
-        current_path = self.meta_root / "current.json"
-        current_path.write_text(json.dumps(batch, ensure_ascii=False, indent=2), encoding="utf-8")
+    def _write(self, path: Path, data: pd.DataFrame) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(coerce_standard_dtypes(data), preserve_index=False)
+        pq.write_table(table, path, compression="zstd", row_group_size=self.row_group_size)
+
+    def _read(
+        self,
+        path: Path,
+        start: str | None,
+        end: str | None,
+        columns: list[str] | None,
+    ) -> pd.DataFrame:
+        import pyarrow.parquet as pq
+
+        filters = []
+        if start is not None:
+            filters.append(("datetime", ">=", pd.Timestamp(start)))
+        if end is not None:
+            filters.append(("datetime", "<=", pd.Timestamp(end)))
+        table = pq.read_table(path, columns=columns, filters=filters or None)
+        return table.to_pandas()
+
+
+class FrameCache:
+    """Thread-safe LRU of DataFrames bounded by their in-memory size."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, tuple[pd.DataFrame, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> pd.DataFrame | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: tuple, data: pd.DataFrame) -> None:
+        size = int(data.memory_usage(deep=True).sum())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            # 同一文件的旧指纹条目已不可能命中，直接释放
+            for stale in [k for k in self._entries if k[0] == key[0] and k[1] != key[1]]:
+                self.bytes -= self._entries.pop(stale)[1]
+            self._entries[key] = (data, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+
+def _date_mask(dates: pd.Series, start: str | None, end: str | None) -> pd.Series:
+    mask = pd.Series(True, index=dates.index)
+    if start is not None:
+        mask &= dates >= pd.Timestamp(start)
+    if end is not None:
+        mask &= dates <= pd.Timestamp(end)
+    return mask
+
+
+def _end_of_day(value: str) -> pd.Timestamp:
+    """Inclusive upper bound: a date without a time extends to the end of that day."""
+    timestamp = pd.Timestamp(value)
+    if timestamp == timestamp.normalize() and ":" not in str(value):
+        return timestamp + pd.Timedelta(days=1) - pd.Timedelta(1, "ns")
+    return timestamp
+
+
+def coerce_standard_dtypes(data: pd.DataFrame) -> pd.DataFrame:
+    """Cast standard columns to the fixed storage dtypes."""
+    dtypes = {
+        column: dtype
+        for column, dtype in STANDARD_DTYPES.items()
+        if column in data.columns and data[column].dtype != dtype
+    }
+    if not dtypes:
+        return data
+    if "volume" in dtypes:
+        data = data.assign(volume=data["volume"].round())
+    return data.astype(dtypes)
 
 
 def build_meta(
@@ -42,22 +495,32 @@ def build_meta(
     start: str,
     end: str,
     data: pd.DataFrame,
+    asset_type: str | None = None,
+    fingerprint: str | None = None,
+    stats: dict | None = None,
 ) -> dict:
     timestamp = datetime.utcnow().isoformat()
+    first_date = data["datetime"].iloc[0].isoformat()
     last_date = data["datetime"].iloc[-1].isoformat()
-    fingerprint = file_fingerprint(path)
-    return {
+    if fingerprint is None:
+        fingerprint = file_fingerprint(path)
+    record = {
         "timestamp": timestamp,
         "symbol": symbol,
+        "asset_type": asset_type,
         "path": str(path),
         "source": source,
         "adjust": adjust,
         "start": start,
         "end": end,
         "rows": int(len(data)),
+        "first_date": first_date,
         "last_date": last_date,
         "fingerprint": fingerprint,
     }
+    if stats is not None:
+        record["stats"] = stats
+    return record
 
 
 def file_fingerprint(path: Path) -> str:
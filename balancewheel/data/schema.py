@@ -13,3 +13,17 @@ STANDARD_COLUMNS = [
     "change",
     "turnover",
 ]
+
+STANDARD_DTYPES = {
+    "datetime": "datetime64[ns]",
+    "open": "float64",
+    "high": "float64",
+    "low": "float64",
+    "close": "float64",
+    "volume": "int64",
+    "amount": "float64",
+    "amplitude": "float64",
+    "change_pct": "float64",
+    "change": "float64",
+    "turnover": "float64",
+}
@@ -2,138 +2,663 @@
 
 from __future__ import annotations
 
-from typing import Mapping
+import contextvars
+import cProfile
+import functools
+import itertools
+import pstats
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable, ContextManager, Iterable, Mapping, Sequence, TypeVar
 
 import pandas as pd
-import numpy as np
 
+from balancewheel.data.adjust import apply_adjustment, normalize_factors
+from balancewheel.data.batch import BatchResult, ProviderGate, ProviderLimit, RetryPolicy
+from balancewheel.data.calendar import CALENDAR_FILE, TradingCalendar, load_calendar
 from balancewheel.data.interfaces import DataProvider, DataRequest
-from balancewheel.data.normalize import normalize_ohlcv
+from balancewheel.data.normalize import normalize_chunks, normalize_ohlcv
+from balancewheel.data.periods import PERIOD_FREQUENCIES, update_periods
 from balancewheel.data.providers.akshare_provider import AkshareEtfSinaProvider
-from balancewheel.data.repository import CsvRepository, build_meta
-from balancewheel.data.validation import validate_ohlcv
+from balancewheel.data.quality import check_frames
+from balancewheel.data.reconcile import (
+    DEFAULT_TOLERANCES,
+    ReconciliationError,
+    Tolerance,
+    compare_frames,
+    reconcile,
+)
+from balancewheel.data.repository import Repository, build_meta, file_fingerprint
+from balancewheel.data.stats import PipelineStats, current_run
+from balancewheel.data.symbols import SYMBOLS_FILE, NotListedError, SymbolMaster, load_symbols
+from balancewheel.data.validation import validate_chunks, validate_ohlcv
+from balancewheel.data.verification import VERIFICATION_FILE, VerificationPolicy, Verifier, window_mask
+
+SEAM_COLUMNS = ["open", "high", "low", "close"]
+
+F = TypeVar("F", bound=Callable)
+
+
+def _instrumented(method: F) -> F:
+    """Give each top-level request its own child stats for the run metadata."""
+
+    @functools.wraps(method)
+    def wrapper(self: "DataService", *args: object, **kwargs: object) -> object:
+        if current_run.get() is not None:
+            return method(self, *args, **kwargs)
+        token = current_run.set(self.stats.child())
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            current_run.reset(token)
+
+    return wrapper  # type: ignore[return-value]
 
 
 class DataService:
     """Coordinate data fetching and persistence."""
 
-    def __init__(self, providers: Mapping[str, DataProvider], repository: CsvRepository) -> None:
+    def __init__(
+        self,
+        providers: Mapping[str, DataProvider],
+        repository: Repository,
+        tolerances: Mapping[str, Tolerance] | None = None,
+        provider_limits: Mapping[str, ProviderLimit] | None = None,
+        retry: RetryPolicy | None = None,
+        provider_workers: int = 16,
+        calendar: TradingCalendar | None = None,
+        quarantine: bool = False,
+        instrument: bool = True,
+        symbols: SymbolMaster | None = None,
+        verification: VerificationPolicy | None = None,
+        periods: Sequence[str] = tuple(PERIOD_FREQUENCIES),
+    ) -> None:
         self.providers = providers
         self.repository = repository
+        self.calendar = calendar if calendar is not None else load_calendar(repository)
+        self.symbols = symbols if symbols is not None else load_symbols(repository)
+        self.quarantine = quarantine
+        self.periods = tuple(periods)
+        self.tolerances = dict(DEFAULT_TOLERANCES if tolerances is None else tolerances)
+        self.provider_limits = dict(provider_limits or {})
+        self.retry = retry or RetryPolicy()
+        self.provider_workers = provider_workers
+        self.stats = PipelineStats(enabled=instrument)
+        self.verifier = Verifier(verification, repository.meta_root / VERIFICATION_FILE)
+        self._serial = False
+        self._gates: dict[str, ProviderGate] = {}
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def fetch_many(
+        self,
+        requests: Iterable[DataRequest],
+        provider_name: str,
+        max_workers: int = 8,
+        incremental: bool = False,
+    ) -> BatchResult:
+        """Fetch and save many requests concurrently, isolating failures per request.
+
+        Provider calls are bounded by `provider_limits` and retried with backoff
+        according to `retry`; a failing request is recorded in the result and
+        does not stop the others. Catalog records of the batch are committed
+        together when it finishes. Intraday requests go through `fetch_intraday`
+        and report the number of rows written. With a symbol master, requests
+        entirely outside a security's listing range are reported as skipped
+        without contacting any provider. Verification statistics are saved
+        when the batch finishes.
+        """
+        if provider_name not in self.providers:
+            raise ValueError(f"Unknown provider: {provider_name}")
+
+        result = BatchResult()
+        runnable = []
+        for request in dict.fromkeys(requests):
+            if self.symbols is not None and self.symbols.clip(request) is None:
+                result.skipped.append(request)
+            else:
+                runnable.append(request)
+        with self.repository.transaction(), ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="fetch"
+        ) as pool:
+            futures = {
+                pool.submit(self._run_request, request, provider_name, incremental): request
+                for request in runnable
+            }
+            for future in as_completed(futures):
+                request = futures[future]
+                try:
+                    result.results[request] = future.result()
+                except Exception as error:  # noqa: BLE001 - isolate per-request failures
+                    result.errors[request] = error
+        self.verifier.save()
+        return result
+
+    @_instrumented
+    def fetch_intraday(
+        self, request: DataRequest, provider_name: str, incremental: bool = False
+    ) -> int:
+        """Fetch minute bars month by month into the partitioned store.
+
+        Each month is fetched, normalized, validated and merged into its
+        partition before the next one is requested, so memory stays bounded by
+        one month of bars. With `incremental`, fetching resumes from the day of
+        the last stored bar. Intraday bars come from a single provider and are
+        not cross-validated. Partitions are not keyed by adjustment, so only
+        unadjusted bars are stored; other `adjust` values raise ValueError.
+        Returns the number of rows written.
+        """
+        if provider_name not in self.providers:
+            raise ValueError(f"Unknown provider: {provider_name}")
+        if not request.intraday:
+            raise ValueError("fetch_intraday needs an intraday frequency")
+        if request.adjust != "none":
+            raise ValueError(f"Intraday bars are stored unadjusted only, got adjust={request.adjust}")
+
+        request = self._clip(request)
+        provider = self.providers[provider_name]
+        start = pd.Timestamp(request.start)
+        if incremental:
+            last = self.repository.last_bar_time(request.symbol, request.asset_type, request.frequency)
+            if last is not None:
+                start = max(start, last.normalize())
+        stats = self._run_stats()
+        windows = [
+            (first, last)
+            for first, last in month_windows(start, pd.Timestamp(request.end))
+            if self.calendar is None
+            or not self.calendar.covers(last)
+            or len(self.calendar.sessions_in_range(first, last))
+        ]
+        gate = self._gate(provider_name)
+        month_requests = [replace(request, start=first, end=last) for first, last in windows]
+        raw_chunks = (
+            self._timed_call(stats, provider_name, gate, lambda month=month: provider.fetch_ohlcv(month))
+            for month in month_requests
+        )
+        multiplier = provider.volume_multiplier(request.asset_type)
+        ordered = (
+            chunk.sort_values("datetime").reset_index(drop=True)
+            if not chunk["datetime"].is_monotonic_increasing
+            else chunk
+            for chunk in normalize_chunks(raw_chunks, volume_multiplier=multiplier)
+        )
+        rows = 0
+        for chunk in validate_chunks(ordered):
+            with stats.stage("save"):
+                paths = self.repository.save_bars(request.symbol, request.asset_type, request.frequency, chunk)
+            rows += len(chunk)
+            stats.count("rows", len(chunk))
+            if stats.enabled:
+                stats.count("bytes_written", sum(path.stat().st_size for path in paths))
+        return rows
+
+    def pipeline_stats(self) -> dict:
+        """Stage timings and counters accumulated by this service, plus cache stats.
+
+        Per-request breakdowns are stored with each catalog record under
+        `stats`; see `python -m balancewheel.data stats`.
+        """
+        snapshot = self.stats.snapshot()
+        cache = self.repository.cache
+        snapshot["cache"] = {"hits": cache.hits, "misses": cache.misses}
+        snapshot["retries"] = {name: gate.retries for name, gate in self._gates.items()}
+        return snapshot
 
+    def profile(
+        self,
+        request: DataRequest,
+        provider_name: str,
+        incremental: bool = False,
+        path: str | Path | None = None,
+    ) -> pstats.Stats:
+        """Run one request under cProfile and return (optionally dump) the stats.
+
+        Providers are fetched in the calling thread while profiling so that
+        their work shows up in the profile.
+        """
+        profiler = cProfile.Profile()
+        self._serial = True
+        try:
+            profiler.enable()
+            try:
+                self._run_request(request, provider_name, incremental)
+            finally:
+                profiler.disable()
+        finally:
+            self._serial = False
+        result = pstats.Stats(profiler)
+        if path is not None:
+            result.dump_stats(str(path))
+        return result
+
+    def close(self) -> None:
+        """Save verification statistics and shut down the shared provider thread pool."""
+        self.verifier.save()
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def update_calendar(
+        self, provider_name: str, start: str = "19900101", end: str | None = None
+    ) -> TradingCalendar:
+        """Download trading sessions and store them under the repository's `_meta`."""
+        if provider_name not in self.providers:
+            raise ValueError(f"Unknown provider: {provider_name}")
+
+        end = end or pd.Timestamp.today().strftime("%Y%m%d")
+        provider = self.providers[provider_name]
+        sessions = self._gate(provider_name).call(lambda: provider.fetch_trade_dates(start, end))
+        calendar = TradingCalendar(sessions)
+        calendar.save(self.repository.meta_root / CALENDAR_FILE)
+        self.calendar = calendar
+        return calendar
+
+    def update_symbols(self, provider_name: str) -> SymbolMaster:
+        """Download the security list and store it as the symbol master under `_meta`."""
+        if provider_name not in self.providers:
+            raise ValueError(f"Unknown provider: {provider_name}")
+
+        provider = self.providers[provider_name]
+        symbols = SymbolMaster(self._gate(provider_name).call(provider.fetch_symbols))
+        symbols.save(self.repository.meta_root / SYMBOLS_FILE)
+        self.symbols = symbols
+        return symbols
+
+    def rebuild_periods(self, series: Iterable[tuple[str, str]] | None = None) -> int:
+        """Rebuild the weekly/monthly bars of stored (asset_type, symbol) series (default: all)."""
+        series = self.repository.list_series() if series is None else list(series)
+        for asset_type, symbol in series:
+            data = self.repository.load(symbol, asset_type)
+            self._save_periods(symbol, asset_type, data, self.repository.load_factors(symbol, asset_type))
+        return len(series)
+
+    @_instrumented
     def fetch_and_save(self, request: DataRequest, provider_name: str) -> pd.DataFrame:
+        """Fetch, validate and store a series; returns it adjusted as requested.
+
+        When the provider publishes adjustment factors for the asset type, the
+        unadjusted bars and the factor table are stored and qfq/hfq prices are
+        derived locally, so every adjustment mode shares one download. With a
+        symbol master the date range is first clipped to the listing range;
+        `NotListedError` is raised when nothing of it remains. Weekly and
+        monthly bars (`periods`) are rebuilt next to the daily series.
+        """
+        if provider_name not in self.providers:
+            raise ValueError(f"Unknown provider: {provider_name}")
+        if request.intraday:
+            raise ValueError("Use fetch_intraday for minute bars")
+
+        stats = self._run_stats()
+        request = self._clip(request)
+        stored_request = self.stored_request(request, provider_name)
+        # 全量重写（含接缝或指纹不一致后的重取）整段校验；new_rows 只作用于 _update_stored 的追加路径
+        normalized = self._fetch_with_cross_validation(stored_request, provider_name)
+        with stats.stage("save"):
+            path = self.repository.save(request.symbol, request.asset_type, normalized)
+        stats.count("rows", len(normalized))
+        uses_factors = self._uses_factors(request, provider_name)
+        factors = self._save_factors(stored_request, provider_name) if uses_factors else None
+        self._save_periods(request.symbol, request.asset_type, normalized, factors)
+        self._write_meta(stored_request, provider_name, path, request.start, normalized)
+        if not uses_factors:
+            return normalized
+        return apply_adjustment(normalized, factors, request.adjust)
+
+    @_instrumented
+    def update(
+        self, request: DataRequest, provider_name: str, overlap: int = 5
+    ) -> pd.DataFrame:
+        """Fetch only the trailing days missing from the store and append them.
+
+        The last `overlap` stored rows are re-fetched and compared with the stored
+        values; any price difference (e.g. a corporate action rewriting adjusted
+        history) or a missing seam falls back to a full `fetch_and_save`. With a
+        trading calendar covering `request.end`, no request is made when no
+        session has passed since the last stored date. Series stored unadjusted
+        with factors refresh the factor table whenever new bars are appended;
+        of the weekly and monthly bars only the trailing periods are rebuilt.
+        Returns the stored series, adjusted as requested.
+        """
         if provider_name not in self.providers:
             raise ValueError(f"Unknown provider: {provider_name}")
 
-        normalized = self._fetch_with_cross_validation(request, provider_name)
-        data_to_save = normalized
-        if provider_name in {"akshare", "akshare_sina"}:
-            data_to_save = normalized.copy()
-            data_to_save["volume"] = data_to_save["volume"] * 100
-        path = self.repository.save(request.symbol, request.asset_type, data_to_save)
+        if request.intraday:
+            raise ValueError("Use fetch_intraday(incremental=True) for minute bars")
+
+        request = self._clip(request)
+        stored_request = self.stored_request(request, provider_name)
+        stored = self._update_stored(stored_request, provider_name, overlap)
+        if stored_request is request:
+            return stored
+        factors = self.repository.load_factors(request.symbol, request.asset_type)
+        if factors is None:
+            factors = self._save_factors(stored_request, provider_name)
+        return apply_adjustment(stored, factors, request.adjust)
+
+    def _update_stored(
+        self, request: DataRequest, provider_name: str, overlap: int
+    ) -> pd.DataFrame:
+        stats = self._run_stats()
+        meta = self.repository.latest_meta(request.symbol, request.asset_type, request.adjust)
+        path = self.repository.path_for(request.symbol, request.asset_type)
+        if meta is None or not path.exists():
+            return self._full_rewrite(request, provider_name)
+        with stats.stage("fingerprint"):
+            fingerprint = file_fingerprint(path)
+        if fingerprint != meta.get("fingerprint"):
+            return self._full_rewrite(request, provider_name)
+
+        with stats.stage("load"):
+            stored = self.repository.load(request.symbol, request.asset_type)
+        last_date = pd.Timestamp(meta["last_date"])
+        if stored.empty or stored["datetime"].iloc[-1] != last_date:
+            return self._full_rewrite(request, provider_name)
+        if last_date >= pd.Timestamp(request.end):
+            return stored
+        if self.calendar is not None and self.calendar.covers(request.end):
+            next_session = self.calendar.next_session(last_date)
+            if next_session is None or next_session > pd.Timestamp(request.end):
+                return stored
+
+        seam = stored.tail(max(overlap, 1))
+        seam_start = seam["datetime"].iloc[0].strftime("%Y%m%d")
+        tail_request = replace(request, start=seam_start)
+        fetched = self._fetch_with_cross_validation(tail_request, provider_name, since=last_date)
+
+        overlap_rows = fetched[fetched["datetime"] <= last_date]
+        mismatches, counts = compare_frames(
+            seam, overlap_rows, provider_name, columns=SEAM_COLUMNS, tolerances=self.tolerances
+        )
+        if not mismatches.empty or counts["rows"] != len(seam):
+            return self._full_rewrite(request, provider_name)
+
+        new_rows = fetched[fetched["datetime"] > last_date].reset_index(drop=True)
+        if new_rows.empty:
+            return stored
+
+        combined = pd.concat([stored, new_rows], ignore_index=True)
+        with stats.stage("validate"):
+            validate_ohlcv(combined)
+        with stats.stage("save"):
+            path = self.repository.append(request.symbol, request.asset_type, new_rows)
+        stats.count("rows", len(new_rows))
+        factors = None
+        if self._uses_factors(request, provider_name):
+            # 新的除权除息日只会出现在新增的交易日上
+            factors = self._save_factors(request, provider_name)
+        since = new_rows["datetime"].iloc[0]
+        self._save_periods(request.symbol, request.asset_type, combined, factors, since=since)
+        self._write_meta(request, provider_name, path, meta.get("start", request.start), combined)
+        return combined
+
+    def _run_request(
+        self, request: DataRequest, provider_name: str, incremental: bool
+    ) -> pd.DataFrame | int:
+        if request.intraday:
+            return self.fetch_intraday(request, provider_name, incremental=incremental)
+        if incremental:
+            return self.update(request, provider_name)
+        return self.fetch_and_save(request, provider_name)
+
+    def _full_rewrite(self, request: DataRequest, provider_name: str) -> pd.DataFrame:
+        self.fetch_and_save(request, provider_name)
+        return self.repository.load(request.symbol, request.asset_type)
+
+    def _clip(self, request: DataRequest) -> DataRequest:
+        """Restrict `request` to the listing range known to the symbol master."""
+        if self.symbols is None:
+            return request
+        clipped = self.symbols.clip(request)
+        if clipped is None:
+            raise NotListedError(request)
+        return clipped
+
+    def _stratum(self, request: DataRequest) -> str:
+        """Verification stratum: the board from the symbol master, else the asset type."""
+        info = None if self.symbols is None else self.symbols.get(request.symbol, request.asset_type)
+        return request.asset_type if info is None else info.board
+
+    def _uses_factors(self, request: DataRequest, provider_name: str) -> bool:
+        return self.providers[provider_name].has_adjust_factors(request.asset_type)
+
+    def stored_request(self, request: DataRequest, provider_name: str) -> DataRequest:
+        """The request actually stored for `request`: unadjusted when factors can be fetched.
+
+        Catalog records are keyed by this request's adjust, so look-ups of a
+        series' stored state (e.g. `repository.latest_meta`) should use it.
+        """
+        if request.adjust != "none" and self._uses_factors(request, provider_name):
+            return replace(request, adjust="none")
+        return request
+
+    def _save_factors(self, request: DataRequest, provider_name: str) -> pd.DataFrame:
+        provider = self.providers[provider_name]
+        stats = self._run_stats()
+        raw = self._timed_call(
+            stats, provider_name, self._gate(provider_name), lambda: provider.fetch_adjust_factors(request)
+        )
+        with stats.stage("factors"):
+            factors = normalize_factors(raw)
+            self.repository.save_factors(request.symbol, request.asset_type, factors)
+        return factors
+
+    def _save_periods(
+        self,
+        symbol: str,
+        asset_type: str,
+        data: pd.DataFrame,
+        factors: pd.DataFrame | None,
+        since: pd.Timestamp | None = None,
+    ) -> None:
+        """Maintain the weekly/monthly bars of a stored daily series.
+
+        Without `since` they are rebuilt from `data`; otherwise only periods
+        from the one containing `since` (the first appended day) are
+        recomputed, plus the period before it if that one still carries a
+        provisional label. Series stored with factors also keep hfq bars,
+        from which qfq bars are read.
+        """
+        if not self.periods:
+            return
+        spaces = ("none",) if factors is None else ("none", "hfq")
+        with self._stage("periods"):
+            for frequency, adjust in itertools.product(self.periods, spaces):
+                existing = None
+                path = self.repository.period_path_for(symbol, asset_type, frequency, adjust)
+                if since is not None and path.exists():
+                    existing = self.repository.load_periods(symbol, asset_type, frequency, adjust=adjust)
+                daily = apply_adjustment(data, factors, "hfq") if adjust == "hfq" else data
+                bars = update_periods(existing, daily, frequency, self.calendar, since)
+                self.repository.save_periods(symbol, asset_type, frequency, bars, adjust)
+
+    def _write_meta(
+        self,
+        request: DataRequest,
+        provider_name: str,
+        path: Path,
+        start: str,
+        data: pd.DataFrame,
+    ) -> None:
+        stats = self._run_stats()
+        if stats.enabled:
+            stats.count("bytes_written", path.stat().st_size)
+        with stats.stage("fingerprint"):
+            fingerprint = file_fingerprint(path)
         meta = build_meta(
             symbol=request.symbol,
             path=path,
             source=provider_name,
             adjust=request.adjust,
-            start=request.start,
+            start=start,
             end=request.end,
-            data=data_to_save,
+            data=data,
+            asset_type=request.asset_type,
+            fingerprint=fingerprint,
+            stats=stats.snapshot() if stats.enabled and stats is not self.stats else None,
         )
-        self.repository.write_meta(record=meta, batch=meta)
-        return normalized
+        with stats.stage("meta"):
+            self.repository.write_meta(meta)
 
     def _fetch_with_cross_validation(
-        self, request: DataRequest, primary_provider: str
+        self, request: DataRequest, primary_provider: str, since: pd.Timestamp | None = None
     ) -> pd.DataFrame:
-        datasets: dict[str, pd.DataFrame] = {}
+        """Fetch from the primary provider and check it against the others.
+
+        The verification policy decides which date windows (if any) are
+        compared; other providers are only asked for those windows, and
+        providers without a date range parameter for their single span.
+        `since` is the last stored date when only new rows are appended to a
+        stored series; the `new_rows` policy then skips the rows up to it.
+        Full rewrites leave it unset and are always verified over the whole
+        range.
+        """
         providers = dict(self.providers)
 
         if request.asset_type == "etf":
             providers.pop("baostock", None)
-            providers["akshare_sina"] = AkshareEtfSinaProvider()
+            providers["akshare_sina"] = self.providers.get("akshare_sina") or AkshareEtfSinaProvider()
+        else:
+            providers.pop("akshare_sina", None)
 
         if primary_provider not in providers:
             raise ValueError(f"Primary provider not available for asset type: {primary_provider}")
 
+        stats = self._run_stats()
+        stratum = self._stratum(request)
+        windows = self.verifier.windows(request, stratum, since) if len(providers) > 1 else []
+        calls = [(primary_provider, request)]
         for name, provider in providers.items():
-            raw = provider.fetch_daily_ohlcv(request)
-            normalized = normalize_ohlcv(raw)
-            normalized = normalized.sort_values("datetime").reset_index(drop=True)
-            if request.asset_type == "etf" and name == "akshare_sina":
-                start = pd.to_datetime(request.start)
-                end = pd.to_datetime(request.end)
-                normalized = normalized[
-                    (normalized["datetime"] >= start) & (normalized["datetime"] <= end)
-                ].reset_index(drop=True)
-            validate_ohlcv(normalized)
-            datasets[name] = normalized
-
-        primary = datasets[primary_provider]
-        mismatches: list[str] = []
-        compare_columns = ["datetime", "open", "high", "low", "close", "volume"]
-
-        def prepare_for_compare(provider_name: str, data: pd.DataFrame) -> pd.DataFrame:
-            subset = data[compare_columns].copy()
-            if provider_name == "akshare_sina":
-                subset["volume"] = subset["volume"] / 100
-                subset["volume"] = np.floor(subset["volume"] + 0.5)
-            if request.asset_type == "stock" and provider_name == "baostock":
-                subset["volume"] = subset["volume"] / 100
-                subset["volume"] = np.floor(subset["volume"] + 0.5)
-            return subset
-
-        primary_compare = prepare_for_compare(primary_provider, primary)
-        for name, dataset in datasets.items():
-            if name == primary_provider:
+            if name == primary_provider or not windows:
                 continue
+            if len(windows) > 1 and getattr(provider, "fetch_full_history", None) is not None:
+                spans = [(windows[0][0], windows[-1][1])]
+            else:
+                spans = windows
+            calls.extend((name, replace(request, start=start, end=end)) for start, end in spans)
 
-            other_compare = prepare_for_compare(name, dataset)
-            primary_len = len(primary_compare)
-            other_len = len(other_compare)
-            min_len = min(primary_len, other_len)
-            if primary_len != other_len:
-                mismatches.append(
-                    f"Length mismatch between {primary_provider} ({primary_len}) and {name} ({other_len})"
+        if len(calls) == 1 or self._serial:
+            frames = [self._fetch_normalized(name, providers[name], call) for name, call in calls]
+        else:
+            # 复制上下文，让线程池中的耗时记到当前请求上
+            futures = [
+                self._provider_pool().submit(
+                    contextvars.copy_context().run, self._fetch_normalized, name, providers[name], call
                 )
+                for name, call in calls
+            ]
+            frames = [future.result() for future in futures]
 
-            for idx in range(min_len):
-                primary_row = primary_compare.iloc[idx]
-                other_row = other_compare.iloc[idx]
-                diff_cols = []
-                for column in compare_columns:
-                    primary_value = primary_row[column]
-                    other_value = other_row[column]
-                    if pd.isna(primary_value) and pd.isna(other_value):
-                        continue
-                    if primary_value != other_value:
-                        diff_cols.append(
-                            f"{column}: {primary_value} != {other_value}"
-                        )
-                if diff_cols:
-                    row_number = idx + 1
-                    date_value = primary_row["datetime"]
-                    mismatches.append(
-                        f"Row {row_number} ({date_value}): {name} mismatch -> {', '.join(diff_cols)}"
-                    )
-
-            if other_len > min_len:
-                for idx in range(min_len, other_len):
-                    row_number = idx + 1
-                    date_value = other_compare.iloc[idx]["datetime"]
-                    mismatches.append(
-                        f"Row {row_number} ({date_value}): {primary_provider} missing row"
-                    )
-            elif primary_len > min_len:
-                for idx in range(min_len, primary_len):
-                    row_number = idx + 1
-                    date_value = primary_compare.iloc[idx]["datetime"]
-                    mismatches.append(
-                        f"Row {row_number} ({date_value}): {name} missing row"
-                    )
-
-        if mismatches:
-            detail = "\n".join(mismatches)
-            raise ValueError(f"Data mismatch detected:\n{detail}")
+        primary = frames[0]
+        if not windows:
+            if len(providers) > 1:
+                stats.count("verify.skipped")
+            return primary
 
+        with self._stage("reconcile"):
+            parts: dict[str, list[pd.DataFrame]] = {}
+            for (name, _), frame in zip(calls, frames):
+                parts.setdefault(name, []).append(frame)
+            datasets = {
+                name: pieces[0] if len(pieces) == 1 else pd.concat(pieces, ignore_index=True)
+                for name, pieces in parts.items()
+            }
+            if windows != [(request.start, request.end)]:
+                datasets = {
+                    name: frame[window_mask(frame["datetime"], windows)].reset_index(drop=True)
+                    for name, frame in datasets.items()
+                }
+            report = reconcile(datasets, primary=primary_provider, tolerances=self.tolerances)
+        self.verifier.record(stratum, report)
+        stats.count("verify.checked")
+        stats.count("verify.rows", max((counts["rows"] for counts in report.summary.values()), default=0))
+        if not report.ok:
+            stats.count("verify.disagreements")
+            raise ReconciliationError(report)
         return primary
+
+    def _fetch_normalized(
+        self, name: str, provider: DataProvider, request: DataRequest
+    ) -> pd.DataFrame:
+        stats = self._run_stats()
+        raw = self._timed_call(stats, name, self._gate(name), lambda: provider.fetch_daily_ohlcv(request))
+        multiplier = provider.volume_multiplier(request.asset_type)
+        with stats.stage("normalize"):
+            normalized = normalize_ohlcv(raw, volume_multiplier=multiplier)
+            if not normalized["datetime"].is_monotonic_increasing:
+                normalized = normalized.sort_values("datetime").reset_index(drop=True)
+        if request.asset_type == "etf" and name == "akshare_sina":
+            start = pd.to_datetime(request.start)
+            end = pd.to_datetime(request.end)
+            normalized = normalized[
+                (normalized["datetime"] >= start) & (normalized["datetime"] <= end)
+            ].reset_index(drop=True)
+        if self.quarantine:
+            with stats.stage("quarantine"):
+                normalized = self._quarantine_rows(name, request, normalized)
+        with stats.stage("validate"):
+            validate_ohlcv(normalized)
+        return normalized
+
+    def _quarantine_rows(
+        self, name: str, request: DataRequest, data: pd.DataFrame
+    ) -> pd.DataFrame:
+        """Drop rows failing an error-level quality check and keep them aside."""
+        report = check_frames({request.symbol: data})
+        if report.ok:
+            return data
+        clean, rows = report.quarantine({request.symbol: data})
+        path = self.repository.meta_root / "quarantine" / f"{name}_{request.asset_type}_{request.symbol}.csv"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        rows.insert(0, "quarantined_at", pd.Timestamp.now().isoformat(timespec="seconds"))
+        rows.to_csv(path, mode="a", header=not path.exists(), index=False)
+        return clean[request.symbol]
+
+    def _run_stats(self) -> PipelineStats:
+        """Stats of the request running in this context (the service totals otherwise)."""
+        return current_run.get() or self.stats
+
+    def _stage(self, name: str) -> ContextManager:
+        return self._run_stats().stage(name)
+
+    def _timed_call(
+        self, stats: PipelineStats, name: str, gate: ProviderGate, func: Callable[[], pd.DataFrame]
+    ) -> pd.DataFrame:
+        """Call a provider through its gate, timing it as `fetch` and `fetch.<name>`."""
+        if not stats.enabled:
+            return gate.call(func)
+        with stats.stage("fetch"), stats.stage(f"fetch.{name}"):
+            raw = gate.call(func, on_retry=lambda: stats.count("retries"))
+        stats.count(f"rows_fetched.{name}", len(raw))
+        return raw
+
+    def _gate(self, name: str) -> ProviderGate:
+        with self._lock:
+            gate = self._gates.get(name)
+            if gate is None:
+                limit = self.provider_limits.get(name, ProviderLimit())
+                gate = ProviderGate(limit, self.retry)
+                self._gates[name] = gate
+            return gate
+
+    def _provider_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.provider_workers, thread_name_prefix="provider"
+                )
+            return self._pool
+
+
+def month_windows(start: pd.Timestamp, end: pd.Timestamp) -> list[tuple[str, str]]:
+    """Split [start, end] into calendar-month (start, end) pairs formatted YYYYMMDD."""
+    windows = []
+    first = start.normalize()
+    while first <= end:
+        last = min(first + pd.offsets.MonthEnd(0), end)
+        windows.append((first.strftime("%Y%m%d"), last.strftime("%Y%m%d")))
+        first = (first + pd.offsets.MonthBegin(1)).normalize()
+    return windows
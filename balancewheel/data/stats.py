@@ -0,0 +1,120 @@
+"""Lightweight per-stage timers and counters for the data pipeline."""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import ContextManager, Iterable
+
+import pandas as pd
+
+BREAKDOWN_COLUMNS = ["stage", "calls", "seconds", "mean_ms", "max_ms", "share"]
+
+_NULL = nullcontext()
+
+# 当前请求的统计对象；提交到线程池时通过 copy_context 传递
+current_run: ContextVar["PipelineStats | None"] = ContextVar("current_run", default=None)
+
+
+class PipelineStats:
+    """Thread-safe stage timers (calls, total and max seconds) and counters.
+
+    Timings recorded on a child (one per request) are also added to its
+    parent, so a service keeps a running total while every request carries
+    its own breakdown. A disabled instance hands out a shared no-op context
+    manager and ignores counters.
+    """
+
+    def __init__(self, enabled: bool = True, parent: "PipelineStats | None" = None) -> None:
+        self.enabled = enabled
+        self.parent = parent
+        self.timers: dict[str, list[float]] = {}
+        self.counters: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def child(self) -> "PipelineStats":
+        return PipelineStats(self.enabled, parent=self)
+
+    def stage(self, name: str) -> ContextManager:
+        if not self.enabled:
+            return _NULL
+        return _Timer(self, name)
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            timer = self.timers.setdefault(name, [0, 0.0, 0.0])
+            timer[0] += 1
+            timer[1] += seconds
+            timer[2] = max(timer[2], seconds)
+        if self.parent is not None:
+            self.parent.record(name, seconds)
+
+    def count(self, name: str, value: float = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+        if self.parent is not None:
+            self.parent.count(name, value)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.timers.clear()
+            self.counters.clear()
+
+    def snapshot(self) -> dict:
+        """JSON-serializable copy: {"timers": {stage: {...}}, "counters": {...}}."""
+        with self._lock:
+            timers = {
+                name: {"calls": int(calls), "seconds": round(total, 6), "max": round(peak, 6)}
+                for name, (calls, total, peak) in self.timers.items()
+            }
+            return {"timers": timers, "counters": dict(self.counters)}
+
+    def breakdown(self) -> pd.DataFrame:
+        return breakdown([self.snapshot()])
+
+
+def breakdown(snapshots: Iterable[dict]) -> pd.DataFrame:
+    """Aggregate stage timings of one or more snapshots into a table.
+
+    Nested stages (e.g. "fetch.akshare" inside "fetch") are listed as is, so
+    `share` is relative to the sum of top-level stages.
+    """
+    totals: dict[str, list[float]] = {}
+    for snapshot in snapshots:
+        for name, timer in (snapshot or {}).get("timers", {}).items():
+            entry = totals.setdefault(name, [0, 0.0, 0.0])
+            entry[0] += timer["calls"]
+            entry[1] += timer["seconds"]
+            entry[2] = max(entry[2], timer["max"])
+    top_level = sum(seconds for name, (_, seconds, _) in totals.items() if "." not in name)
+    rows = [
+        {
+            "stage": name,
+            "calls": int(calls),
+            "seconds": seconds,
+            "mean_ms": seconds / calls * 1000 if calls else 0.0,
+            "max_ms": peak * 1000,
+            "share": seconds / top_level if top_level else 0.0,
+        }
+        for name, (calls, seconds, peak) in totals.items()
+    ]
+    table = pd.DataFrame(rows, columns=BREAKDOWN_COLUMNS)
+    return table.sort_values("seconds", ascending=False, kind="stable").reset_index(drop=True)
+
+
+class _Timer:
+    __slots__ = ("stats", "name", "started")
+
+    def __init__(self, stats: PipelineStats, name: str) -> None:
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stats.record(self.name, time.perf_counter() - self.started)
@@ -0,0 +1,207 @@
+"""Symbol master: exchange, board and listing range of every security."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from balancewheel.data.interfaces import DataRequest
+from balancewheel.data.repository import Repository
+from balancewheel.data.utils import SH_PREFIXES, SZ_PREFIXES, strip_exchange_prefix
+
+SYMBOLS_FILE = "symbols.csv"
+
+SYMBOL_COLUMNS = ["symbol", "asset_type", "exchange", "board", "name", "list_date", "delist_date"]
+
+# 板块 -> 代码前缀；按顺序匹配，未命中的个股归为主板
+BOARD_PREFIXES = {
+    "star": ("688", "689"),
+    "chinext": ("300", "301"),
+    "bse": ("43", "83", "87", "92"),
+    "b_share": ("900", "200"),
+}
+
+SYMBOL_STYLES = ("akshare", "sina", "baostock")
+
+
+class NotListedError(ValueError):
+    """Raised when a request lies entirely outside a security's listing range."""
+
+    def __init__(self, request: DataRequest) -> None:
+        super().__init__(
+            f"{request.asset_type} {request.symbol} is not listed between {request.start} and {request.end}"
+        )
+        self.request = request
+
+
+@dataclass(frozen=True)
+class SymbolInfo:
+    symbol: str
+    asset_type: str
+    exchange: str
+    board: str
+    name: str
+    list_date: pd.Timestamp | None
+    delist_date: pd.Timestamp | None
+
+
+class SymbolMaster:
+    """Indexed table of securities keyed by (asset_type, symbol).
+
+    Lookups go through a dict built once; listing dates are kept as
+    datetime64 arrays so whole universes can be filtered or formatted with
+    array operations. Index codes overlap stock codes (000001 is both 平安银行
+    and 上证指数), hence the asset type in the key.
+    """
+
+    def __init__(self, frame: pd.DataFrame) -> None:
+        frame = normalize_symbols(frame)
+        self.frame = frame
+        self._positions = {
+            key: position for position, key in enumerate(zip(frame["asset_type"], frame["symbol"]))
+        }
+        self._list = frame["list_date"].to_numpy(dtype="datetime64[ns]")
+        self._delist = frame["delist_date"].to_numpy(dtype="datetime64[ns]")
+
+    @classmethod
+    def load(cls, path: str | Path) -> "SymbolMaster":
+        frame = pd.read_csv(path, dtype=str, keep_default_na=False, na_values=[""])
+        return cls(frame)
+
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        frame = self.frame.copy()
+        for column in ("list_date", "delist_date"):
+            frame[column] = frame[column].dt.strftime("%Y-%m-%d")
+        frame.to_csv(path, index=False)
+        return path
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self._positions
+
+    def get(self, symbol: str, asset_type: str) -> SymbolInfo | None:
+        position = self._positions.get((asset_type, strip_exchange_prefix(symbol)))
+        if position is None:
+            return None
+        row = self.frame.iloc[position]
+        return SymbolInfo(
+            symbol=row["symbol"],
+            asset_type=row["asset_type"],
+            exchange=row["exchange"],
+            board=row["board"],
+            name=row["name"],
+            list_date=None if pd.isna(row["list_date"]) else row["list_date"],
+            delist_date=None if pd.isna(row["delist_date"]) else row["delist_date"],
+        )
+
+    def listed(
+        self, as_of: str | pd.Timestamp | None = None, asset_types: Sequence[str] | None = None
+    ) -> pd.DataFrame:
+        """Securities trading on `as_of` (default: today), optionally of some asset types."""
+        day = np.datetime64(pd.Timestamp(as_of if as_of is not None else "today").normalize(), "ns")
+        mask = ~(self._list > day) & ~(self._delist < day)
+        if asset_types is not None:
+            mask &= self.frame["asset_type"].isin(asset_types).to_numpy()
+        return self.frame[mask].reset_index(drop=True)
+
+    def universe(
+        self, as_of: str | pd.Timestamp | None = None, asset_types: Sequence[str] | None = ("stock", "etf")
+    ) -> list[tuple[str, str]]:
+        """(asset_type, symbol) pairs of `listed(as_of, asset_types)`."""
+        listed = self.listed(as_of, asset_types)
+        return list(zip(listed["asset_type"], listed["symbol"]))
+
+    def clip(self, request: DataRequest) -> DataRequest | None:
+        """Restrict a request to the security's listing range.
+
+        Returns the request unchanged for unknown symbols or when it already
+        lies within the range, and None when the two do not overlap.
+        """
+        position = self._positions.get((request.asset_type, strip_exchange_prefix(request.symbol)))
+        if position is None:
+            return request
+        requested_start = pd.Timestamp(request.start)
+        requested_end = pd.Timestamp(request.end)
+        listed, delisted = self._list[position], self._delist[position]
+        start = requested_start if np.isnat(listed) else max(requested_start, pd.Timestamp(listed))
+        end = requested_end if np.isnat(delisted) else min(requested_end, pd.Timestamp(delisted))
+        if start > end:
+            return None
+        if start == requested_start and end == requested_end:
+            return request
+        return replace(request, start=start.strftime("%Y%m%d"), end=end.strftime("%Y%m%d"))
+
+    def format(self, symbols: Sequence[str], style: str, asset_type: str = "stock") -> list[str]:
+        """Format many codes for a provider: akshare `600000`, sina `sh600000`, baostock `sh.600000`.
+
+        Exchanges come from the master where the symbol is known and are
+        inferred from the code prefix otherwise.
+        """
+        if style not in SYMBOL_STYLES:
+            raise ValueError(f"Unknown symbol style: {style}")
+        codes = np.array([strip_exchange_prefix(symbol) for symbol in symbols], dtype=object)
+        if style == "akshare":
+            return codes.tolist()
+        exchanges = infer_exchanges(codes)
+        for index, code in enumerate(codes):
+            position = self._positions.get((asset_type, code))
+            if position is not None:
+                exchanges[index] = self.frame["exchange"].iat[position]
+        separator = "." if style == "baostock" else ""
+        return [f"{exchange}{separator}{code}" for exchange, code in zip(exchanges, codes)]
+
+
+def normalize_symbols(frame: pd.DataFrame) -> pd.DataFrame:
+    """Coerce a symbol table to `SYMBOL_COLUMNS`, inferring missing exchange and board."""
+    data = frame.copy()
+    data["symbol"] = [strip_exchange_prefix(str(symbol)) for symbol in data["symbol"]]
+    if "asset_type" not in data.columns:
+        data["asset_type"] = "stock"
+    codes = data["symbol"].to_numpy(dtype=object)
+    inferred_exchange = pd.Series(infer_exchanges(codes), index=data.index)
+    boards = infer_boards(codes, data["asset_type"].to_numpy(dtype=object))
+    inferred_board = pd.Series(boards, index=data.index)
+    data["exchange"] = data["exchange"].fillna(inferred_exchange) if "exchange" in data else inferred_exchange
+    data["board"] = data["board"].fillna(inferred_board) if "board" in data else inferred_board
+    data["name"] = data["name"].fillna("") if "name" in data.columns else ""
+    for column in ("list_date", "delist_date"):
+        values = data[column] if column in data.columns else pd.Series(pd.NaT, index=data.index)
+        data[column] = pd.to_datetime(values, errors="coerce")
+    data = data[SYMBOL_COLUMNS].drop_duplicates(["asset_type", "symbol"], keep="last")
+    return data.sort_values(["asset_type", "symbol"], kind="stable").reset_index(drop=True)
+
+
+def infer_exchanges(codes: Sequence[str] | np.ndarray) -> np.ndarray:
+    """Vectorized `infer_exchange` for bare codes: "sz" for SZ prefixes, "sh" otherwise."""
+    codes = np.asarray(codes, dtype=str)
+    exchanges = np.full(codes.shape, "sh", dtype=object)
+    for prefix in SZ_PREFIXES:
+        exchanges[np.char.startswith(codes, prefix)] = "sz"
+    for prefix in SH_PREFIXES:
+        exchanges[np.char.startswith(codes, prefix)] = "sh"
+    return exchanges
+
+
+def infer_boards(codes: Sequence[str] | np.ndarray, asset_types: Sequence[str] | np.ndarray) -> np.ndarray:
+    """Board of each code: star/chinext/bse/b_share/main for stocks, else the asset type."""
+    codes = np.asarray(codes, dtype=str)
+    asset_types = np.asarray(asset_types, dtype=object)
+    boards = np.full(codes.shape, "main", dtype=object)
+    for board, prefixes in BOARD_PREFIXES.items():
+        for prefix in prefixes:
+            boards[np.char.startswith(codes, prefix)] = board
+    return np.where(asset_types == "stock", boards, asset_types)
+
+
+def load_symbols(repository: Repository) -> SymbolMaster | None:
+    """Symbol master stored under the repository's `_meta`, if one has been fetched."""
+    path = repository.meta_root / SYMBOLS_FILE
+    return SymbolMaster.load(path) if path.exists() else None
@@ -54,3 +54,13 @@ def format_symbol_for_baostock(symbol: str) -> str:
     code = strip_exchange_prefix(symbol)
     exchange = infer_exchange(symbol)
     return f"{exchange}.{code}"
+
+
+def board_limit_pct(symbol: str) -> float:
+    """Price limit by board: STAR/ChiNext 20%, Beijing 30%, otherwise 10%."""
+    code = strip_exchange_prefix(symbol)
+    if code.startswith(("688", "689", "300", "301")):
+        return 0.20
+    if code.startswith(("43", "83", "87", "92")):
+        return 0.30
+    return 0.10
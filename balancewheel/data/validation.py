@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Iterable, Iterator
+
 import pandas as pd
 
 
@@ -24,3 +26,20 @@ def validate_ohlcv(data: pd.DataFrame) -> None:
     invalid_range = data["high"] < data["low"]
     if (invalid_high | invalid_low | invalid_range).any():
         raise ValueError("Invalid OHLC values detected")
+
+
+def validate_chunks(chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """Validate a long series chunk by chunk, including ordering across chunks.
+
+    Empty chunks are skipped; each validated chunk is yielded unchanged.
+    """
+    previous = None
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        validate_ohlcv(chunk)
+        first = chunk["datetime"].iloc[0]
+        if previous is not None and first <= previous:
+            raise ValueError(f"Chunk starting at {first} overlaps the previous chunk ending at {previous}")
+        previous = chunk["datetime"].iloc[-1]
+        yield chunk
@@ -0,0 +1,154 @@
+"""Verification policy: how much of each request is cross-checked against other providers."""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from balancewheel.data.interfaces import DataRequest
+from balancewheel.data.reconcile import ReconcileReport
+
+VERIFICATION_FILE = "verification.json"
+
+VERIFY_MODES = ("full", "sample", "new_rows")
+
+STRATUM_COLUMNS = ["stratum", "rate", "checked", "disagreements", "rows", "mismatched_rows"]
+
+
+@dataclass(frozen=True)
+class VerificationPolicy:
+    """How requests are cross-validated.
+
+    - `full`: every request is compared over its whole range (the default).
+    - `sample`: a share `rate` of symbols per stratum (board from the symbol
+      master, else asset type) is verified on `windows` windows of
+      `window_days` calendar days, one drawn from each equal slice of the
+      range; secondary providers are asked for those windows only.
+    - `new_rows`: incremental appends are verified only on rows after the
+      last stored date; full rewrites are verified over their whole range.
+
+    In `sample` mode a disagreement multiplies the stratum's rate by
+    `increase` (up to `max_rate`); every clean check moves it `decay` of the
+    way back towards `rate`.
+    """
+
+    mode: str = "full"
+    rate: float = 0.1
+    windows: int = 3
+    window_days: int = 30
+    max_rate: float = 1.0
+    increase: float = 2.0
+    decay: float = 0.1
+    seed: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.mode not in VERIFY_MODES:
+            raise ValueError(f"Unknown verification mode: {self.mode}")
+        if not 0.0 <= self.rate <= self.max_rate <= 1.0:
+            raise ValueError(f"Sampling rates must satisfy 0 <= rate <= max_rate <= 1: {self}")
+        if self.windows < 1 or self.window_days < 1:
+            raise ValueError("Verification windows must be positive")
+
+
+class Verifier:
+    """Apply a `VerificationPolicy` and keep per-stratum disagreement statistics.
+
+    Whether a symbol is sampled depends only on the run seed, the symbol and
+    the stratum rate, so all requests of a symbol within a run agree. The
+    statistics (and the adapted rates) persist in `_meta/verification.json`
+    between runs.
+    """
+
+    def __init__(self, policy: VerificationPolicy | None = None, path: str | Path | None = None) -> None:
+        self.policy = policy or VerificationPolicy()
+        self.path = None if path is None else Path(path)
+        self.seed = self.policy.seed if self.policy.seed is not None else random.randrange(2**32)
+        self.strata: dict[str, dict[str, float]] = {}
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.exists():
+            self.strata = json.loads(self.path.read_text(encoding="utf-8")).get("strata", {})
+
+    def rate(self, stratum: str) -> float:
+        with self._lock:
+            entry = self.strata.get(stratum)
+        return self.policy.rate if entry is None else entry["rate"]
+
+    def windows(
+        self, request: DataRequest, stratum: str, since: pd.Timestamp | None = None
+    ) -> list[tuple[str, str]]:
+        """Date windows (YYYYMMDD start, end) of `request` to verify; empty to skip it."""
+        start, end = pd.Timestamp(request.start), pd.Timestamp(request.end)
+        mode = self.policy.mode
+        if mode == "full":
+            return [(request.start, request.end)]
+        if mode == "new_rows":
+            if since is not None:
+                start = max(start, since + pd.Timedelta(days=1))
+            return [] if start > end else [(start.strftime("%Y%m%d"), end.strftime("%Y%m%d"))]
+
+        rng = random.Random(f"{self.seed}:{request.asset_type}:{request.symbol}")
+        if rng.random() >= self.rate(stratum):
+            return []
+        days = (end - start).days + 1
+        width = self.policy.window_days
+        if days <= self.policy.windows * width:
+            return [(request.start, request.end)]
+        # 分层抽样：区间等分为 windows 段，每段内随机取一个窗口
+        edges = np.linspace(0, days, self.policy.windows + 1).astype(int)
+        windows = []
+        for low, high in zip(edges[:-1], edges[1:]):
+            offset = rng.randint(low, max(high - width, low))
+            first = start + pd.Timedelta(days=offset)
+            last = min(first + pd.Timedelta(days=width - 1), end)
+            windows.append((first.strftime("%Y%m%d"), last.strftime("%Y%m%d")))
+        return windows
+
+    def record(self, stratum: str, report: ReconcileReport) -> None:
+        """Add a reconciliation outcome to the stratum and adapt its sampling rate."""
+        policy = self.policy
+        rows = max((counts["rows"] for counts in report.summary.values()), default=0)
+        mismatched = report.mismatches["datetime"].nunique() if not report.ok else 0
+        with self._lock:
+            entry = self.strata.setdefault(
+                stratum,
+                {"rate": policy.rate, "checked": 0, "disagreements": 0, "rows": 0, "mismatched_rows": 0},
+            )
+            entry["checked"] += 1
+            entry["rows"] += rows
+            entry["mismatched_rows"] += int(mismatched)
+            if report.ok:
+                entry["rate"] += (policy.rate - entry["rate"]) * policy.decay
+            else:
+                entry["disagreements"] += 1
+                entry["rate"] = min(max(entry["rate"], policy.rate) * policy.increase, policy.max_rate)
+
+    def summary(self) -> pd.DataFrame:
+        with self._lock:
+            rows = [{"stratum": stratum, **entry} for stratum, entry in sorted(self.strata.items())]
+        return pd.DataFrame(rows, columns=STRATUM_COLUMNS)
+
+    def save(self) -> Path | None:
+        if self.path is None:
+            return None
+        with self._lock:
+            payload = json.dumps({"policy": self.policy.mode, "strata": self.strata}, indent=2)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(payload, encoding="utf-8")
+        return self.path
+
+
+def window_mask(dates: pd.Series, windows: list[tuple[str, str]]) -> np.ndarray:
+    """Boolean mask of `dates` falling in any of the (start, end) windows."""
+    values = dates.to_numpy(dtype="datetime64[ns]")
+    mask = np.zeros(len(values), dtype=bool)
+    for start, end in windows:
+        first = np.datetime64(pd.Timestamp(start), "ns")
+        last = np.datetime64(pd.Timestamp(end), "ns")
+        mask |= (values >= first) & (values <= last)
+    return mask
@@ -0,0 +1,22 @@
+"""Backtest engine for BalanceWheel."""
+
+from balancewheel.engine.event import BacktestResult, BarContext, EventEngine, Order, Portfolio, Strategy
+from balancewheel.engine.rules import AShareRules, board_limit_pct
+from balancewheel.engine.sweep import parameter_grid, run_sweep
+from balancewheel.engine.vectorized import VectorizedResult, align_frames, run_vectorized
+
+__all__ = [
+    "AShareRules",
+    "BacktestResult",
+    "BarContext",
+    "EventEngine",
+    "Order",
+    "Portfolio",
+    "Strategy",
+    "VectorizedResult",
+    "align_frames",
+    "board_limit_pct",
+    "parameter_grid",
+    "run_sweep",
+    "run_vectorized",
+]
@@ -0,0 +1,189 @@
+"""Event-loop backtest engine for path-dependent order logic."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Mapping, Protocol
+
+import numpy as np
+import pandas as pd
+
+from balancewheel.engine.rules import AShareRules
+from balancewheel.engine.vectorized import PRICE_EPS, align_frames
+
+TRADE_COLUMNS = ["datetime", "symbol", "quantity", "price", "commission", "stamp_tax"]
+
+
+@dataclass(frozen=True)
+class Order:
+    """Signed share quantity (buy > 0, sell < 0) filled at the next bar.
+
+    Without `limit_price` the order fills at the next open; with it, a buy fills
+    if the next bar trades at or below the limit (a sell at or above it).
+    """
+
+    symbol: str
+    quantity: int
+    limit_price: float | None = None
+
+
+@dataclass
+class Portfolio:
+    cash: float
+    positions: dict[str, int] = field(default_factory=dict)
+    sellable: dict[str, int] = field(default_factory=dict)
+
+    def position(self, symbol: str) -> int:
+        return self.positions.get(symbol, 0)
+
+
+@dataclass(frozen=True)
+class BarContext:
+    """What a strategy sees after the close of one bar."""
+
+    index: int
+    datetime: pd.Timestamp
+    bars: pd.DataFrame
+    portfolio: Portfolio
+
+
+class Strategy(Protocol):
+    def on_bar(self, context: BarContext) -> list[Order]:
+        """Return orders to submit for the next bar."""
+
+
+@dataclass
+class BacktestResult:
+    equity: pd.Series
+    trades: pd.DataFrame
+    positions: pd.DataFrame
+
+
+class EventEngine:
+    """Replay aligned bars one at a time and fill orders under A-share rules."""
+
+    def __init__(
+        self,
+        frames: Mapping[str, pd.DataFrame],
+        rules: AShareRules | None = None,
+        initial_cash: float = 1_000_000.0,
+    ) -> None:
+        self.rules = rules or AShareRules()
+        self.initial_cash = initial_cash
+        fields = ("open", "high", "low", "close", "volume")
+        dates, self.symbols, arrays = align_frames(frames, fields)
+        self.dates = pd.DatetimeIndex(dates)
+        self.bars = {name: arrays[name] for name in fields}
+        self.limit_pct = self.rules.limit_pcts(self.symbols)
+        self._column = {symbol: idx for idx, symbol in enumerate(self.symbols)}
+
+    def run(self, strategy: Strategy) -> BacktestResult:
+        portfolio = Portfolio(cash=float(self.initial_cash))
+        last_close = np.full(len(self.symbols), np.nan)
+        pending: list[Order] = []
+        trades: list[dict] = []
+        equity = np.empty(len(self.dates))
+        positions = np.zeros((len(self.dates), len(self.symbols)))
+
+        for t, date in enumerate(self.dates):
+            # T+1：开盘前，昨日及以前买入的股份全部变为可卖
+            portfolio.sellable = dict(portfolio.positions)
+            for order in pending:
+                fill = self._fill(order, t, last_close, portfolio)
+                if fill is not None:
+                    trades.append({"datetime": date, **fill})
+            pending = []
+
+            close = self.bars["close"][t]
+            last_close = np.where(np.isnan(close), last_close, close)
+            mark = np.nan_to_num(last_close)
+            for symbol, quantity in portfolio.positions.items():
+                positions[t, self._column[symbol]] = quantity
+            equity[t] = portfolio.cash + positions[t] @ mark
+
+            bars = pd.DataFrame(
+                {name: values[t] for name, values in self.bars.items()}, index=self.symbols
+            )
+            context = BarContext(index=t, datetime=date, bars=bars, portfolio=portfolio)
+            pending = list(strategy.on_bar(context) or [])
+
+        return BacktestResult(
+            equity=pd.Series(equity, index=self.dates, name="equity"),
+            trades=pd.DataFrame(trades, columns=TRADE_COLUMNS),
+            positions=pd.DataFrame(positions, index=self.dates, columns=self.symbols),
+        )
+
+    def _fill(
+        self, order: Order, t: int, last_close: np.ndarray, portfolio: Portfolio
+    ) -> dict | None:
+        column = self._column.get(order.symbol)
+        if column is None:
+            raise ValueError(f"Unknown symbol in order: {order.symbol}")
+
+        open_, high, low, volume = (
+            self.bars[name][t, column] for name in ("open", "high", "low", "volume")
+        )
+        if np.isnan(open_) or open_ <= 0 or not volume > 0:
+            return None
+
+        up, down = self.rules.limit_prices(last_close[column], self.limit_pct[column])
+        lot = self.rules.lot_size
+        if order.quantity > 0:
+            if open_ >= up - PRICE_EPS:
+                return None
+            price = open_
+            if order.limit_price is not None:
+                if low > order.limit_price:
+                    return None
+                price = min(open_, order.limit_price)
+            quantity = (order.quantity // lot) * lot
+            while quantity > 0:
+                value = quantity * price
+                cost = value + float(self.rules.commission(value))
+                if cost <= portfolio.cash + PRICE_EPS:
+                    break
+                quantity -= lot
+            if quantity <= 0:
+                return None
+            value = quantity * price
+            fee = float(self.rules.commission(value))
+            portfolio.cash -= value + fee
+            portfolio.positions[order.symbol] = portfolio.position(order.symbol) + quantity
+            return self._record(order.symbol, quantity, price, fee, 0.0)
+
+        if open_ <= down + PRICE_EPS:
+            return None
+        price = open_
+        if order.limit_price is not None:
+            if high < order.limit_price:
+                return None
+            price = max(open_, order.limit_price)
+        available = portfolio.sellable.get(order.symbol, 0)
+        quantity = min(-order.quantity, available)
+        held = portfolio.position(order.symbol)
+        # 零股只能一次性卖出，其余按整手卖出
+        if quantity < held:
+            quantity = (quantity // lot) * lot
+        if quantity <= 0:
+            return None
+        value = quantity * price
+        fee = float(self.rules.commission(value))
+        tax = float(self.rules.stamp_tax(value))
+        portfolio.cash += value - fee - tax
+        portfolio.sellable[order.symbol] = available - quantity
+        remaining = held - quantity
+        if remaining:
+            portfolio.positions[order.symbol] = remaining
+        else:
+            portfolio.positions.pop(order.symbol, None)
+        return self._record(order.symbol, -quantity, price, fee, tax)
+
+    @staticmethod
+    def _record(symbol: str, quantity: int, price: float, fee: float, tax: float) -> dict:
+        return {
+            "symbol": symbol,
+            "quantity": int(quantity),
+            "price": float(price),
+            "commission": fee,
+            "stamp_tax": tax,
+        }
@@ -0,0 +1,46 @@
+"""A-share trading rules: lot size, price limits and transaction costs."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from balancewheel.data.utils import board_limit_pct
+
+
+@dataclass(frozen=True)
+class AShareRules:
+    """Trading constraints and costs applied by both engine paths."""
+
+    lot_size: int = 100
+    commission_rate: float = 0.00025
+    min_commission: float = 5.0
+    stamp_tax_rate: float = 0.0005
+    limit_pct: float | None = None
+    price_tick: float = 0.01
+
+    def commission(self, value: np.ndarray | float) -> np.ndarray:
+        value = np.asarray(value, dtype="float64")
+        fee = np.maximum(value * self.commission_rate, self.min_commission)
+        return np.where(value > 0, fee, 0.0)
+
+    def stamp_tax(self, sell_value: np.ndarray | float) -> np.ndarray:
+        return np.asarray(sell_value, dtype="float64") * self.stamp_tax_rate
+
+    def limit_pcts(self, symbols: Iterable[str]) -> np.ndarray:
+        """Daily price limit per symbol; `limit_pct` overrides board defaults."""
+        symbols = list(symbols)
+        if self.limit_pct is not None:
+            return np.full(len(symbols), self.limit_pct)
+        return np.array([board_limit_pct(symbol) for symbol in symbols], dtype="float64")
+
+    def limit_prices(
+        self, prev_close: np.ndarray, limit_pct: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return (limit_up, limit_down) rounded to the price tick."""
+        ticks = 1.0 / self.price_tick
+        up = np.round(prev_close * (1 + limit_pct) * ticks) / ticks
+        down = np.round(prev_close * (1 - limit_pct) * ticks) / ticks
+        return up, down
@@ -0,0 +1,211 @@
+"""Parallel parameter sweeps over a shared, memory-mapped panel."""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict
+from hashlib import sha256
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from balancewheel.data.panel import Panel
+from balancewheel.engine.rules import AShareRules
+from balancewheel.engine.vectorized import run_vectorized
+
+StrategyFn = Callable[[Panel, Mapping[str, object]], np.ndarray]
+
+RESULT_COLUMNS = [
+    "key",
+    "strategy",
+    "params",
+    "final_equity",
+    "total_return",
+    "max_drawdown",
+    "turnover",
+    "commission",
+    "stamp_tax",
+    "blocked",
+    "elapsed",
+]
+
+_PANEL: Panel | None = None
+
+
+def parameter_grid(grid: Mapping[str, Sequence[object]]) -> list[dict[str, object]]:
+    """Expand {"fast": [5, 10], "slow": [20]} into a list of parameter dicts."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def task_key(
+    strategy: str, params: Mapping[str, object], context: Mapping[str, object] | None = None
+) -> str:
+    """Resume key of one task; `context` holds the sweep-wide inputs (see `sweep_context`)."""
+    payload = json.dumps(
+        {"strategy": strategy, "params": params, "context": context}, sort_keys=True, default=str
+    )
+    return sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def sweep_context(
+    panel_root: str | Path, rules: AShareRules | None, initial_cash: float
+) -> dict[str, object]:
+    """Inputs shared by every task of a sweep that its results depend on.
+
+    The panel is identified by its resolved path plus the size and mtime of
+    its files, so a panel rebuilt in place counts as a different input.
+    """
+    root = Path(panel_root).resolve()
+    files = sorted(path for path in root.iterdir() if path.suffix in {".npy", ".json"})
+    return {
+        "panel": str(root),
+        "panel_files": [[path.name, path.stat().st_size, path.stat().st_mtime_ns] for path in files],
+        "rules": asdict(rules or AShareRules()),
+        "initial_cash": float(initial_cash),
+    }
+
+
+def run_sweep(
+    strategies: Mapping[str, StrategyFn],
+    grids: Mapping[str, Mapping[str, Sequence[object]]],
+    panel_root: str | Path,
+    results_path: str | Path,
+    max_workers: int | None = None,
+    rules: AShareRules | None = None,
+    initial_cash: float = 1_000_000.0,
+) -> pd.DataFrame:
+    """Run every strategy × parameter combination and stream results to CSV.
+
+    Workers open the panel once through memory-mapped arrays, so market data
+    is shared through the page cache instead of being pickled per task. Each
+    finished task is appended to `results_path` immediately; rerunning the
+    same sweep skips tasks whose key is already present, so an interrupted
+    sweep resumes where it stopped. Keys cover the panel, `rules` and
+    `initial_cash` as well as the strategy and parameters, so a rerun with
+    different inputs recomputes its tasks, and only this sweep's rows are
+    returned. Strategy functions must be importable (module-level) so they
+    can be sent to worker processes.
+    """
+    results_path = Path(results_path)
+    context = sweep_context(panel_root, rules, initial_cash)
+    tasks = {
+        task_key(name, params, context): (name, params)
+        for name in strategies
+        for params in parameter_grid(grids.get(name, {}))
+    }
+    done = completed_keys(results_path)
+    pending = [(key, name, params) for key, (name, params) in tasks.items() if key not in done]
+
+    if pending:
+        workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(str(panel_root),)
+        ) as pool, _ResultWriter(results_path) as writer:
+            calls = (
+                (_run_task, strategies[name], key, name, params, rules, initial_cash)
+                for key, name, params in pending
+            )
+            for row in _bounded_map(pool, calls, workers * 4):
+                writer.write(row)
+
+    if not results_path.exists():
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    results = pd.read_csv(results_path, dtype={"key": str})
+    return results[results["key"].isin(tasks)].reset_index(drop=True)
+
+
+def completed_keys(results_path: Path) -> set[str]:
+    if not results_path.exists():
+        return set()
+    with results_path.open("r", encoding="utf-8", newline="") as handle:
+        return {row["key"] for row in csv.DictReader(handle) if row.get("key")}
+
+
+def _bounded_map(
+    pool: ProcessPoolExecutor, calls: Iterable[tuple], window: int
+) -> Iterator[dict[str, object]]:
+    """Submit calls keeping at most `window` in flight; yield results as they finish."""
+    calls = iter(calls)
+    pending: set[Future] = set()
+    for call in itertools.islice(calls, window):
+        pending.add(pool.submit(*call))
+    while pending:
+        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in finished:
+            yield future.result()
+        for call in itertools.islice(calls, len(finished)):
+            pending.add(pool.submit(*call))
+
+
+class _ResultWriter:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def __enter__(self) -> "_ResultWriter":
+        new_file = not self.path.exists() or self.path.stat().st_size == 0
+        self.handle = self.path.open("a", encoding="utf-8", newline="")
+        self.writer = csv.DictWriter(self.handle, fieldnames=RESULT_COLUMNS)
+        if new_file:
+            self.writer.writeheader()
+            self.handle.flush()
+        return self
+
+    def write(self, row: Mapping[str, object]) -> None:
+        self.writer.writerow(row)
+        self.handle.flush()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.handle.close()
+
+
+def _init_worker(panel_root: str) -> None:
+    global _PANEL
+    _PANEL = Panel(panel_root)
+
+
+def _run_task(
+    strategy: StrategyFn,
+    key: str,
+    name: str,
+    params: Mapping[str, object],
+    rules: AShareRules | None,
+    initial_cash: float,
+) -> dict[str, object]:
+    if _PANEL is None:
+        raise RuntimeError("Sweep worker was not initialized with a panel")
+    started = time.perf_counter()
+    panel = _PANEL
+    weights = strategy(panel, params)
+    result = run_vectorized(
+        panel.array("open"),
+        panel.array("close"),
+        weights,
+        panel.symbols,
+        dates=panel.dates.to_numpy(),
+        volume=panel.array("volume") if "volume" in panel.fields else None,
+        rules=rules,
+        initial_cash=initial_cash,
+    )
+    equity = result.equity
+    peak = np.maximum.accumulate(equity)
+    return {
+        "key": key,
+        "strategy": name,
+        "params": json.dumps(params, sort_keys=True, default=str),
+        "final_equity": float(equity[-1]),
+        "total_return": float(equity[-1] / initial_cash - 1),
+        "max_drawdown": float((equity / peak - 1).min()),
+        "turnover": float(result.turnover.sum()),
+        "commission": float(result.commission.sum()),
+        "stamp_tax": float(result.stamp_tax.sum()),
+        "blocked": int(result.blocked.sum()),
+        "elapsed": time.perf_counter() - started,
+    }
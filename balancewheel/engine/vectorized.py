@@ -0,0 +1,181 @@
+"""Vectorized target-weight backtests over a universe × date matrix."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from balancewheel.engine.rules import AShareRules
+
+PRICE_EPS = 1e-9
+
+
+@dataclass
+class VectorizedResult:
+    """Per-run arrays produced by `run_vectorized`; leading axis is the run."""
+
+    dates: np.ndarray
+    symbols: list[str]
+    equity: np.ndarray
+    cash: np.ndarray
+    turnover: np.ndarray
+    commission: np.ndarray
+    stamp_tax: np.ndarray
+    blocked: np.ndarray
+    positions: np.ndarray | None = None
+
+    def equity_frame(self) -> pd.DataFrame:
+        """Equity curves as a date-indexed frame with one column per run."""
+        return pd.DataFrame(self.equity.T, index=pd.DatetimeIndex(self.dates))
+
+
+def align_frames(
+    frames: Mapping[str, pd.DataFrame], fields: Sequence[str] = ("open", "close", "volume")
+) -> tuple[np.ndarray, list[str], dict[str, np.ndarray]]:
+    """Align normalized OHLCV frames into (dates, symbols, field -> T×N array)."""
+    symbols = list(frames)
+    dates = pd.DatetimeIndex(
+        sorted(set().union(*(frame["datetime"] for frame in frames.values())))
+    )
+    arrays = {}
+    for field in fields:
+        matrix = np.full((len(dates), len(symbols)), np.nan)
+        for column, symbol in enumerate(symbols):
+            frame = frames[symbol]
+            rows = dates.get_indexer(pd.DatetimeIndex(frame["datetime"]))
+            matrix[rows, column] = frame[field].to_numpy(dtype="float64")
+        arrays[field] = matrix
+    return dates.to_numpy(), symbols, arrays
+
+
+def run_vectorized(
+    open_: np.ndarray,
+    close: np.ndarray,
+    weights: np.ndarray,
+    symbols: Sequence[str],
+    dates: np.ndarray | None = None,
+    volume: np.ndarray | None = None,
+    rules: AShareRules | None = None,
+    initial_cash: float = 1_000_000.0,
+    record_positions: bool = False,
+) -> VectorizedResult:
+    """Backtest target weights for one or many runs in a single pass over dates.
+
+    `weights[..., t, :]` is decided after the close of bar t and traded at the
+    open of bar t + 1. `weights` may carry leading run axes (e.g. one per
+    parameter set) that are simulated together. Orders are rounded to lots,
+    buys at limit-up and sells at limit-down opens are blocked, suspended bars
+    (NaN price or zero volume) cannot trade, only shares held before the
+    current bar can be sold (T+1), and commission and stamp tax are charged.
+    """
+    rules = rules or AShareRules()
+    open_ = np.asarray(open_, dtype="float64")
+    close = np.asarray(close, dtype="float64")
+    weights = np.asarray(weights, dtype="float64")
+    n_dates, n_symbols = close.shape
+    if weights.shape[-2:] != close.shape or open_.shape != close.shape:
+        raise ValueError("open, close and weights must share the date × symbol shape")
+    run_shape = weights.shape[:-2]
+    weights = np.nan_to_num(weights.reshape((-1, n_dates, n_symbols)))
+    n_runs = weights.shape[0]
+
+    limit_pct = rules.limit_pcts(symbols)
+    lot = float(rules.lot_size)
+    tradable = ~np.isnan(open_) & (open_ > 0)
+    if volume is not None:
+        tradable &= np.nan_to_num(np.asarray(volume, dtype="float64")) > 0
+
+    shares = np.zeros((n_runs, n_symbols))
+    cash = np.full(n_runs, float(initial_cash))
+    last_close = np.full(n_symbols, np.nan)
+    mark = np.zeros(n_symbols)
+
+    equity_out = np.empty((n_runs, n_dates))
+    cash_out = np.empty((n_runs, n_dates))
+    turnover_out = np.zeros((n_runs, n_dates))
+    commission_out = np.zeros((n_runs, n_dates))
+    tax_out = np.zeros((n_runs, n_dates))
+    blocked_out = np.zeros((n_runs, n_dates), dtype="int64")
+    positions_out = np.empty((n_runs, n_dates, n_symbols)) if record_positions else None
+
+    for t in range(n_dates):
+        if t > 0:
+            price = np.where(tradable[t], open_[t], 0.0)
+            up, down = rules.limit_prices(last_close, limit_pct)
+            can_buy = tradable[t] & ~(price >= up - PRICE_EPS)
+            can_sell = tradable[t] & ~(price <= down + PRICE_EPS)
+
+            open_mark = np.where(tradable[t], open_[t], mark)
+            equity = cash + shares @ open_mark
+            target_value = weights[:, t - 1, :] * equity[:, None]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                target = np.floor(target_value / (open_mark * lot)) * lot
+            target = np.where(np.isfinite(target), np.maximum(target, 0.0), shares)
+            delta = target - shares
+
+            want_sell = delta < 0
+            want_buy = delta > 0
+            blocked_out[:, t] = (want_sell & ~can_sell).sum(axis=1) + (want_buy & ~can_buy).sum(axis=1)
+
+            # T+1：只有本根K线之前持有的股份可以卖出
+            sell_qty = np.where(want_sell & can_sell, np.minimum(-delta, shares), 0.0)
+            sell_value = sell_qty * price
+            sell_fee = rules.commission(sell_value)
+            sell_tax = rules.stamp_tax(sell_value)
+            cash += sell_value.sum(axis=1) - sell_fee.sum(axis=1) - sell_tax.sum(axis=1)
+            shares -= sell_qty
+
+            buy_qty = np.where(want_buy & can_buy, delta, 0.0)
+            buy_qty, buy_value, buy_fee = _fit_buys_to_cash(buy_qty, price, cash, lot, rules)
+            cash -= buy_value.sum(axis=1) + buy_fee.sum(axis=1)
+            shares += buy_qty
+
+            turnover_out[:, t] = sell_value.sum(axis=1) + buy_value.sum(axis=1)
+            commission_out[:, t] = sell_fee.sum(axis=1) + buy_fee.sum(axis=1)
+            tax_out[:, t] = sell_tax.sum(axis=1)
+
+        valid_close = ~np.isnan(close[t])
+        last_close = np.where(valid_close, close[t], last_close)
+        mark = np.nan_to_num(last_close)
+        equity_out[:, t] = cash + shares @ mark
+        cash_out[:, t] = cash
+        if positions_out is not None:
+            positions_out[:, t, :] = shares
+
+    def shaped(array: np.ndarray) -> np.ndarray:
+        return array.reshape(run_shape + array.shape[1:])
+
+    return VectorizedResult(
+        dates=np.arange(n_dates) if dates is None else np.asarray(dates),
+        symbols=list(symbols),
+        equity=shaped(equity_out),
+        cash=shaped(cash_out),
+        turnover=shaped(turnover_out),
+        commission=shaped(commission_out),
+        stamp_tax=shaped(tax_out),
+        blocked=shaped(blocked_out),
+        positions=None if positions_out is None else shaped(positions_out),
+    )
+
+
+def _fit_buys_to_cash(
+    buy_qty: np.ndarray, price: np.ndarray, cash: np.ndarray, lot: float, rules: AShareRules
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Scale buy orders down (in whole lots) where they exceed available cash."""
+    for _ in range(4):
+        value = buy_qty * price
+        fee = rules.commission(value)
+        needed = value.sum(axis=1) + fee.sum(axis=1)
+        over = needed > cash + PRICE_EPS
+        if not over.any():
+            return buy_qty, value, fee
+        scale = np.where(over, np.clip(cash, 0.0, None) / np.where(needed > 0, needed, 1.0), 1.0)
+        # 每轮多收缩 1%，以覆盖最低佣金带来的误差
+        scale = np.where(over, scale * 0.99, 1.0)
+        buy_qty = np.floor(buy_qty * scale[:, None] / lot) * lot
+    buy_qty = np.where(over[:, None], 0.0, buy_qty)
+    value = buy_qty * price
+    return buy_qty, value, rules.commission(value)
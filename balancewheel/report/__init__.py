@@ -0,0 +1,30 @@
+"""Backtest metrics and report output."""
+
+from balancewheel.report.metrics import (
+    METRIC_COLUMNS,
+    backtest_metrics,
+    cagr,
+    compute_metrics,
+    drawdowns,
+    rank_runs,
+    sharpe,
+    sortino,
+    trade_win_rate,
+    vectorized_metrics,
+)
+from balancewheel.report.output import sparkline, write_report
+
+__all__ = [
+    "METRIC_COLUMNS",
+    "backtest_metrics",
+    "cagr",
+    "compute_metrics",
+    "drawdowns",
+    "rank_runs",
+    "sharpe",
+    "sortino",
+    "sparkline",
+    "trade_win_rate",
+    "vectorized_metrics",
+    "write_report",
+]
@@ -0,0 +1,184 @@
+"""Vectorized performance metrics over one or many equity curves."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from balancewheel.engine.event import BacktestResult
+from balancewheel.engine.vectorized import VectorizedResult
+
+TRADING_DAYS = 252
+
+METRIC_COLUMNS = [
+    "total_return",
+    "cagr",
+    "volatility",
+    "sharpe",
+    "sortino",
+    "max_drawdown",
+    "max_drawdown_duration",
+    "turnover",
+    "positive_bar_rate",
+    "win_rate",
+    "exposure",
+]
+
+
+def period_returns(equity: np.ndarray) -> np.ndarray:
+    """Simple returns along the last (time) axis."""
+    equity = np.asarray(equity, dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return equity[..., 1:] / equity[..., :-1] - 1.0
+
+
+def cagr(equity: np.ndarray, periods_per_year: int = TRADING_DAYS) -> np.ndarray:
+    equity = np.asarray(equity, dtype="float64")
+    years = (equity.shape[-1] - 1) / periods_per_year
+    if years <= 0:
+        return np.full(equity.shape[:-1], np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (equity[..., -1] / equity[..., 0]) ** (1 / years) - 1
+
+
+def sharpe(
+    returns: np.ndarray, periods_per_year: int = TRADING_DAYS, risk_free: float = 0.0
+) -> np.ndarray:
+    """Annualized Sharpe ratio; `risk_free` is an annual rate. NaN for flat curves."""
+    excess = np.asarray(returns, dtype="float64") - risk_free / periods_per_year
+    std = excess.std(axis=-1, ddof=1) if excess.shape[-1] > 1 else np.full(excess.shape[:-1], np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(std > 0, excess.mean(axis=-1) / std * np.sqrt(periods_per_year), np.nan)
+
+
+def sortino(
+    returns: np.ndarray, periods_per_year: int = TRADING_DAYS, risk_free: float = 0.0
+) -> np.ndarray:
+    """Annualized Sortino ratio using downside deviation below `risk_free`."""
+    excess = np.asarray(returns, dtype="float64") - risk_free / periods_per_year
+    downside = np.sqrt((np.minimum(excess, 0.0) ** 2).mean(axis=-1)) if excess.shape[-1] else np.nan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(downside > 0, excess.mean(axis=-1) / downside * np.sqrt(periods_per_year), np.nan)
+
+
+def drawdowns(equity: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return (max drawdown, longest time below a previous peak in bars)."""
+    equity = np.asarray(equity, dtype="float64")
+    peak = np.maximum.accumulate(equity, axis=-1)
+    depth = (equity / peak - 1.0).min(axis=-1)
+    steps = np.arange(equity.shape[-1])
+    last_peak = np.maximum.accumulate(np.where(equity >= peak, steps, 0), axis=-1)
+    duration = (steps - last_peak).max(axis=-1)
+    return depth, duration
+
+
+def compute_metrics(
+    equity: np.ndarray,
+    cash: np.ndarray | None = None,
+    turnover: np.ndarray | None = None,
+    periods_per_year: int = TRADING_DAYS,
+    risk_free: float = 0.0,
+) -> pd.DataFrame:
+    """Score equity curves of shape (T,) or (runs, T) in one array pass.
+
+    `cash` and `turnover` (traded value per bar) share the shape of `equity`;
+    without them exposure and turnover are NaN. Turnover is annualized traded
+    value over equity; exposure is the fraction of bars with capital invested;
+    positive bar rate is the fraction of positive bars among bars that moved.
+    `win_rate` needs a trade log and is NaN here (see `backtest_metrics`).
+    """
+    equity = np.atleast_2d(np.asarray(equity, dtype="float64"))
+    returns = period_returns(equity)
+    depth, duration = drawdowns(equity)
+    moved = returns != 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        positive_bar_rate = (returns > 0).sum(axis=-1) / moved.sum(axis=-1)
+        volatility = (
+            returns.std(axis=-1, ddof=1) * np.sqrt(periods_per_year)
+            if returns.shape[-1] > 1
+            else np.full(len(equity), np.nan)
+        )
+        metrics = {
+            "total_return": equity[:, -1] / equity[:, 0] - 1.0,
+            "cagr": cagr(equity, periods_per_year),
+            "volatility": volatility,
+            "sharpe": sharpe(returns, periods_per_year, risk_free),
+            "sortino": sortino(returns, periods_per_year, risk_free),
+            "max_drawdown": depth,
+            "max_drawdown_duration": duration,
+            "turnover": np.full(len(equity), np.nan),
+            "positive_bar_rate": positive_bar_rate,
+            "win_rate": np.full(len(equity), np.nan),
+            "exposure": np.full(len(equity), np.nan),
+        }
+        if turnover is not None:
+            traded = np.atleast_2d(np.asarray(turnover, dtype="float64"))
+            ratio = traded[:, 1:] / equity[:, :-1]
+            metrics["turnover"] = ratio.sum(axis=-1) * periods_per_year / max(ratio.shape[-1], 1)
+        if cash is not None:
+            invested = equity - np.atleast_2d(np.asarray(cash, dtype="float64"))
+            metrics["exposure"] = (invested > 1e-9 * equity).mean(axis=-1)
+    return pd.DataFrame(metrics, columns=METRIC_COLUMNS)
+
+
+def vectorized_metrics(
+    result: VectorizedResult, periods_per_year: int = TRADING_DAYS, risk_free: float = 0.0
+) -> pd.DataFrame:
+    """Metrics for every run of a `run_vectorized` result (leading axes flattened)."""
+    length = result.equity.shape[-1]
+    return compute_metrics(
+        result.equity.reshape(-1, length),
+        cash=result.cash.reshape(-1, length),
+        turnover=result.turnover.reshape(-1, length),
+        periods_per_year=periods_per_year,
+        risk_free=risk_free,
+    )
+
+
+def backtest_metrics(
+    result: BacktestResult, periods_per_year: int = TRADING_DAYS, risk_free: float = 0.0
+) -> pd.DataFrame:
+    """Metrics for an `EventEngine` result; win rate counts closed trades."""
+    equity = result.equity.to_numpy(dtype="float64")
+    trades = result.trades
+    traded = (trades["quantity"].abs() * trades["price"]).groupby(trades["datetime"]).sum()
+    turnover = traded.reindex(result.equity.index, fill_value=0.0).to_numpy(dtype="float64")
+    metrics = compute_metrics(equity, turnover=turnover, periods_per_year=periods_per_year, risk_free=risk_free)
+    metrics["exposure"] = float(result.positions.ne(0).any(axis=1).mean()) if len(result.positions) else np.nan
+    metrics["win_rate"] = trade_win_rate(trades)
+    return metrics
+
+
+def trade_win_rate(trades: pd.DataFrame) -> float:
+    """Share of sells closing above the average cost of the position sold.
+
+    Costs include commission and stamp tax. Each symbol's trades are replayed
+    in order with average-cost accounting.
+    """
+    wins = closed = 0
+    for _, group in trades.groupby("symbol", sort=False):
+        position = cost = 0.0
+        for quantity, price, fee in zip(
+            group["quantity"].to_numpy(dtype="float64"),
+            group["price"].to_numpy(dtype="float64"),
+            (group["commission"] + group["stamp_tax"]).to_numpy(dtype="float64"),
+        ):
+            if quantity > 0:
+                position += quantity
+                cost += quantity * price + fee
+            elif quantity < 0 and position > 0:
+                sold = min(-quantity, position)
+                basis = cost * sold / position
+                closed += 1
+                wins += sold * price - fee > basis
+                position -= sold
+                cost -= basis
+    return wins / closed if closed else np.nan
+
+
+def rank_runs(
+    metrics: pd.DataFrame, by: str = "sharpe", ascending: bool = False, top: int | None = None
+) -> pd.DataFrame:
+    """Sort runs by a metric (NaN last) and optionally keep the best `top`."""
+    ranked = metrics.sort_values(by, ascending=ascending, na_position="last", kind="stable")
+    return ranked if top is None else ranked.head(top)
@@ -0,0 +1,97 @@
+"""Static CSV/HTML output for backtest metrics."""
+
+from __future__ import annotations
+
+import html
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PERCENT_COLUMNS = ["total_return", "cagr", "volatility", "max_drawdown", "positive_bar_rate", "win_rate", "exposure"]
+
+_STYLE = """
+body { font-family: sans-serif; margin: 24px; color: #222; }
+table { border-collapse: collapse; font-size: 13px; }
+th, td { border-bottom: 1px solid #ddd; padding: 4px 10px; text-align: right; }
+th { background: #f4f4f4; }
+td.label { text-align: left; }
+svg { display: block; }
+"""
+
+
+def write_report(
+    metrics: pd.DataFrame,
+    root: str | Path,
+    equity: pd.DataFrame | None = None,
+    title: str = "Backtest report",
+    top: int = 50,
+) -> dict[str, Path]:
+    """Write `metrics.csv` (all runs) and `report.html` (first `top` rows) under `root`.
+
+    `metrics` is usually ranked beforehand (see `rank_runs`). `equity` is a
+    date-indexed frame with one column per run, matching the metrics index
+    (e.g. `VectorizedResult.equity_frame()`); when given, each row gets an
+    inline SVG sparkline of its curve.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    csv_path = root / "metrics.csv"
+    metrics.to_csv(csv_path, index=True, index_label="run")
+
+    shown = metrics.head(top)
+    header = "".join(f"<th>{html.escape(str(column))}</th>" for column in ["run", *shown.columns])
+    if equity is not None:
+        header += "<th>equity</th>"
+    body = []
+    for run, row in zip(shown.index, shown.itertuples(index=False)):
+        cells = [f'<td class="label">{html.escape(str(run))}</td>']
+        cells.extend(f"<td>{_format(column, value)}</td>" for column, value in zip(shown.columns, row))
+        if equity is not None and run in equity.columns:
+            cells.append(f"<td>{sparkline(equity[run].to_numpy(dtype='float64'))}</td>")
+        body.append(f"<tr>{''.join(cells)}</tr>")
+
+    period = ""
+    if equity is not None and len(equity.index):
+        period = f"<p>{equity.index[0]:%Y-%m-%d} — {equity.index[-1]:%Y-%m-%d}, {len(equity.index)} bars</p>"
+    document = (
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+        f"<title>{html.escape(title)}</title><style>{_STYLE}</style></head><body>"
+        f"<h1>{html.escape(title)}</h1>{period}"
+        f"<p>{len(metrics)} runs, showing {len(shown)}. Full table: metrics.csv</p>"
+        f"<table><thead><tr>{header}</tr></thead><tbody>{''.join(body)}</tbody></table>"
+        "</body></html>\n"
+    )
+    html_path = root / "report.html"
+    html_path.write_text(document, encoding="utf-8")
+    return {"csv": csv_path, "html": html_path}
+
+
+def sparkline(values: np.ndarray, width: int = 160, height: int = 32, points: int = 160) -> str:
+    """Render a curve as a small inline SVG polyline, downsampled to `points`."""
+    values = np.asarray(values, dtype="float64")
+    values = values[~np.isnan(values)]
+    if len(values) < 2:
+        return ""
+    if len(values) > points:
+        values = values[np.linspace(0, len(values) - 1, points).astype(int)]
+    low, high = values.min(), values.max()
+    span = high - low or 1.0
+    xs = np.linspace(0, width, len(values))
+    ys = height - (values - low) / span * height
+    path = " ".join(f"{x:.1f},{y:.1f}" for x, y in zip(xs, ys))
+    color = "#2a7" if values[-1] >= values[0] else "#c33"
+    return (
+        f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<polyline fill="none" stroke="{color}" stroke-width="1" points="{path}"/></svg>'
+    )
+
+
+def _format(column: str, value: object) -> str:
+    if isinstance(value, (float, np.floating)):
+        if np.isnan(value):
+            return "—"
+        if column in PERCENT_COLUMNS:
+            return f"{value:.2%}"
+        return f"{value:.3f}"
+    return html.escape(str(value))
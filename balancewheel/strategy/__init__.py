@@ -0,0 +1,52 @@
+"""Strategy layer for BalanceWheel."""
+
+from balancewheel.strategy.cross_section import (
+    cs_demean,
+    cs_neutralize,
+    cs_quantile,
+    cs_rank,
+    cs_winsorize,
+    cs_winsorize_mad,
+    cs_zscore,
+)
+from balancewheel.strategy.factors import Expr, FactorEngine
+from balancewheel.strategy.indicators import (
+    ATR,
+    EMA,
+    MACD,
+    RSI,
+    SMA,
+    Bollinger,
+    atr,
+    bollinger,
+    ema,
+    ffill,
+    macd,
+    rsi,
+    sma,
+)
+
+__all__ = [
+    "ATR",
+    "Bollinger",
+    "EMA",
+    "Expr",
+    "FactorEngine",
+    "MACD",
+    "RSI",
+    "SMA",
+    "atr",
+    "bollinger",
+    "cs_demean",
+    "cs_neutralize",
+    "cs_quantile",
+    "cs_rank",
+    "cs_winsorize",
+    "cs_winsorize_mad",
+    "cs_zscore",
+    "ema",
+    "ffill",
+    "macd",
+    "rsi",
+    "sma",
+]
@@ -0,0 +1,204 @@
+"""NaN-aware cross-sectional and rolling kernels over date × symbol arrays.
+
+Every kernel takes a 2-D array with dates on axis 0 and symbols on axis 1
+(a 1-D array is treated as a single date) and works on all dates at once.
+NaN marks a symbol outside the cross-section on that date: it is ignored by
+the statistics and stays NaN in the output.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from balancewheel.strategy.indicators import ArrayLike
+
+
+def cs_rank(values: ArrayLike, pct: bool = True) -> np.ndarray:
+    """Rank each date's cross-section (ties get their average rank).
+
+    With `pct`, ranks are divided by the number of valid symbols, giving
+    values in (0, 1].
+    """
+    x, shape = _as_2d(values)
+    order = np.argsort(x, axis=1)
+    ordered = np.take_along_axis(x, order, axis=1)
+    counts = (~np.isnan(x)).sum(axis=1)
+    n = x.shape[1]
+    positions = np.broadcast_to(np.arange(n), x.shape)
+    starts = np.ones(x.shape, dtype=bool)
+    starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    ends = np.ones(x.shape, dtype=bool)
+    ends[:, :-1] = starts[:, 1:]
+    first = np.maximum.accumulate(np.where(starts, positions, 0), axis=1)
+    last = np.minimum.accumulate(np.where(ends, positions, n - 1)[:, ::-1], axis=1)[:, ::-1]
+    ranks = np.empty(x.shape)
+    np.put_along_axis(ranks, order, (first + last) / 2.0 + 1.0, axis=1)
+    ranks[np.isnan(x)] = np.nan
+    if pct:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ranks /= counts[:, None]
+    return ranks.reshape(shape)
+
+
+def cs_zscore(values: ArrayLike) -> np.ndarray:
+    """Standardize each date's cross-section to mean 0 and (population) std 1."""
+    x, shape = _as_2d(values)
+    mean, std = _mean_std(x)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return ((x - mean[:, None]) / std[:, None]).reshape(shape)
+
+
+def cs_demean(values: ArrayLike) -> np.ndarray:
+    x, shape = _as_2d(values)
+    mean, _ = _mean_std(x)
+    return (x - mean[:, None]).reshape(shape)
+
+
+def cs_winsorize(values: ArrayLike, lower: float = 0.01, upper: float = 0.99) -> np.ndarray:
+    """Clip each date's cross-section to its `lower` / `upper` quantiles."""
+    x, shape = _as_2d(values)
+    ordered, counts = _sort(x)
+    low = _quantile(ordered, counts, lower)
+    high = _quantile(ordered, counts, upper)
+    return np.clip(x, low[:, None], high[:, None]).reshape(shape)
+
+
+def cs_winsorize_mad(values: ArrayLike, k: float = 5.0) -> np.ndarray:
+    """Clip each date's cross-section to median ± k × MAD (scaled to a normal std)."""
+    x, shape = _as_2d(values)
+    ordered, counts = _sort(x)
+    median = _quantile(ordered, counts, 0.5)[:, None]
+    deviation = np.abs(x - median)
+    ordered, _ = _sort(deviation)
+    mad = _quantile(ordered, counts, 0.5)[:, None] * 1.4826
+    return np.clip(x, median - k * mad, median + k * mad).reshape(shape)
+
+
+def cs_quantile(values: ArrayLike, buckets: int = 5) -> np.ndarray:
+    """Bucket each date's cross-section into `buckets` groups of equal count (0 = lowest)."""
+    if buckets < 1:
+        raise ValueError(f"Quantile buckets must be a positive integer: {buckets}")
+    pct = cs_rank(values, pct=True)
+    return np.clip(np.ceil(pct * buckets) - 1, 0, buckets - 1)
+
+
+def cs_neutralize(
+    values: ArrayLike, groups: np.ndarray | None = None, size: ArrayLike | None = None
+) -> np.ndarray:
+    """Residual of a per-date regression on group dummies and `size`.
+
+    `groups` holds integer group codes per symbol (shape (symbols,)) or per
+    date and symbol; negative codes mark unknown groups, which are left out.
+    Group means are removed first and the size exposure is then regressed out
+    of the within-group residual, which equals the full dummy + size OLS.
+    """
+    x, shape = _as_2d(values)
+    valid = ~np.isnan(x)
+    codes = None
+    if groups is not None:
+        codes = np.broadcast_to(np.asarray(groups, dtype="int64"), x.shape)
+        valid &= codes >= 0
+    if size is not None:
+        size_2d, _ = _as_2d(size)
+        valid &= ~np.isnan(size_2d)
+
+    residual = _demean_groups(x, valid, codes)
+    if size is not None:
+        exposure = _demean_groups(size_2d, valid, codes)
+        filled = np.where(valid, exposure, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            beta = (np.where(valid, residual, 0.0) * filled).sum(axis=1) / (filled * filled).sum(axis=1)
+        residual = residual - np.nan_to_num(beta)[:, None] * exposure
+    return residual.reshape(shape)
+
+
+def ts_delay(values: ArrayLike, periods: int = 1) -> np.ndarray:
+    """Shift along the date axis; the first `periods` rows are NaN."""
+    x = np.asarray(values, dtype="float64")
+    out = np.full(x.shape, np.nan)
+    if periods < len(x):
+        out[periods:] = x[: len(x) - periods]
+    return out
+
+
+def ts_sum(values: ArrayLike, window: int) -> np.ndarray:
+    """Rolling sum over `window` dates; NaN unless all values in the window are valid."""
+    total, count = _rolling(values, window)
+    return np.where(count == window, total, np.nan)
+
+
+def ts_mean(values: ArrayLike, window: int) -> np.ndarray:
+    total, count = _rolling(values, window)
+    return np.where(count == window, total / window, np.nan)
+
+
+def ts_std(values: ArrayLike, window: int) -> np.ndarray:
+    """Rolling sample standard deviation over `window` dates."""
+    x = np.asarray(values, dtype="float64")
+    if window < 2:
+        return np.full(x.shape, np.nan)
+    total, count = _rolling(x, window)
+    square, _ = _rolling(x * x, window)
+    with np.errstate(invalid="ignore"):
+        variance = (square - total * total / window) / (window - 1)
+        return np.where(count == window, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+
+def _as_2d(values: ArrayLike) -> tuple[np.ndarray, tuple[int, ...]]:
+    x = np.asarray(values, dtype="float64")
+    return np.atleast_2d(x), x.shape
+
+
+def _sort(x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(sorted values, valid count) per row; NaN sorts last."""
+    return np.sort(x, axis=1), (~np.isnan(x)).sum(axis=1)
+
+
+def _quantile(ordered: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """Linear-interpolated quantile of each row's first `counts` sorted values."""
+    position = q * np.maximum(counts - 1, 0)
+    low = np.floor(position).astype("int64")
+    high = np.minimum(low + 1, np.maximum(counts - 1, 0))
+    below = np.take_along_axis(ordered, low[:, None], axis=1)[:, 0]
+    above = np.take_along_axis(ordered, high[:, None], axis=1)[:, 0]
+    result = below + (above - below) * (position - low)
+    return np.where(counts > 0, result, np.nan)
+
+
+def _mean_std(x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    valid = ~np.isnan(x)
+    count = valid.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(valid, x, 0.0).sum(axis=1) / count
+        deviation = np.where(valid, x - mean[:, None], 0.0)
+        std = np.sqrt((deviation * deviation).sum(axis=1) / count)
+    return mean, std
+
+
+def _demean_groups(x: np.ndarray, valid: np.ndarray, codes: np.ndarray | None) -> np.ndarray:
+    """Subtract the per-date (per-group) mean over `valid` cells; other cells become NaN."""
+    out = np.full(x.shape, np.nan)
+    if codes is None:
+        masked = np.where(valid, x, np.nan)
+        mean, _ = _mean_std(masked)
+        out[valid] = (masked - mean[:, None])[valid]
+        return out
+    group_count = int(codes.max(initial=-1)) + 1
+    cells = (np.arange(len(x))[:, None] * group_count + codes)[valid]
+    sums = np.bincount(cells, weights=x[valid], minlength=len(x) * group_count)
+    counts = np.bincount(cells, minlength=len(x) * group_count)
+    out[valid] = x[valid] - sums[cells] / counts[cells]
+    return out
+
+
+def _rolling(values: ArrayLike, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """Rolling (sum of valid values, number of valid values) along axis 0."""
+    if window < 1:
+        raise ValueError(f"Rolling window must be a positive integer: {window}")
+    x = np.asarray(values, dtype="float64")
+    valid = ~np.isnan(x)
+    total = np.cumsum(np.where(valid, x, 0.0), axis=0)
+    count = np.cumsum(valid, axis=0)
+    total[window:] = total[window:] - total[:-window]
+    count[window:] = count[window:] - count[:-window]
+    return total, count
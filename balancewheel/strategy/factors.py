@@ -0,0 +1,310 @@
+"""Factor expressions evaluated over aligned date × symbol arrays.
+
+An expression is a small tree built from fields and operators::
+
+    close = field("close")
+    returns = pct_change(close)
+    momentum = rank(pct_change(delay(close, 21), 231))
+    low_vol = rank(-ts_std(returns, 60))
+    combined = zscore(winsorize(momentum + low_vol))
+
+Expressions are compared by structure, and `FactorEngine` caches every
+evaluated node under that structure, so a sub-expression shared by several
+factors (`returns`, `momentum` above) is computed once per engine, even when
+it was built separately.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Mapping, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from balancewheel.data.panel import Panel
+from balancewheel.strategy import cross_section as cs
+
+Operand = Union["Expr", float, int]
+
+
+class Expr:
+    """Node of a factor expression: an operator, child expressions and parameters."""
+
+    __slots__ = ("op", "args", "params", "key")
+
+    def __init__(self, op: str, args: Sequence["Expr"] = (), params: Mapping[str, object] | None = None) -> None:
+        self.op = op
+        self.args = tuple(args)
+        self.params = tuple(sorted((params or {}).items()))
+        self.key = (op, tuple(arg.key for arg in self.args), self.params)
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __eq__(self, other: object) -> bool:  # type: ignore[override]
+        return isinstance(other, Expr) and self.key == other.key
+
+    def __repr__(self) -> str:
+        if self.op == "field":
+            return str(dict(self.params)["name"])
+        if self.op == "const":
+            return repr(dict(self.params)["value"])
+        parts = [repr(arg) for arg in self.args] + [f"{name}={value!r}" for name, value in self.params]
+        return f"{self.op}({', '.join(parts)})"
+
+    def __add__(self, other: Operand) -> "Expr":
+        return Expr("add", (self, _wrap(other)))
+
+    def __radd__(self, other: Operand) -> "Expr":
+        return Expr("add", (_wrap(other), self))
+
+    def __sub__(self, other: Operand) -> "Expr":
+        return Expr("sub", (self, _wrap(other)))
+
+    def __rsub__(self, other: Operand) -> "Expr":
+        return Expr("sub", (_wrap(other), self))
+
+    def __mul__(self, other: Operand) -> "Expr":
+        return Expr("mul", (self, _wrap(other)))
+
+    def __rmul__(self, other: Operand) -> "Expr":
+        return Expr("mul", (_wrap(other), self))
+
+    def __truediv__(self, other: Operand) -> "Expr":
+        return Expr("div", (self, _wrap(other)))
+
+    def __rtruediv__(self, other: Operand) -> "Expr":
+        return Expr("div", (_wrap(other), self))
+
+    def __neg__(self) -> "Expr":
+        return Expr("neg", (self,))
+
+    def __abs__(self) -> "Expr":
+        return Expr("abs", (self,))
+
+
+def field(name: str) -> Expr:
+    return Expr("field", params={"name": name})
+
+
+def const(value: float) -> Expr:
+    return Expr("const", params={"value": float(value)})
+
+
+def log(x: Expr) -> Expr:
+    return Expr("log", (x,))
+
+
+def sign(x: Expr) -> Expr:
+    return Expr("sign", (x,))
+
+
+def delay(x: Expr, periods: int = 1) -> Expr:
+    return Expr("delay", (x,), {"periods": periods})
+
+
+def delta(x: Expr, periods: int = 1) -> Expr:
+    return x - delay(x, periods)
+
+
+def pct_change(x: Expr, periods: int = 1) -> Expr:
+    return x / delay(x, periods) - 1
+
+
+def ts_sum(x: Expr, window: int) -> Expr:
+    return Expr("ts_sum", (x,), {"window": window})
+
+
+def ts_mean(x: Expr, window: int) -> Expr:
+    return Expr("ts_mean", (x,), {"window": window})
+
+
+def ts_std(x: Expr, window: int) -> Expr:
+    return Expr("ts_std", (x,), {"window": window})
+
+
+def rank(x: Expr) -> Expr:
+    return Expr("rank", (x,))
+
+
+def zscore(x: Expr) -> Expr:
+    return Expr("zscore", (x,))
+
+
+def demean(x: Expr) -> Expr:
+    return Expr("demean", (x,))
+
+
+def winsorize(x: Expr, lower: float = 0.01, upper: float = 0.99) -> Expr:
+    return Expr("winsorize", (x,), {"lower": lower, "upper": upper})
+
+
+def winsorize_mad(x: Expr, k: float = 5.0) -> Expr:
+    return Expr("winsorize_mad", (x,), {"k": k})
+
+
+def quantile(x: Expr, buckets: int = 5) -> Expr:
+    return Expr("quantile", (x,), {"buckets": buckets})
+
+
+def neutralize(x: Expr, group: str | None = None, size: Expr | None = None) -> Expr:
+    """Regress out group membership (a name given to `FactorEngine(groups=...)`) and size."""
+    args = (x,) if size is None else (x, size)
+    return Expr("neutralize", args, {"group": group})
+
+
+# 横截面算子在计算前按股票池掩码置 NaN
+CROSS_SECTIONAL = {"rank", "zscore", "demean", "winsorize", "winsorize_mad", "quantile", "neutralize"}
+
+_KERNELS: dict[str, Callable[..., np.ndarray]] = {
+    "add": np.add,
+    "sub": np.subtract,
+    "mul": np.multiply,
+    "div": np.divide,
+    "neg": np.negative,
+    "abs": np.abs,
+    "log": np.log,
+    "sign": np.sign,
+    "delay": cs.ts_delay,
+    "ts_sum": cs.ts_sum,
+    "ts_mean": cs.ts_mean,
+    "ts_std": cs.ts_std,
+    "rank": cs.cs_rank,
+    "zscore": cs.cs_zscore,
+    "demean": cs.cs_demean,
+    "winsorize": cs.cs_winsorize,
+    "winsorize_mad": cs.cs_winsorize_mad,
+    "quantile": cs.cs_quantile,
+    "neutralize": lambda x, size=None, group=None: cs.cs_neutralize(x, groups=group, size=size),
+}
+
+
+class FactorEngine:
+    """Evaluate factor expressions over date × symbol field arrays with caching.
+
+    `fields` maps field names to arrays (or zero-argument loaders called on
+    first use). `universe` is a boolean array of the same shape; cells outside
+    it are NaN for cross-sectional operators. `groups` maps a name to group
+    labels per symbol (or per date and symbol) for `neutralize`.
+
+    Every evaluated node is cached by its structure and returned read-only;
+    `cache_info()` reports hits and memory, `clear()` drops the cache.
+    """
+
+    def __init__(
+        self,
+        fields: Mapping[str, np.ndarray | Callable[[], np.ndarray]],
+        dates: Sequence | None = None,
+        symbols: Sequence[str] | None = None,
+        universe: np.ndarray | None = None,
+        groups: Mapping[str, Sequence] | None = None,
+    ) -> None:
+        self._fields = dict(fields)
+        self.dates = None if dates is None else pd.DatetimeIndex(dates)
+        self.symbols = None if symbols is None else list(symbols)
+        self.universe = None if universe is None else np.asarray(universe, dtype=bool)
+        self.groups = {name: _group_codes(labels) for name, labels in (groups or {}).items()}
+        self._cache: dict[tuple, np.ndarray] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_panel(
+        cls,
+        panel: Panel,
+        start: str | pd.Timestamp | None = None,
+        end: str | pd.Timestamp | None = None,
+        groups: Mapping[str, Sequence] | None = None,
+    ) -> "FactorEngine":
+        """Engine over a panel date range; fields are read from the memory map on first use.
+
+        The panel mask (missing or suspended bars) becomes the universe. Prices
+        are the panel's, adjusted as recorded in `panel.adjust` (qfq unless the
+        panel was built otherwise).
+        """
+        dates = panel.dates[panel.date_slice(start, end)]
+        fields = {
+            name: (lambda name=name: panel.view(name, start=start, end=end))
+            for name in panel.fields
+        }
+        universe = np.asarray(panel.mask(start=start, end=end))
+        return cls(fields, dates=dates, symbols=panel.symbols, universe=universe, groups=groups)
+
+    def evaluate(self, expr: Expr) -> np.ndarray:
+        """Value of `expr` as a date × symbol array."""
+        cached = self._cache.get(expr.key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        if expr.op == "field":
+            value = self._field(dict(expr.params)["name"])
+        elif expr.op == "const":
+            value = _private(dict(expr.params)["value"])
+        else:
+            value = self._compute(expr)
+        value.flags.writeable = False
+        self._cache[expr.key] = value
+        return value
+
+    def evaluate_many(self, exprs: Mapping[str, Expr]) -> dict[str, np.ndarray]:
+        return {name: self.evaluate(expr) for name, expr in exprs.items()}
+
+    def frame(self, expr: Expr) -> pd.DataFrame:
+        """Value of `expr` as a DataFrame indexed by date with one column per symbol."""
+        return pd.DataFrame(self.evaluate(expr), index=self.dates, columns=self.symbols)
+
+    def cache_info(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._cache),
+            "bytes": sum(value.nbytes for value in self._cache.values()),
+        }
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def _field(self, name: str) -> np.ndarray:
+        if name not in self._fields:
+            raise KeyError(f"Unknown factor field: {name}")
+        source = self._fields[name]
+        return _private(source() if callable(source) else source, dtype="float64")
+
+    def _compute(self, expr: Expr) -> np.ndarray:
+        if expr.op not in _KERNELS:
+            raise ValueError(f"Unknown factor operator: {expr.op}")
+        args = [self.evaluate(arg) for arg in expr.args]
+        params = dict(expr.params)
+        if expr.op in CROSS_SECTIONAL and self.universe is not None:
+            args = [np.where(self.universe, arg, np.nan) for arg in args]
+        if expr.op == "neutralize" and params["group"] is not None:
+            if params["group"] not in self.groups:
+                raise KeyError(f"Unknown neutralization group: {params['group']}")
+            params["group"] = self.groups[params["group"]]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.asarray(_KERNELS[expr.op](*args, **params), dtype="float64")
+
+
+def _private(value: object, dtype: str | None = None) -> np.ndarray:
+    """`value` as an array the engine may freeze: caller-owned writable data is copied.
+
+    Read-only inputs (e.g. memory-mapped panel views) are used as is.
+    """
+    array = np.asarray(value, dtype=dtype)
+    if array.flags.writeable and (array is value or array.base is not None):
+        array = array.copy()
+    return array
+
+
+def _wrap(value: Operand) -> Expr:
+    return value if isinstance(value, Expr) else const(value)
+
+
+def _group_codes(labels: Sequence) -> np.ndarray:
+    """Integer codes for group labels; missing labels become -1."""
+    labels = np.asarray(labels)
+    if np.issubdtype(labels.dtype, np.integer):
+        return labels.astype("int64")
+    codes, _ = pd.factorize(labels.ravel())
+    return codes.reshape(labels.shape)
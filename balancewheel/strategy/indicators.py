@@ -0,0 +1,341 @@
+"""Technical indicators with batch and incremental (streaming) forms.
+
+Every indicator is a small state object whose `update` consumes one bar in
+O(1) and works on a scalar or on a whole cross-section (one value per symbol).
+The batch functions compute the same values along axis 0 of a series or a
+date × symbol panel without looping over dates: moving sums come from
+cumulative-sum differences and exponential smoothing from a log-depth scan of
+the linear recurrence. Appending a bar with `update` gives the value the batch
+function would produce, up to floating-point rounding.
+
+NaN inputs (a symbol not yet listed, or suspended) are skipped: they leave
+the state unchanged and give NaN for that bar, and each symbol's windows
+count only its valid bars, starting from the first one. Forward fill (see
+`ffill`) first to treat suspended bars as unchanged prices instead.
+"""
+
+from __future__ import annotations
+
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+ArrayLike = Union[np.ndarray, pd.Series, pd.DataFrame, float]
+
+
+class SMA:
+    """Simple moving average over `period` bars; NaN until the window is full."""
+
+    def __init__(self, period: int) -> None:
+        _check_period(period)
+        self.period = period
+        self._window: np.ndarray | None = None
+        self._sum: np.ndarray | None = None
+        self._count: np.ndarray | None = None
+
+    def update(self, value: ArrayLike) -> np.ndarray:
+        value = np.asarray(value, dtype="float64")
+        flat = value.reshape(-1)
+        if self._window is None:
+            self._window = np.zeros((self.period, flat.size))
+            self._sum = np.zeros(flat.size)
+            self._count = np.zeros(flat.size, dtype="int64")
+        valid = ~np.isnan(flat)
+        columns = np.flatnonzero(valid)
+        slots = self._count[columns] % self.period
+        self._sum[columns] += flat[columns] - self._window[slots, columns]
+        self._window[slots, columns] = flat[columns]
+        self._count[columns] += 1
+        full = valid & (self._count >= self.period)
+        return np.where(full, self._sum / self.period, np.nan).reshape(value.shape)
+
+
+class EMA:
+    """Exponential moving average, alpha = 2 / (period + 1), seeded with the first bar."""
+
+    def __init__(self, period: int | None = None, alpha: float | None = None) -> None:
+        if alpha is None:
+            _check_period(period)
+            alpha = 2.0 / (period + 1)
+        self.alpha = alpha
+        self.value: np.ndarray | None = None
+
+    def update(self, value: ArrayLike) -> np.ndarray:
+        value = np.asarray(value, dtype="float64")
+        if self.value is None:
+            self.value = np.full(value.shape, np.nan)
+        valid = ~np.isnan(value)
+        seeded = ~np.isnan(self.value)
+        smoothed = self.value + self.alpha * (value - self.value)
+        self.value = np.where(valid, np.where(seeded, smoothed, value), self.value)
+        return np.where(valid, self.value, np.nan)
+
+
+class _Wilder:
+    """Wilder smoothing: simple mean of the first `period` inputs, then alpha = 1 / period."""
+
+    def __init__(self, period: int) -> None:
+        _check_period(period)
+        self.period = period
+        self.value: np.ndarray | None = None
+        self._seed: np.ndarray | None = None
+        self._count: np.ndarray | None = None
+
+    def update(self, value: np.ndarray) -> np.ndarray:
+        if self.value is None:
+            self.value = np.full(value.shape, np.nan)
+            self._seed = np.zeros(value.shape)
+            self._count = np.zeros(value.shape, dtype="int64")
+        valid = ~np.isnan(value)
+        self._count = self._count + valid
+        seeding = valid & (self._count <= self.period)
+        self._seed = np.where(seeding, self._seed + np.where(valid, value, 0.0), self._seed)
+        smoothed = self.value + (value - self.value) / self.period
+        self.value = np.where(
+            valid & (self._count == self.period),
+            self._seed / self.period,
+            np.where(valid & (self._count > self.period), smoothed, self.value),
+        )
+        return np.where(valid & (self._count >= self.period), self.value, np.nan)
+
+
+class RSI:
+    """Relative strength index with Wilder smoothing; NaN for the first `period` bars."""
+
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self._gain = _Wilder(period)
+        self._loss = _Wilder(period)
+        self._prev: np.ndarray | None = None
+
+    def update(self, close: ArrayLike) -> np.ndarray:
+        close = np.asarray(close, dtype="float64")
+        if self._prev is None:
+            self._prev = np.full(close.shape, np.nan)
+        change = close - self._prev
+        self._prev = np.where(np.isnan(close), self._prev, close)
+        gain = self._gain.update(np.maximum(change, 0.0))
+        loss = self._loss.update(np.maximum(-change, 0.0))
+        return _rsi(gain, loss)
+
+
+class ATR:
+    """Average true range with Wilder smoothing; NaN for the first `period - 1` bars."""
+
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self._smooth = _Wilder(period)
+        self._prev_close: np.ndarray | None = None
+
+    def update(self, high: ArrayLike, low: ArrayLike, close: ArrayLike) -> np.ndarray:
+        high = np.asarray(high, dtype="float64")
+        low = np.asarray(low, dtype="float64")
+        close = np.asarray(close, dtype="float64")
+        if self._prev_close is None:
+            self._prev_close = np.full(close.shape, np.nan)
+        valid = ~(np.isnan(high) | np.isnan(low) | np.isnan(close))
+        true_range = _true_range(high, low, self._prev_close)
+        self._prev_close = np.where(valid, close, self._prev_close)
+        return self._smooth.update(np.where(valid, true_range, np.nan))
+
+
+class MACD:
+    """MACD line, signal line and histogram; returns (macd, signal, hist)."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9) -> None:
+        self._fast = EMA(fast)
+        self._slow = EMA(slow)
+        self._signal = EMA(signal)
+
+    def update(self, close: ArrayLike) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        line = self._fast.update(close) - self._slow.update(close)
+        signal = self._signal.update(line)
+        return line, signal, line - signal
+
+
+class Bollinger:
+    """Bollinger bands (population std); returns (middle, upper, lower)."""
+
+    def __init__(self, period: int = 20, width: float = 2.0) -> None:
+        self.width = width
+        self._mean = SMA(period)
+        self._square = SMA(period)
+
+    def update(self, close: ArrayLike) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        close = np.asarray(close, dtype="float64")
+        middle = self._mean.update(close)
+        square = self._square.update(close * close)
+        std = np.sqrt(np.maximum(square - middle * middle, 0.0))
+        return middle, middle + self.width * std, middle - self.width * std
+
+
+def sma(values: ArrayLike, period: int) -> np.ndarray:
+    _check_period(period)
+    packed = _Packed(values)
+    return packed.unpack(_moving_mean(packed.values[0], period))
+
+
+def ema(values: ArrayLike, period: int) -> np.ndarray:
+    _check_period(period)
+    packed = _Packed(values)
+    return packed.unpack(_ema(packed.values[0], 2.0 / (period + 1)))
+
+
+def rsi(close: ArrayLike, period: int = 14) -> np.ndarray:
+    _check_period(period)
+    packed = _Packed(close)
+    change = np.diff(packed.values[0], axis=0, prepend=np.nan)
+    gain = _wilder(np.maximum(change, 0.0), period, first=1)
+    loss = _wilder(np.maximum(-change, 0.0), period, first=1)
+    return packed.unpack(_rsi(gain, loss))
+
+
+def atr(high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 14) -> np.ndarray:
+    _check_period(period)
+    packed = _Packed(high, low, close)
+    high, low, close = packed.values
+    previous = np.concatenate([np.full((1, close.shape[1]), np.nan), close[:-1]])
+    return packed.unpack(_wilder(_true_range(high, low, previous), period))
+
+
+def macd(
+    close: ArrayLike, fast: int = 12, slow: int = 26, signal: int = 9
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    for period in (fast, slow, signal):
+        _check_period(period)
+    packed = _Packed(close)
+    values = packed.values[0]
+    line = _ema(values, 2.0 / (fast + 1)) - _ema(values, 2.0 / (slow + 1))
+    signal_line = _ema(line, 2.0 / (signal + 1))
+    return packed.unpack(line), packed.unpack(signal_line), packed.unpack(line - signal_line)
+
+
+def bollinger(
+    close: ArrayLike, period: int = 20, width: float = 2.0
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    _check_period(period)
+    packed = _Packed(close)
+    values = packed.values[0]
+    # 以各标的首个有效值为基准平移，减小累计和相减的舍入误差
+    base = np.nan_to_num(values[:1])
+    shifted = values - base
+    mean = _moving_mean(shifted, period)
+    variance = _moving_mean(shifted * shifted, period) - mean * mean
+    std = np.sqrt(np.maximum(variance, 0.0))
+    middle = mean + base
+    return packed.unpack(middle), packed.unpack(middle + width * std), packed.unpack(middle - width * std)
+
+
+def ffill(values: ArrayLike) -> np.ndarray:
+    """Forward-fill NaN along axis 0 (e.g. suspended bars in a panel)."""
+    values = np.asarray(values, dtype="float64")
+    index = np.arange(len(values)).reshape(-1, *[1] * (values.ndim - 1))
+    positions = np.where(np.isnan(values), 0, index)
+    np.maximum.accumulate(positions, axis=0, out=positions)
+    return np.take_along_axis(values, positions, axis=0)
+
+
+class _Packed:
+    """Inputs with each column's valid bars moved to the top, in order.
+
+    A bar is valid when every input is non-NaN there. Row k of a packed
+    column is that symbol's k-th valid bar, so windows and recursions run
+    over valid bars only; `unpack` scatters results back to the dates.
+    Dense inputs are used as they are.
+    """
+
+    def __init__(self, *inputs: ArrayLike) -> None:
+        arrays = [np.asarray(values, dtype="float64") for values in inputs]
+        self.shape = arrays[0].shape
+        arrays = [array.reshape(len(array), int(np.prod(self.shape[1:]))) for array in arrays]
+        valid = ~np.logical_or.reduce([np.isnan(array) for array in arrays])
+        self.dense = bool(valid.all())
+        if self.dense:
+            self.values = arrays
+            return
+        self._rows = np.cumsum(valid, axis=0)[valid] - 1
+        self._columns = np.nonzero(valid)[1]
+        self._valid = valid
+        self.values = []
+        for array in arrays:
+            packed = np.full(array.shape, np.nan)
+            packed[self._rows, self._columns] = array[valid]
+            self.values.append(packed)
+
+    def unpack(self, packed: np.ndarray) -> np.ndarray:
+        if self.dense:
+            return packed.reshape(self.shape)
+        result = np.full(packed.shape, np.nan)
+        result[self._valid] = packed[self._rows, self._columns]
+        return result.reshape(self.shape)
+
+
+def _moving_mean(values: np.ndarray, period: int) -> np.ndarray:
+    """Mean of the last `period` rows from cumulative-sum differences; NaN until full."""
+    result = np.full(values.shape, np.nan)
+    if len(values) < period:
+        return result
+    total = np.cumsum(values, axis=0)
+    result[period - 1] = total[period - 1]
+    result[period:] = total[period:] - total[:-period]
+    return result / period
+
+
+def _ema(values: np.ndarray, alpha: float) -> np.ndarray:
+    """Exponential smoothing seeded with the first row."""
+    if not len(values):
+        return values.copy()
+    return _linear_scan(values * alpha, 1.0 - alpha, 0, values[0])
+
+
+def _wilder(values: np.ndarray, period: int, first: int = 0) -> np.ndarray:
+    """Wilder smoothing of rows from `first` on, seeded with the mean of their first `period`."""
+    seed_row = first + period - 1
+    if len(values) <= seed_row:
+        return np.full(values.shape, np.nan)
+    seed = values[first : seed_row + 1].mean(axis=0)
+    return _linear_scan(values / period, 1.0 - 1.0 / period, seed_row, seed)
+
+
+def _linear_scan(
+    values: np.ndarray, decay: float, seed_row: int, seed: np.ndarray
+) -> np.ndarray:
+    """Solve y[t] = decay * y[t-1] + values[t] along axis 0 with y[seed_row] = seed.
+
+    Rows before `seed_row` are NaN. Pairs (coefficient, offset) of the
+    recurrence are composed over doubling distances (a Hillis–Steele scan),
+    so the loop runs log2(rows) times over whole arrays instead of once per
+    date; every coefficient is a power of `decay` <= 1, so nothing overflows.
+    """
+    offset = np.array(values, dtype="float64")
+    offset[:seed_row] = 0.0
+    offset[seed_row] = seed
+    coefficient = np.full(len(offset), decay)
+    coefficient[: seed_row + 1] = 0.0
+    shape = (-1,) + (1,) * (offset.ndim - 1)
+    shift = 1
+    while shift < len(offset):
+        offset[shift:] = offset[shift:] + coefficient[shift:].reshape(shape) * offset[:-shift]
+        coefficient[shift:] = coefficient[shift:] * coefficient[:-shift]
+        shift *= 2
+    offset[:seed_row] = np.nan
+    return offset
+
+
+def _true_range(high: np.ndarray, low: np.ndarray, prev_close: np.ndarray) -> np.ndarray:
+    """high - low, widened to the previous close where there is one."""
+    with np.errstate(invalid="ignore"):
+        wide = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return np.where(np.isnan(prev_close), high - low, wide)
+
+
+def _rsi(gain: np.ndarray, loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+    return np.where(loss == 0, np.where(gain == 0, 50.0, 100.0), rsi)
+
+
+def _check_period(period: int | None) -> None:
+    if period is None or period < 1:
+        raise ValueError(f"Indicator period must be a positive integer: {period}")
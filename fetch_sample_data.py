@@ -31,8 +31,12 @@ def main() -> None:
         # DataRequest(symbol="510300", asset_type="etf", start=start, end=end, adjust="none"),
     ]
 
+    batch = service.fetch_many(requests, provider_name="akshare")
     for request in requests:
-        data = service.fetch_and_save(request, provider_name="akshare")
+        if request in batch.errors:
+            print(f"{request.asset_type} {request.symbol}: failed -> {batch.errors[request]}")
+            continue
+        data = batch.results[request]
         if data.empty:
             print(f"{request.asset_type} {request.symbol}: no data returned")
             continue
@@ -40,6 +44,7 @@ def main() -> None:
             f"{request.asset_type} {request.symbol}: rows={len(data)} "
             f"start={data['datetime'].min().date()} end={data['datetime'].max().date()}"
         )
+    service.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from balancewheel.data.interfaces import DataProvider, DataRequest
+
+
+class StubProvider(DataProvider):
+    """Serve bars from an in-memory frame and record every request."""
+
+    def __init__(self, bars: pd.DataFrame, name: str = "stub") -> None:
+        self.bars = bars
+        self.name = name
+        self.requests: list[DataRequest] = []
+
+    def fetch_daily_ohlcv(self, request: DataRequest) -> pd.DataFrame:
+        self.requests.append(request)
+        dates = self.bars["datetime"]
+        selected = (dates >= pd.Timestamp(request.start)) & (dates <= pd.Timestamp(request.end))
+        return self.bars[selected].reset_index(drop=True)
+
+
+@pytest.fixture
+def stub_provider():
+    return StubProvider
+
+
+@pytest.fixture
+def make_bars():
+    """Factory of normalized daily bars on business days with a seeded random walk."""
+
+    def make(start="2024-01-01", periods=60, seed=0, dates=None):
+        index = pd.bdate_range(start, periods=periods) if dates is None else pd.DatetimeIndex(dates)
+        rng = np.random.default_rng(seed)
+        close = 10.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, len(index))))
+        open_ = close * (1 + rng.normal(0.0, 0.003, len(index)))
+        high = np.maximum(open_, close) * 1.01
+        low = np.minimum(open_, close) * 0.99
+        previous = np.r_[close[0], close[:-1]]
+        return pd.DataFrame(
+            {
+                "datetime": index,
+                "open": open_.round(2),
+                "high": high.round(2),
+                "low": low.round(2),
+                "close": close.round(2),
+                "volume": rng.integers(1_000, 100_000, len(index)) * 100,
+                "amount": (close * 1e6).round(2),
+                "amplitude": ((high - low) / previous * 100).round(4),
+                "change_pct": ((close / previous - 1) * 100).round(4),
+                "change": (close - previous).round(4),
+                "turnover": rng.uniform(0.1, 5.0, len(index)).round(4),
+            }
+        )
+
+    return make
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from balancewheel.data.adjust import apply_adjustment, factor_values, normalize_factors
+from balancewheel.data.interfaces import DataRequest
+from balancewheel.data.panel import build_panel
+from balancewheel.data.repository import CsvRepository
+from balancewheel.data.service import DataService
+
+PRICES = ["open", "high", "low", "close"]
+
+
+@pytest.fixture
+def factor_provider(stub_provider):
+    class FactorProvider(stub_provider):
+        """Serves provider-side qfq/hfq series computed from its own factor table."""
+
+        def __init__(self, bars, factors):
+            super().__init__(bars)
+            self.factors = factors
+            self.factor_requests = 0
+
+        def fetch_daily_ohlcv(self, request):
+            data = super().fetch_daily_ohlcv(request).copy()
+            if request.adjust != "none":
+                scale = factor_values(data["datetime"], self.factors)
+                if request.adjust == "qfq":
+                    scale = scale / self.factors["factor"].iloc[-1]
+                data[PRICES] = data[PRICES].mul(scale, axis=0)
+            return data
+
+        def has_adjust_factors(self, asset_type):
+            return asset_type == "stock"
+
+        def fetch_adjust_factors(self, request):
+            self.factor_requests += 1
+            return self.factors
+
+    return FactorProvider
+
+
+@pytest.fixture
+def factors():
+    # 两次除权：2024-01-15 送转、2024-02-05 分红
+    return normalize_factors(pd.DataFrame({"datetime": ["2024-01-01", "2024-01-15", "2024-02-05"], "factor": [1.0, 1.5, 1.56]}))
+
+
+def test_factor_values_step_at_ex_dates(factors):
+    dates = pd.to_datetime(["2023-12-29", "2024-01-12", "2024-01-15", "2024-03-01"])
+    np.testing.assert_array_equal(factor_values(dates, factors), [1.0, 1.0, 1.5, 1.56])
+
+
+def test_normalize_factors_sorts_and_drops_invalid_rows():
+    raw = pd.DataFrame({"datetime": ["2024-02-01", "2024-01-01", "2024-02-01", "2024-03-01"], "factor": [2.0, 1.0, 2.5, "-"]})
+    assert normalize_factors(raw)["factor"].tolist() == [1.0, 2.5]
+
+
+@pytest.mark.parametrize("adjust", ["qfq", "hfq"])
+def test_derived_prices_match_the_provider_adjusted_series(tmp_path, make_bars, factor_provider, factors, adjust):
+    provider = factor_provider(make_bars(periods=50), factors)
+    service = DataService({"stub": provider}, CsvRepository(tmp_path))
+    request = DataRequest("000001", "stock", "20240101", "20240331", adjust=adjust)
+    derived = service.fetch_and_save(request, "stub")
+    # 只存不复权行情，复权价格在本地计算
+    assert [r.adjust for r in provider.requests] == ["none"]
+    assert provider.factor_requests == 1
+
+    expected = provider.fetch_daily_ohlcv(request)
+    np.testing.assert_allclose(derived[PRICES], expected[PRICES], rtol=1e-12)
+    np.testing.assert_array_equal(derived["volume"], expected["volume"])
+    stored = service.repository.load("000001", "stock")
+    np.testing.assert_allclose(stored["close"], provider.bars["close"])
+    loaded = service.repository.load("000001", "stock", columns=["close"], adjust=adjust)
+    np.testing.assert_allclose(loaded["close"], expected["close"], rtol=1e-12)
+
+
+def test_apply_adjustment_rejects_unknown_modes(make_bars, factors):
+    with pytest.raises(ValueError):
+        apply_adjustment(make_bars(periods=5), factors, "ffq")
+
+
+def test_panel_uses_adjusted_prices_and_records_the_mode(tmp_path, make_bars, factors):
+    repository = CsvRepository(tmp_path / "data")
+    bars = make_bars(periods=40)
+    repository.save("000001", "stock", bars)
+    repository.save_factors("000001", "stock", factors)
+    repository.save("510300", "etf", bars)
+
+    panel = build_panel(repository, tmp_path / "panel")
+    assert panel.adjust == "qfq"
+    expected = apply_adjustment(bars, factors, "qfq")["close"]
+    np.testing.assert_allclose(panel.view("close", "000001"), expected)
+    # 没有复权因子的序列按原样进入面板
+    np.testing.assert_allclose(panel.view("close", "510300"), bars["close"])
+
+    raw = build_panel(repository, tmp_path / "raw", adjust="none")
+    assert raw.adjust == "none"
+    np.testing.assert_allclose(raw.view("close", "000001"), bars["close"])
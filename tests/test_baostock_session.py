@@ -0,0 +1,91 @@
+import sys
+import types
+
+import pytest
+
+from balancewheel.data.interfaces import DataRequest
+from balancewheel.data.providers.baostock_provider import BaostockProvider, BaostockSession, frame_from_rows
+
+
+class Result:
+    def __init__(self, rows, error_code="0", error_msg=""):
+        self.rows = list(rows)
+        self.fields = ["date", "open", "high", "low", "close", "volume", "amount"]
+        self.error_code = error_code
+        self.error_msg = error_msg
+
+    def next(self):
+        return bool(self.rows)
+
+    def get_row_data(self):
+        return self.rows.pop(0)
+
+
+@pytest.fixture
+def fake_baostock(monkeypatch):
+    """Stand-in `baostock` module counting logins and serving canned rows."""
+    module = types.SimpleNamespace(logins=0, logouts=0, errors=[])
+
+    def login():
+        module.logins += 1
+        return Result([])
+
+    def logout():
+        module.logouts += 1
+
+    def query_history_k_data_plus(code, fields, **kwargs):
+        if module.errors:
+            return Result([], *module.errors.pop(0))
+        return Result([["2024-01-02", "10.0", "10.5", "9.8", "10.2", "12345", "125000.5"]])
+
+    module.login = login
+    module.logout = logout
+    module.query_history_k_data_plus = query_history_k_data_plus
+    monkeypatch.setitem(sys.modules, "baostock", module)
+    return module
+
+
+@pytest.fixture
+def provider(fake_baostock):
+    session = BaostockSession()
+    yield BaostockProvider(session)
+    session.close()
+
+
+REQUEST = DataRequest("600000", "stock", "20240101", "20240131")
+
+
+def test_queries_share_one_login(fake_baostock, provider):
+    for _ in range(3):
+        data = provider.fetch_daily_ohlcv(REQUEST)
+    assert fake_baostock.logins == 1
+    assert data["close"].tolist() == [10.2]
+
+
+def test_expired_session_logs_in_again_and_retries(fake_baostock, provider):
+    provider.fetch_daily_ohlcv(REQUEST)
+    fake_baostock.errors.append(("10001001", "用户未登录"))
+    data = provider.fetch_daily_ohlcv(REQUEST)
+    assert fake_baostock.logins == 2
+    assert len(data) == 1
+
+
+def test_query_errors_raise_runtime_error(fake_baostock, provider):
+    fake_baostock.errors.append(("10004011", "参数错误"))
+    with pytest.raises(RuntimeError, match="参数错误"):
+        provider.fetch_daily_ohlcv(REQUEST)
+
+
+def test_context_manager_logs_out_when_the_outermost_block_exits(fake_baostock, provider):
+    with provider:
+        with provider:
+            provider.fetch_daily_ohlcv(REQUEST)
+        assert fake_baostock.logouts == 0
+    assert fake_baostock.logouts == 1
+
+
+def test_frame_from_rows_parses_numeric_columns():
+    frame = frame_from_rows([["2024-01-02", "10.0", ""]], ["date", "open", "volume"])
+    assert frame["date"].tolist() == ["2024-01-02"]
+    assert frame["open"].dtype == "float64"
+    assert frame["volume"].isna().all()
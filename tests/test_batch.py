@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+from balancewheel.data.batch import ProviderGate, ProviderLimit, RateLimiter, RetryPolicy
+from balancewheel.data.interfaces import DataRequest
+from balancewheel.data.repository import CsvRepository
+from balancewheel.data.service import DataService
+
+
+def flaky(failures, error=OSError):
+    calls = []
+
+    def func():
+        calls.append(time.monotonic())
+        if len(calls) <= failures:
+            raise error("transient")
+        return "ok"
+
+    return func, calls
+
+
+def test_gate_retries_transient_errors_with_backoff():
+    gate = ProviderGate(ProviderLimit(), RetryPolicy(attempts=3, backoff=0.01))
+    func, calls = flaky(2)
+    assert gate.call(func) == "ok"
+    assert len(calls) == 3
+    assert gate.retries == 2
+
+
+def test_gate_gives_up_after_the_last_attempt():
+    gate = ProviderGate(ProviderLimit(), RetryPolicy(attempts=2, backoff=0.01))
+    func, calls = flaky(5)
+    with pytest.raises(OSError):
+        gate.call(func)
+    assert len(calls) == 2
+
+
+def test_not_implemented_hooks_are_not_retried():
+    gate = ProviderGate(ProviderLimit(), RetryPolicy(attempts=3, backoff=1.0))
+    func, calls = flaky(5, NotImplementedError)
+    started = time.monotonic()
+    with pytest.raises(NotImplementedError):
+        gate.call(func)
+    assert len(calls) == 1
+    assert time.monotonic() - started < 0.5
+
+
+def test_other_errors_are_not_retried():
+    gate = ProviderGate(ProviderLimit(), RetryPolicy(attempts=3, backoff=0.01))
+    func, calls = flaky(5, ValueError)
+    with pytest.raises(ValueError):
+        gate.call(func)
+    assert len(calls) == 1
+
+
+def test_gate_bounds_concurrency():
+    gate = ProviderGate(ProviderLimit(max_concurrency=2), RetryPolicy())
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def func():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+
+    threads = [threading.Thread(target=gate.call, args=(func,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 2
+
+
+def test_rate_limiter_spaces_calls():
+    limiter = RateLimiter(rate=100)
+    started = time.monotonic()
+    for _ in range(5):
+        limiter.wait()
+    assert time.monotonic() - started >= 0.04 - 1e-3
+
+
+def test_fetch_many_isolates_failing_requests(tmp_path, make_bars, stub_provider):
+    class Failing(stub_provider):
+        def fetch_daily_ohlcv(self, request):
+            if request.symbol == "000002":
+                raise ValueError("bad symbol")
+            return super().fetch_daily_ohlcv(request)
+
+    provider = Failing(make_bars(periods=20))
+    service = DataService({"stub": provider}, CsvRepository(tmp_path))
+    requests = [DataRequest(f"{i:06d}", "stock", "20240101", "20240131") for i in range(1, 5)]
+    try:
+        result = service.fetch_many(requests, "stub", max_workers=4)
+    finally:
+        service.close()
+    assert not result.ok
+    assert [request.symbol for request in result.errors] == ["000002"]
+    assert sorted(request.symbol for request in result.results) == ["000001", "000003", "000004"]
+    summary = result.summary().set_index("symbol")
+    assert summary.loc["000002", "status"] == "error"
+    assert summary.loc["000001", "rows"] == len(provider.bars[provider.bars["datetime"] <= "2024-01-31"])
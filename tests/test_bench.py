@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+from balancewheel.data.bench import BENCH_CASES, compare_results, run_benchmarks, write_results
+
+
+def test_smoke_run_covers_every_case_and_cleans_up(tmp_path):
+    seen = []
+    results = run_benchmarks(symbols=(2,), years=(1,), root=tmp_path, progress=seen.append)
+    assert [result.case for result in results] == list(BENCH_CASES)
+    assert seen == results
+    assert all(result.rows > 0 and result.seconds >= 0 for result in results)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unknown_cases_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        run_benchmarks(symbols=(1,), years=(1,), cases=["normalize", "bogus"], root=tmp_path)
+
+
+def test_compare_flags_slowdowns_beyond_the_threshold(tmp_path):
+    results = run_benchmarks(symbols=(1,), years=(1,), cases=["normalize", "validate"], root=tmp_path)
+    baseline = write_results(results, tmp_path / "baseline.json")
+    payload = json.loads(baseline.read_text(encoding="utf-8"))
+    payload["results"][0]["seconds"] *= 2
+    payload["results"][1]["seconds"] *= 1.1
+    current = tmp_path / "current.json"
+    current.write_text(json.dumps(payload), encoding="utf-8")
+
+    table = compare_results(baseline, current, threshold=0.2)
+    assert table["regressed"].tolist() == [True, False]
+    assert table["ratio"].iloc[0] == pytest.approx(2.0)
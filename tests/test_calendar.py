@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from balancewheel.data.calendar import TradingCalendar, find_gaps, load_calendar
+from balancewheel.data.interfaces import DataRequest
+from balancewheel.data.panel import build_panel
+from balancewheel.data.repository import CsvRepository
+from balancewheel.data.service import DataService
+
+# 2024 年春节休市：2 月 9 日至 16 日
+SESSIONS = pd.bdate_range("2024-01-02", "2024-03-29").difference(pd.bdate_range("2024-02-09", "2024-02-16"))
+
+
+@pytest.fixture
+def calendar():
+    return TradingCalendar(SESSIONS)
+
+
+def test_session_lookups(calendar):
+    dates = pd.to_datetime(["2024-01-02", "2024-02-10", "2024-02-19", "2023-12-29", "2024-04-01"])
+    np.testing.assert_array_equal(calendar.session_index(dates), [0, -1, 28, -1, -1])
+    np.testing.assert_array_equal(calendar.is_session(dates), [True, False, True, False, False])
+    assert calendar.next_session("2024-02-08") == pd.Timestamp("2024-02-19")
+    assert calendar.previous_session("2024-02-19") == pd.Timestamp("2024-02-08")
+    assert calendar.next_session("2024-03-29") is None
+    assert calendar.previous_session("2024-01-02") is None
+    assert list(calendar.sessions_in_range("20240207", "20240220").day) == [7, 8, 19, 20]
+
+
+def test_missing_sessions_and_reindex(calendar):
+    dates = pd.to_datetime(["2024-02-07", "2024-02-19", "2024-02-21", "2024-02-10"])
+    missing = calendar.missing_sessions(dates)
+    assert list(missing.strftime("%m%d")) == ["0208", "0220"]
+    sessions, values = calendar.reindex(np.array([[1.0], [2.0], [3.0], [9.0]]), dates, "20240207", "20240221")
+    assert list(sessions.strftime("%m%d")) == ["0207", "0208", "0219", "0220", "0221"]
+    np.testing.assert_array_equal(values[:, 0], [1.0, np.nan, 2.0, np.nan, 3.0])
+
+
+def test_save_load_round_trip(tmp_path, calendar):
+    repository = CsvRepository(tmp_path)
+    assert load_calendar(repository) is None
+    calendar.save(repository.meta_root / "calendar.csv")
+    assert load_calendar(repository).sessions.equals(calendar.sessions)
+
+
+def test_find_gaps_counts_missing_and_off_calendar_rows(tmp_path, make_bars, calendar):
+    repository = CsvRepository(tmp_path)
+    dates = SESSIONS[:30].delete([5, 6]).append(pd.DatetimeIndex(["2024-02-10"])).sort_values()
+    repository.save("000001", "stock", make_bars(dates=dates))
+    gaps = find_gaps(repository, calendar).iloc[0]
+    assert (gaps["expected"], gaps["stored"], gaps["missing"], gaps["off_calendar"]) == (30, 29, 2, 1)
+
+
+def test_panel_on_calendar_masks_suspended_sessions(tmp_path, make_bars, calendar):
+    repository = CsvRepository(tmp_path / "data")
+    repository.save("000001", "stock", make_bars(dates=SESSIONS[:20].delete([3, 4])))
+    panel = build_panel(repository, tmp_path / "panel", calendar=calendar)
+    assert len(panel.dates) == 20
+    mask = panel.mask("000001")
+    assert not mask[3:5].any() and mask[:3].all()
+
+
+def test_update_skips_the_provider_when_no_session_has_passed(tmp_path, make_bars, stub_provider, calendar):
+    provider = stub_provider(make_bars(dates=SESSIONS[SESSIONS <= "2024-02-08"]))
+    service = DataService({"stub": provider}, CsvRepository(tmp_path), calendar=calendar)
+    request = DataRequest("000001", "stock", "20240102", "20240208")
+    service.fetch_and_save(request, "stub")
+    provider.requests.clear()
+    # 节前最后一个交易日已入库，节中更新不请求数据源
+    service.update(DataRequest("000001", "stock", "20240102", "20240216"), "stub")
+    assert provider.requests == []
+    service.update(DataRequest("000001", "stock", "20240102", "20240219"), "stub")
+    assert len(provider.requests) == 1
@@ -0,0 +1,95 @@
+import json
+import threading
+
+import pytest
+
+from balancewheel.data.catalog import MetaCatalog, normalize_record
+from balancewheel.data.repository import CsvRepository
+
+
+def record(symbol="000001", last_date="2024-01-31", fingerprint="f1", **extra):
+    return {
+        "timestamp": "2024-02-01T00:00:00",
+        "symbol": symbol,
+        "asset_type": "stock",
+        "adjust": "none",
+        "source": "stub",
+        "path": f"data/stock_{symbol}.csv",
+        "start": "20240101",
+        "end": "20240131",
+        "rows": 22,
+        "first_date": "2024-01-02T00:00:00",
+        "last_date": f"{last_date}T00:00:00",
+        "fingerprint": fingerprint,
+        **extra,
+    }
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = MetaCatalog(tmp_path / "catalog.sqlite")
+    yield catalog
+    catalog.close()
+
+
+def test_latest_and_history_track_every_write(catalog):
+    catalog.record(record(fingerprint="f1"))
+    catalog.record(record(last_date="2024-02-29", fingerprint="f2", note="appended"))
+    latest = catalog.latest("000001", "stock", "none")
+    assert latest["fingerprint"] == "f2"
+    assert latest["note"] == "appended"
+    assert catalog.history("000001", "stock", "none")["fingerprint"].tolist() == ["f1", "f2"]
+    assert len(catalog.current()) == 1
+    assert catalog.find_fingerprint("f1")["last_date"].tolist() == ["2024-01-31T00:00:00"]
+    assert catalog.fingerprint_for("stock_000001.csv") == "f2"
+    assert catalog.latest("000001", "stock", "qfq") is None
+
+
+def test_transaction_commits_once_and_is_visible_inside(catalog):
+    with catalog.transaction():
+        threads = [threading.Thread(target=catalog.record, args=(record(symbol=f"00000{i}"),)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with catalog.transaction():
+            catalog.record(record(symbol="000009"))
+        assert catalog.current().empty
+        assert catalog.latest("000009", "stock", "none") is not None
+    assert len(catalog.current()) == 5
+
+
+def test_transaction_rolls_back_on_error(catalog):
+    catalog.record(record(symbol="000001"))
+    with pytest.raises(RuntimeError):
+        with catalog.transaction():
+            catalog.record(record(symbol="000002"))
+            raise RuntimeError("batch failed")
+    assert catalog.current()["symbol"].tolist() == ["000001"]
+
+
+def test_stale_and_coverage_queries(catalog):
+    catalog.record_many([record(symbol="000001", last_date="2024-01-31"), record(symbol="000002", last_date="2024-03-29")])
+    assert catalog.stale("20240301")["symbol"].tolist() == ["000001"]
+    assert catalog.coverage_gaps("20240102", "20240329")["symbol"].tolist() == ["000001"]
+    assert catalog.coverage_gaps("20231201", "20240131")["symbol"].tolist() == ["000001", "000002"]
+
+
+def test_legacy_records_infer_asset_type_and_adjust():
+    legacy = {"symbol": "510300", "path": "data\\etf_510300.csv", "fingerprint": "f", "batch": "x"}
+    row = normalize_record(legacy)
+    assert (row["asset_type"], row["adjust"]) == ("etf", "none")
+    assert json.loads(row["extra"]) == {"batch": "x"}
+
+
+def test_repository_imports_a_legacy_manifest_once(tmp_path):
+    meta = tmp_path / "_meta"
+    meta.mkdir()
+    lines = [record(fingerprint="f1"), record(fingerprint="f2")]
+    (meta / "manifest.jsonl").write_text("".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+    repository = CsvRepository(tmp_path)
+    assert len(repository.catalog.history("000001", "stock", "none")) == 2
+    repository.catalog.close()
+    reopened = CsvRepository(tmp_path)
+    assert len(reopened.catalog.history("000001", "stock", "none")) == 2
+    assert reopened.catalog.latest("000001", "stock", "none")["fingerprint"] == "f2"
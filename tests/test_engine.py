@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from balancewheel.engine import AShareRules, EventEngine, Order, align_frames, board_limit_pct, run_vectorized
+
+FREE = AShareRules(commission_rate=0.0, min_commission=0.0, stamp_tax_rate=0.0)
+
+
+def test_board_limits_and_costs():
+    assert [board_limit_pct(code) for code in ["600000", "300750", "688981", "830799"]] == [0.1, 0.2, 0.2, 0.3]
+    rules = AShareRules()
+    assert rules.commission(10_000.0) == 5.0
+    assert rules.commission(0.0) == 0.0
+    assert rules.commission(100_000.0) == pytest.approx(25.0)
+    assert rules.stamp_tax(10_000.0) == pytest.approx(5.0)
+    up, down = rules.limit_prices(np.array([10.05]), np.array([0.1]))
+    assert (up[0], down[0]) == (11.06, 9.05)
+
+
+def test_weights_trade_at_the_next_open_in_whole_lots():
+    open_ = np.array([[10.0], [10.0], [11.0]])
+    close = np.array([[10.0], [10.5], [11.0]])
+    weights = np.array([[0.5], [0.5], [0.5]])
+    result = run_vectorized(open_, close, weights, ["600000"], rules=FREE, initial_cash=10_550.0, record_positions=True)
+    # 第 0 根 K 线收盘后的目标仓位在第 1 根开盘成交：5275 / 10 向下取整到 500 股
+    assert result.positions[:, 0].tolist() == [0.0, 500.0, 500.0]
+    assert result.equity[0] == 10_550.0
+    assert result.equity[1] == pytest.approx(10_550.0 + 500 * 0.5)
+
+
+def test_limit_up_open_blocks_buys_and_suspended_bars_cannot_trade():
+    open_ = np.array([[10.0, 10.0], [11.0, 10.0], [11.0, 10.0]])
+    close = np.array([[10.0, 10.0], [11.0, 10.0], [11.0, 10.0]])
+    volume = np.array([[1.0, 1.0], [1.0, 0.0], [1.0, 1.0]])
+    weights = np.full((3, 2), 0.4)
+    result = run_vectorized(
+        open_, close, weights, ["600000", "600001"], volume=volume, rules=FREE, record_positions=True
+    )
+    # 600000 以涨停价开盘、600001 停牌，第 1 根均无法买入
+    assert result.blocked[1] == 2
+    assert result.positions[1].tolist() == [0.0, 0.0]
+    assert result.positions[2, 1] > 0
+
+
+def test_costs_are_charged_on_both_sides():
+    open_ = np.full((4, 1), 10.0)
+    close = np.full((4, 1), 10.0)
+    weights = np.array([[1.0], [0.0], [0.0], [0.0]])
+    result = run_vectorized(open_, close, weights, ["600000"], initial_cash=100_000.0)
+    assert result.commission[1] > 0 and result.commission[2] > 0
+    assert result.stamp_tax[1] == 0 and result.stamp_tax[2] > 0
+    assert result.equity[-1] == pytest.approx(100_000.0 - result.commission.sum() - result.stamp_tax.sum())
+
+
+def test_leading_run_axes_are_simulated_together():
+    rng = np.random.default_rng(0)
+    close = 10 * np.exp(np.cumsum(rng.normal(0, 0.01, (50, 3)), axis=0))
+    weights = rng.uniform(0, 0.3, (2, 4, 50, 3))
+    batch = run_vectorized(close, close, weights, ["600000", "600001", "600002"])
+    assert batch.equity.shape == (2, 4, 50)
+    single = run_vectorized(close, close, weights[1, 2], ["600000", "600001", "600002"])
+    np.testing.assert_allclose(batch.equity[1, 2], single.equity)
+
+
+class BuyThenSell:
+    def on_bar(self, context):
+        if context.index == 0:
+            return [Order("600000", 1050)]
+        if context.index == 2:
+            return [Order("600000", -1000)]
+        return []
+
+
+def frames(make_bars):
+    return {"600000": make_bars(periods=10, seed=1)}
+
+
+def test_event_engine_matches_the_vectorized_engine(make_bars):
+    data = frames(make_bars)
+    result = EventEngine(data, rules=AShareRules()).run(BuyThenSell())
+    assert result.trades["quantity"].tolist() == [1000, -1000]
+
+    dates, symbols, bars = align_frames(data)
+    # 目标权重对应 10.5 手，按整手向下取整后持有 1000 股（权益变化远小于半手）
+    weights = np.zeros((len(dates), 1))
+    weights[0:2, 0] = 1050 * bars["open"][1:3, 0] / 1_000_000.0
+    vectorized = run_vectorized(bars["open"], bars["close"], weights, symbols, volume=bars["volume"])
+    np.testing.assert_allclose(vectorized.equity, result.equity.to_numpy())
+
+
+def test_event_engine_enforces_t_plus_one(make_bars):
+    class SellSameDay:
+        def on_bar(self, context):
+            if context.index == 0:
+                return [Order("600000", 100), Order("600000", -100)]
+            return []
+
+    result = EventEngine(frames(make_bars)).run(SellSameDay())
+    assert result.trades["quantity"].tolist() == [100]
+    assert result.positions["600000"].iloc[-1] == 100
+
+
+def test_align_frames_unions_dates(make_bars):
+    first = make_bars(periods=5)
+    second = make_bars(periods=5).iloc[2:]
+    dates, symbols, arrays = align_frames({"a": first, "b": second.reset_index(drop=True)})
+    assert len(dates) == 5 and symbols == ["a", "b"]
+    assert np.isnan(arrays["close"][:2, 1]).all()
+    assert isinstance(pd.DatetimeIndex(dates), pd.DatetimeIndex)
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from balancewheel.data.panel import build_panel
+from balancewheel.data.repository import CsvRepository
+from balancewheel.strategy.cross_section import (
+    cs_neutralize,
+    cs_quantile,
+    cs_rank,
+    cs_winsorize,
+    cs_zscore,
+    ts_std,
+)
+from balancewheel.strategy.factors import FactorEngine, field, neutralize, pct_change, rank, ts_mean, zscore
+
+
+@pytest.fixture
+def close():
+    rng = np.random.default_rng(11)
+    values = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, (60, 8)), axis=0))
+    values[:10, 3] = np.nan
+    values[[20, 21], 5] = np.nan
+    return values
+
+
+def test_cross_sectional_kernels_match_pandas(close):
+    frame = pd.DataFrame(close)
+    np.testing.assert_allclose(cs_rank(close), frame.rank(axis=1, pct=True), equal_nan=True)
+    expected = frame.sub(frame.mean(axis=1), axis=0).div(frame.std(axis=1, ddof=0), axis=0)
+    np.testing.assert_allclose(cs_zscore(close), expected, equal_nan=True)
+    np.testing.assert_allclose(ts_std(close, 5), frame.rolling(5).std(), equal_nan=True, atol=1e-10)
+
+
+def test_rank_averages_ties():
+    np.testing.assert_allclose(cs_rank(np.array([3.0, 1.0, 3.0, np.nan]), pct=False), [2.5, 1.0, 2.5, np.nan])
+
+
+def test_winsorize_and_quantile_ignore_nan(close):
+    clipped = cs_winsorize(close, 0.1, 0.9)
+    assert (np.nanmax(clipped, axis=1) <= np.nanmax(close, axis=1)).all()
+    assert np.isnan(clipped[:10, 3]).all()
+    buckets = cs_quantile(close, 4)
+    assert set(np.unique(buckets[~np.isnan(buckets)])) == {0.0, 1.0, 2.0, 3.0}
+
+
+def test_neutralize_removes_group_means_and_size(close):
+    groups = np.array([0, 0, 0, 1, 1, 1, 2, 2])
+    size = np.log(close) * 2 + 1
+    residual = cs_neutralize(close, groups, size)
+    row = residual[30]
+    for code in range(3):
+        assert np.nanmean(row[groups == code]) == pytest.approx(0.0, abs=1e-9)
+    centered = size[30] - np.array([np.nanmean(size[30][groups == code]) for code in groups])
+    assert np.nansum(row * centered) == pytest.approx(0.0, abs=1e-9)
+
+
+def test_shared_subexpressions_are_computed_once(close):
+    engine = FactorEngine({"close": close})
+    returns = pct_change(field("close"))
+    expected = np.r_[[np.full(8, np.nan)], close[1:] / close[:-1] - 1]
+    np.testing.assert_allclose(engine.evaluate(returns), expected, equal_nan=True)
+    misses = engine.cache_info()["misses"]
+
+    factors = engine.evaluate_many({"momentum": rank(ts_mean(returns, 5)), "z": zscore(returns)})
+    # 两个因子共享的 returns 直接命中缓存，只新算 ts_mean、rank、zscore
+    assert engine.cache_info()["misses"] == misses + 3
+    np.testing.assert_allclose(factors["z"], cs_zscore(expected), equal_nan=True)
+    assert not factors["momentum"].flags.writeable
+    engine.clear()
+    assert engine.cache_info()["entries"] == 0
+
+
+def test_caller_arrays_stay_writeable(close):
+    engine = FactorEngine({"close": close, "volume": lambda: close * 100})
+    engine.evaluate(field("close"))
+    engine.evaluate(field("close") * 2)
+    assert close.flags.writeable
+    close[0, 0] = 1.0
+    assert engine.evaluate(field("close"))[0, 0] != 1.0
+
+
+def test_universe_and_groups_restrict_cross_sections(close):
+    universe = np.ones(close.shape, dtype=bool)
+    universe[:, 0] = False
+    engine = FactorEngine({"close": close}, universe=universe, groups={"industry": list("aaabbbcc")})
+    ranked = engine.evaluate(rank(field("close")))
+    assert np.isnan(ranked[:, 0]).all()
+    residual = engine.evaluate(neutralize(field("close"), group="industry"))
+    assert np.nanmean(residual[30, 1:3]) == pytest.approx(0.0, abs=1e-9)
+    with pytest.raises(KeyError):
+        engine.evaluate(neutralize(field("close"), group="sector"))
+
+
+def test_from_panel_reads_the_memory_map_without_copying(tmp_path, make_bars):
+    repository = CsvRepository(tmp_path / "data")
+    for seed, symbol in enumerate(["000001", "000002"]):
+        repository.save(symbol, "stock", make_bars(periods=30, seed=seed))
+    panel = build_panel(repository, tmp_path / "panel")
+    engine = FactorEngine.from_panel(panel, start="20240110", end="20240131")
+    value = engine.evaluate(field("close"))
+    assert np.shares_memory(value, panel.array("close"))
+    assert value.shape == (len(engine.dates), 2)
+    assert engine.frame(rank(field("close"))).columns.tolist() == ["000001", "000002"]
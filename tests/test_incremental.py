@@ -0,0 +1,84 @@
+import pandas as pd
+
+from balancewheel.data.interfaces import DataRequest
+from balancewheel.data.repository import CsvRepository
+from balancewheel.data.service import DataService
+
+
+def stored(repository, symbol="000001"):
+    return repository.load(symbol, "stock")
+
+
+def assert_same_bars(left, right):
+    pd.testing.assert_frame_equal(
+        left.reset_index(drop=True), right.reset_index(drop=True), check_dtype=False
+    )
+
+
+def make_service(tmp_path, provider):
+    return DataService({provider.name: provider}, CsvRepository(tmp_path))
+
+
+def test_first_update_fetches_the_full_range(tmp_path, make_bars, stub_provider):
+    provider = stub_provider(make_bars(periods=40))
+    service = make_service(tmp_path, provider)
+    service.update(DataRequest("000001", "stock", "20240101", "20240331"), "stub")
+    assert [request.start for request in provider.requests] == ["20240101"]
+    assert_same_bars(stored(service.repository), provider.bars)
+
+
+def test_update_appends_only_the_tail_after_a_matching_seam(tmp_path, make_bars, stub_provider):
+    bars = make_bars(periods=60)
+    provider = stub_provider(bars.iloc[:40])
+    service = make_service(tmp_path, provider)
+    service.fetch_and_save(DataRequest("000001", "stock", "20240101", "20240331"), "stub")
+
+    provider.bars = bars
+    provider.requests.clear()
+    service.update(DataRequest("000001", "stock", "20240101", "20240331"), "stub", overlap=5)
+    # 只重取最后 5 根已存 K 线作为接缝
+    assert [request.start for request in provider.requests] == [bars["datetime"].iloc[35].strftime("%Y%m%d")]
+    assert_same_bars(stored(service.repository), bars)
+    assert service.repository.latest_meta("000001", "stock", "none")["rows"] == 60
+
+
+def test_seam_mismatch_falls_back_to_a_full_rewrite(tmp_path, make_bars, stub_provider):
+    bars = make_bars(periods=60)
+    provider = stub_provider(bars.iloc[:40])
+    service = make_service(tmp_path, provider)
+    service.fetch_and_save(DataRequest("000001", "stock", "20240101", "20240331"), "stub")
+
+    # 除权等原因改写了历史价格
+    rewritten = bars.copy()
+    rewritten[["open", "high", "low", "close"]] *= 0.9
+    provider.bars = rewritten
+    provider.requests.clear()
+    service.update(DataRequest("000001", "stock", "20240101", "20240331"), "stub")
+    assert provider.requests[-1].start == "20240101"
+    assert_same_bars(stored(service.repository), rewritten)
+
+
+def test_externally_modified_file_is_rewritten(tmp_path, make_bars, stub_provider):
+    bars = make_bars(periods=40)
+    provider = stub_provider(bars)
+    service = make_service(tmp_path, provider)
+    service.fetch_and_save(DataRequest("000001", "stock", "20240101", "20240331"), "stub")
+    path = service.repository.path_for("000001", "stock")
+    bars.iloc[:10].to_csv(path, index=False)
+
+    provider.requests.clear()
+    service.update(DataRequest("000001", "stock", "20240101", "20240331"), "stub")
+    assert [request.start for request in provider.requests] == ["20240101"]
+    assert_same_bars(stored(service.repository), bars)
+
+
+def test_up_to_date_series_is_not_fetched(tmp_path, make_bars, stub_provider):
+    bars = make_bars(periods=40)
+    provider = stub_provider(bars)
+    service = make_service(tmp_path, provider)
+    last = bars["datetime"].iloc[-1].strftime("%Y%m%d")
+    service.fetch_and_save(DataRequest("000001", "stock", "20240101", last), "stub")
+
+    provider.requests.clear()
+    service.update(DataRequest("000001", "stock", "20240101", last), "stub")
+    assert provider.requests == []
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from balancewheel.strategy.indicators import (
+    ATR,
+    EMA,
+    MACD,
+    RSI,
+    SMA,
+    Bollinger,
+    atr,
+    bollinger,
+    ema,
+    ffill,
+    macd,
+    rsi,
+    sma,
+)
+
+
+@pytest.fixture
+def panel():
+    """日期 × 标的 价格面板：第 2 列晚上市，第 3 列有零散停牌。"""
+    rng = np.random.default_rng(7)
+    close = 10.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, (120, 4)), axis=0))
+    high = close * (1 + rng.uniform(0.0, 0.02, close.shape))
+    low = close * (1 - rng.uniform(0.0, 0.02, close.shape))
+    for values in (close, high, low):
+        values[:30, 1] = np.nan
+        values[[5, 6, 50, 51, 52, 90], 2] = np.nan
+    return high, low, close
+
+
+def stream(indicator, *columns):
+    outputs = [indicator.update(*(column[row] for column in columns)) for row in range(len(columns[0]))]
+    if isinstance(outputs[0], tuple):
+        return tuple(np.stack(part) for part in zip(*outputs))
+    return np.stack(outputs)
+
+
+def assert_same(streamed, batch):
+    np.testing.assert_allclose(streamed, batch, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+def test_streaming_matches_batch_on_a_panel_with_gaps(panel):
+    high, low, close = panel
+    assert_same(stream(SMA(10), close), sma(close, 10))
+    assert_same(stream(EMA(10), close), ema(close, 10))
+    assert_same(stream(RSI(14), close), rsi(close, 14))
+    assert_same(stream(ATR(14), high, low, close), atr(high, low, close, 14))
+    for streamed, batch in zip(stream(MACD(), close), macd(close)):
+        assert_same(streamed, batch)
+    for streamed, batch in zip(stream(Bollinger(20), close), bollinger(close, 20)):
+        np.testing.assert_allclose(streamed, batch, rtol=1e-7, atol=1e-7, equal_nan=True)
+
+
+def test_batch_matches_pandas_on_dense_series(panel):
+    close = pd.Series(panel[2][:, 0])
+    np.testing.assert_allclose(sma(close, 10), close.rolling(10).mean(), equal_nan=True)
+    np.testing.assert_allclose(ema(close, 10), close.ewm(span=10, adjust=False).mean())
+    middle, upper, _ = bollinger(close, 20)
+    np.testing.assert_allclose(middle, close.rolling(20).mean(), equal_nan=True)
+    np.testing.assert_allclose(upper - middle, 2 * close.rolling(20).std(ddof=0), rtol=1e-7, equal_nan=True)
+
+
+def test_nan_bars_are_skipped_and_windows_start_at_listing(panel):
+    close = panel[2]
+    result = sma(close, 10)
+    # 晚上市的标的从第一根有效 K 线起计满 10 根
+    assert np.isnan(result[:39, 1]).all()
+    assert result[39, 1] == pytest.approx(close[30:40, 1].mean())
+    # 停牌当根输出 NaN，复牌后的窗口跳过停牌日
+    assert np.isnan(result[50:53, 2]).all()
+    valid = close[~np.isnan(close[:, 2]), 2]
+    position = np.flatnonzero(~np.isnan(close[:, 2])).tolist().index(53)
+    assert result[53, 2] == pytest.approx(valid[position - 9 : position + 1].mean())
+
+
+def test_ffill_treats_suspensions_as_unchanged_prices(panel):
+    close = panel[2]
+    filled = ffill(close)
+    assert np.isnan(filled[:30, 1]).all()
+    np.testing.assert_array_equal(filled[50:53, 2], close[49, 2])
+
+
+def test_invalid_period_is_rejected():
+    with pytest.raises(ValueError):
+        sma(np.arange(5.0), 0)
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from balancewheel.data.interfaces import DataRequest
+from balancewheel.data.repository import CsvRepository, ParquetRepository
+from balancewheel.data.service import DataService
+
+
+def minute_bars(start, end):
+    """5-minute bars (48 per session) on business days in [start, end]."""
+    days = pd.bdate_range(start, end)
+    offsets = np.r_[np.arange(35, 155, 5), np.arange(245, 365, 5)]
+    times = (days.to_numpy()[:, None] + pd.to_timedelta(9 * 60 + offsets, unit="min").to_numpy()[None, :]).ravel()
+    close = 10 + np.arange(len(times)) * 0.001
+    return pd.DataFrame(
+        {
+            "datetime": times,
+            "open": close,
+            "high": close + 0.01,
+            "low": close - 0.01,
+            "close": close,
+            "volume": np.full(len(times), 100),
+            "amount": close * 100,
+        }
+    )
+
+
+@pytest.fixture
+def provider(stub_provider):
+    class IntradayProvider(stub_provider):
+        def supports_frequency(self, frequency, asset_type):
+            return frequency in ("d", "5")
+
+        def fetch_intraday_ohlcv(self, request):
+            self.requests.append(request)
+            dates = self.bars["datetime"]
+            end = pd.Timestamp(request.end) + pd.Timedelta(days=1)
+            return self.bars[(dates >= pd.Timestamp(request.start)) & (dates < end)].reset_index(drop=True)
+
+    return IntradayProvider(minute_bars("2024-01-01", "2024-03-29"))
+
+
+@pytest.mark.parametrize("repository_type", [CsvRepository, ParquetRepository])
+def test_bars_are_fetched_and_stored_by_month(tmp_path, provider, repository_type):
+    service = DataService({"stub": provider}, repository_type(tmp_path))
+    rows = service.fetch_intraday(DataRequest("000001", "stock", "20240101", "20240331", frequency="5"), "stub")
+    assert rows == len(provider.bars)
+    assert [(pd.Timestamp(r.start).month, pd.Timestamp(r.end).month) for r in provider.requests] == [(1, 1), (2, 2), (3, 3)]
+    partitions = service.repository.list_partitions("000001", "stock", "5")
+    assert [path.stem for path in partitions] == ["2024-01", "2024-02", "2024-03"]
+    assert partitions[0].parent == tmp_path / "5min" / "stock_000001"
+
+    # 只读取相关月份；只有日期的 end 包含当天全部 K 线
+    day = service.repository.load_bars("000001", "stock", "5", start="20240229", end="20240229")
+    assert len(day) == 48 and (day["datetime"].dt.day == 29).all()
+    assert day["volume"].dtype == "int64"
+
+
+def test_incremental_fetch_resumes_on_the_last_stored_day(tmp_path, provider):
+    service = DataService({"stub": provider}, CsvRepository(tmp_path))
+    full = provider.bars
+    provider.bars = full[full["datetime"] < "2024-02-15 12:00"]
+    service.fetch_intraday(DataRequest("000001", "stock", "20240101", "20240229", frequency="5"), "stub")
+
+    provider.bars = full
+    provider.requests.clear()
+    service.fetch_intraday(DataRequest("000001", "stock", "20240101", "20240331", frequency="5"), "stub", incremental=True)
+    assert pd.Timestamp(provider.requests[0].start) == pd.Timestamp("2024-02-15")
+    stored = service.repository.load_bars("000001", "stock", "5")
+    pd.testing.assert_series_equal(stored["datetime"], full["datetime"].reset_index(drop=True), check_names=False)
+
+
+def test_only_unadjusted_intraday_bars_are_stored(tmp_path, provider):
+    service = DataService({"stub": provider}, CsvRepository(tmp_path))
+    with pytest.raises(ValueError):
+        service.fetch_intraday(DataRequest("000001", "stock", "20240101", "20240131", adjust="qfq", frequency="5"), "stub")
+    with pytest.raises(ValueError):
+        service.fetch_intraday(DataRequest("000001", "stock", "20240101", "20240131"), "stub")
+    assert provider.requests == []
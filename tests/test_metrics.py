@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from balancewheel.engine.event import BacktestResult
+from balancewheel.report import (
+    METRIC_COLUMNS,
+    backtest_metrics,
+    compute_metrics,
+    rank_runs,
+    trade_win_rate,
+    write_report,
+)
+
+
+def trades(rows):
+    return pd.DataFrame(rows, columns=["datetime", "symbol", "quantity", "price", "commission", "stamp_tax"])
+
+
+def test_single_curve_metrics():
+    equity = np.array([100.0, 110.0, 99.0, 99.0, 121.0])
+    metrics = compute_metrics(equity, periods_per_year=4).iloc[0]
+    assert list(metrics.index) == METRIC_COLUMNS
+    assert metrics["total_return"] == pytest.approx(0.21)
+    assert metrics["cagr"] == pytest.approx(0.21)
+    assert metrics["max_drawdown"] == pytest.approx(-0.1)
+    assert metrics["max_drawdown_duration"] == 2
+    # 4 根 K 线中 3 根有变动，其中 2 根上涨
+    assert metrics["positive_bar_rate"] == pytest.approx(2 / 3)
+    assert np.isnan(metrics["win_rate"])
+    assert np.isnan(metrics["turnover"]) and np.isnan(metrics["exposure"])
+
+
+def test_many_runs_match_one_run_at_a_time():
+    rng = np.random.default_rng(3)
+    equity = 1e6 * np.cumprod(1 + rng.normal(0.0005, 0.01, (20, 250)), axis=1)
+    cash = equity * rng.uniform(0.0, 0.5, equity.shape)
+    turnover = equity * rng.uniform(0.0, 0.1, equity.shape)
+    batch = compute_metrics(equity, cash=cash, turnover=turnover)
+    for run in (0, 7, 19):
+        single = compute_metrics(equity[run], cash=cash[run], turnover=turnover[run])
+        pd.testing.assert_frame_equal(batch.iloc[[run]].reset_index(drop=True), single)
+
+
+def test_trade_win_rate_uses_average_cost_with_fees():
+    log = trades(
+        [
+            ("2024-01-02", "A", 100, 10.0, 5.0, 0.0),
+            ("2024-01-03", "A", 100, 12.0, 5.0, 0.0),
+            ("2024-01-04", "A", -100, 11.2, 5.0, 1.0),  # 均价 11.05，扣费后 1114 > 1105
+            ("2024-01-05", "A", -100, 11.1, 5.0, 1.0),  # 扣费后 1104 < 1105
+            ("2024-01-02", "B", 100, 10.0, 5.0, 0.0),
+            ("2024-01-05", "B", -100, 9.0, 5.0, 1.0),
+        ]
+    )
+    assert trade_win_rate(log) == pytest.approx(1 / 3)
+    assert np.isnan(trade_win_rate(log.iloc[:2]))
+
+
+def test_backtest_metrics_take_win_rate_from_the_trade_log():
+    dates = pd.bdate_range("2024-01-02", periods=4)
+    log = trades([(dates[0], "A", 100, 10.0, 5.0, 0.0), (dates[2], "A", -100, 9.0, 5.0, 1.0)])
+    result = BacktestResult(
+        equity=pd.Series([1000.0, 1010.0, 985.0, 985.0], index=dates),
+        trades=log,
+        positions=pd.DataFrame({"A": [100, 100, 0, 0]}, index=dates),
+    )
+    metrics = backtest_metrics(result).iloc[0]
+    assert metrics["win_rate"] == 0.0
+    assert metrics["positive_bar_rate"] == pytest.approx(0.5)
+    assert metrics["exposure"] == pytest.approx(0.5)
+
+
+def test_report_writes_csv_and_html(tmp_path):
+    rng = np.random.default_rng(0)
+    equity = 1e6 * np.cumprod(1 + rng.normal(0, 0.01, (3, 50)), axis=1)
+    metrics = rank_runs(compute_metrics(equity), by="sharpe")
+    assert metrics["sharpe"].is_monotonic_decreasing
+    frame = pd.DataFrame(equity.T, index=pd.bdate_range("2024-01-02", periods=50))
+    paths = write_report(metrics, tmp_path, equity=frame, top=2)
+    assert len(pd.read_csv(paths["csv"])) == 3
+    assert paths["html"].read_text(encoding="utf-8").count("<svg") == 2
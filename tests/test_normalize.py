@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+from balancewheel.data.interfaces import DataRequest
+from balancewheel.data.normalize import normalize_chunks, normalize_ohlcv
+from balancewheel.data.repository import CsvRepository
+from balancewheel.data.schema import STANDARD_COLUMNS, STANDARD_DTYPES
+from balancewheel.data.service import DataService
+
+
+def akshare_frame(make_bars, periods=50):
+    """Bars in akshare's raw layout: Chinese headers, string dates and volume in lots (手)."""
+    bars = make_bars(periods=periods)
+    return pd.DataFrame(
+        {
+            "日期": bars["datetime"].dt.strftime("%Y-%m-%d"),
+            "开盘": bars["open"],
+            "收盘": bars["close"],
+            "最高": bars["high"],
+            "最低": bars["low"],
+            "成交量": bars["volume"] / 100,
+            "成交额": bars["amount"],
+            "换手率": bars["turnover"],
+        }
+    )
+
+
+def reference(frame, volume_multiplier=1):
+    """The original multi-pass pandas implementation."""
+    from balancewheel.data.normalize import COLUMN_ALIASES
+
+    data = frame.rename(columns={column: COLUMN_ALIASES[column] for column in frame if column in COLUMN_ALIASES})
+    for column in STANDARD_COLUMNS:
+        if column not in data.columns:
+            data[column] = np.nan
+    data = data[STANDARD_COLUMNS].copy()
+    data["datetime"] = pd.to_datetime(data["datetime"])
+    numeric = STANDARD_COLUMNS[1:]
+    data[numeric] = data[numeric].apply(pd.to_numeric, errors="coerce")
+    prices = ["open", "high", "low", "close"]
+    data[prices] = data[prices].ffill().fillna(0)
+    data[numeric] = data[numeric].fillna(0)
+    data["volume"] = (data["volume"] * volume_multiplier).round()
+    return data.astype(STANDARD_DTYPES)
+
+
+def with_gaps(frame):
+    frame = frame.astype({"开盘": object})
+    frame.loc[[0, 7, 8, 20, 33], "收盘"] = np.nan
+    frame.loc[[8, 21], "成交量"] = np.nan
+    frame.loc[12, "开盘"] = "-"
+    return frame
+
+
+def test_single_pass_matches_the_reference_implementation(make_bars):
+    raw = with_gaps(akshare_frame(make_bars))
+    pd.testing.assert_frame_equal(normalize_ohlcv(raw, volume_multiplier=100), reference(raw, 100))
+
+
+def test_output_has_fixed_columns_and_dtypes(make_bars):
+    data = normalize_ohlcv(akshare_frame(make_bars))
+    assert list(data.columns) == STANDARD_COLUMNS
+    assert {column: str(dtype) for column, dtype in data.dtypes.items()} == STANDARD_DTYPES
+    assert (data["amplitude"] == 0).all()
+
+
+def test_volume_multiplier_converts_lots_to_shares(make_bars):
+    raw = akshare_frame(make_bars)
+    raw.loc[0, "成交量"] = 12.345
+    data = normalize_ohlcv(raw, volume_multiplier=100)
+    assert data.loc[0, "volume"] == 1234
+    np.testing.assert_array_equal(data["volume"].iloc[1:], make_bars(periods=50)["volume"].iloc[1:])
+
+
+def test_chunked_normalization_equals_a_single_pass(make_bars):
+    raw = with_gaps(akshare_frame(make_bars))
+    whole = normalize_ohlcv(raw, volume_multiplier=100)
+    # 切分点落在缺失值上，前值填充需要跨块延续
+    bounds = [0, 8, 9, 21, 40, len(raw)]
+    chunks = [raw.iloc[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+    chunked = pd.concat(normalize_chunks(chunks, volume_multiplier=100), ignore_index=True)
+    pd.testing.assert_frame_equal(chunked, whole)
+
+
+def test_service_stores_volume_in_shares_for_every_provider(tmp_path, make_bars, stub_provider):
+    class LotProvider(stub_provider):
+        def volume_multiplier(self, asset_type):
+            return 100
+
+    bars = make_bars(periods=30)
+    lots = LotProvider(bars.assign(volume=bars["volume"] / 100), name="lots")
+    shares = stub_provider(bars, name="shares")
+    service = DataService({"lots": lots, "shares": shares}, CsvRepository(tmp_path))
+    try:
+        service.fetch_and_save(DataRequest("000001", "stock", "20240101", "20240229"), "lots")
+    finally:
+        service.close()
+    stored = service.repository.load("000001", "stock")
+    np.testing.assert_array_equal(stored["volume"], bars["volume"].iloc[: len(stored)])
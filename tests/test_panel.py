@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from balancewheel.data.panel import Panel, build_panel
+from balancewheel.data.repository import CsvRepository
+
+
+@pytest.fixture
+def repository(tmp_path, make_bars):
+    repository = CsvRepository(tmp_path / "data")
+    first = make_bars(periods=30, seed=1)
+    second = make_bars(periods=30, seed=2).iloc[5:].reset_index(drop=True)
+    second.loc[3, "volume"] = 0
+    repository.save("000001", "stock", first)
+    repository.save("510300", "etf", second)
+    return repository
+
+
+def test_panel_aligns_series_on_the_union_of_dates(tmp_path, repository):
+    panel = build_panel(repository, tmp_path / "panel")
+    assert panel.symbols == ["510300", "000001"]
+    assert panel.shape == (30, 2)
+    stored = repository.load("510300", "etf")
+    column = panel.symbols.index("510300")
+    close = panel.array("close")[:, column]
+    assert np.isnan(close[:5]).all()
+    np.testing.assert_allclose(close[5:], stored["close"].to_numpy())
+
+
+def test_mask_flags_missing_and_zero_volume_bars(tmp_path, repository):
+    panel = build_panel(repository, tmp_path / "panel", series=[("stock", "000001"), ("etf", "510300")])
+    mask = panel.mask("510300")
+    assert not mask[:5].any()
+    assert not mask[5 + 3]
+    assert mask[5:].sum() == 24
+    assert panel.mask("000001").all()
+
+
+def test_views_slice_by_date_and_symbol_without_copying(tmp_path, repository):
+    build_panel(repository, tmp_path / "panel", series=[("stock", "000001"), ("etf", "510300")])
+    panel = Panel(tmp_path / "panel")
+    view = panel.view("close", symbols=slice("000001", "510300"), start="2024-01-10", end="2024-01-19")
+    assert view.shape == (8, 2)
+    assert np.shares_memory(view, panel.array("close"))
+    assert panel.view("close", symbols="000001").shape == (30,)
+    with pytest.raises(KeyError):
+        panel.array("unknown")
+
+
+def test_explicit_dates_drop_bars_outside_them(tmp_path, repository):
+    dates = repository.load("000001", "stock")["datetime"].iloc[::2]
+    panel = build_panel(repository, tmp_path / "panel", dates=dates)
+    assert panel.shape == (15, 2)
+
+
+def test_duplicate_symbols_are_rejected(tmp_path, repository, make_bars):
+    repository.save("000001", "index", make_bars(periods=5))
+    with pytest.raises(ValueError):
+        build_panel(repository, tmp_path / "panel")
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from balancewheel.data.calendar import TradingCalendar
+from balancewheel.data.interfaces import DataRequest
+from balancewheel.data.periods import period_keys, period_start, resample_bars, update_periods
+from balancewheel.data.repository import CsvRepository
+from balancewheel.data.service import DataService
+
+SESSIONS = pd.bdate_range("2024-01-02", "2024-03-29").difference(pd.bdate_range("2024-02-09", "2024-02-16"))
+
+
+@pytest.fixture
+def calendar():
+    return TradingCalendar(SESSIONS)
+
+
+def reference(daily, rule):
+    grouped = daily.set_index("datetime").groupby(pd.Grouper(freq=rule))
+    bars = grouped.agg(
+        {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum", "amount": "sum"}
+    )
+    bars["label"] = grouped["close"].apply(lambda close: close.index.max())
+    return bars.dropna(subset=["close"]).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("frequency, rule", [("w", "W-SUN"), ("m", "ME")])
+def test_resample_matches_pandas_grouping(make_bars, frequency, rule):
+    daily = make_bars(dates=SESSIONS)
+    bars = resample_bars(daily, frequency)
+    expected = reference(daily, rule)
+    assert bars["datetime"].tolist() == expected["label"].tolist()
+    for column in ["open", "high", "low", "close", "volume", "amount"]:
+        np.testing.assert_allclose(bars[column], expected[column], err_msg=column)
+    close = bars["close"].to_numpy()
+    np.testing.assert_allclose(bars["change"].iloc[1:], close[1:] - close[:-1])
+    assert np.isnan(bars["change_pct"].iloc[0])
+
+
+def test_period_keys_and_starts():
+    dates = pd.to_datetime(["2024-01-07", "2024-01-08", "2024-01-31", "2024-02-01"])
+    weeks = period_keys(dates, "w")
+    assert weeks[0] != weeks[1] and weeks[1] == weeks[2] - 3
+    assert len(set(period_keys(dates, "m"))) == 2
+    assert period_start("2024-01-10", "w") == pd.Timestamp("2024-01-08")
+    assert period_start("2024-01-10", "m") == pd.Timestamp("2024-01-01")
+    with pytest.raises(ValueError):
+        period_keys(dates, "q")
+
+
+def test_suspended_periods_take_the_calendar_label(make_bars, calendar):
+    # 周三之后停牌至下周，1 月最后一周同样停牌
+    dates = SESSIONS[(SESSIONS != "2024-01-04") & (SESSIONS != "2024-01-05")]
+    dates = dates[(dates < "2024-01-30") | (dates >= "2024-02-01")]
+    daily = make_bars(dates=dates)
+    weekly = resample_bars(daily, "w", calendar)
+    monthly = resample_bars(daily, "m", calendar)
+    assert weekly["datetime"].iloc[0] == pd.Timestamp("2024-01-05")
+    assert monthly["datetime"].iloc[0] == pd.Timestamp("2024-01-31")
+    # 尚未结束的最后一个周期仍以最后交易日标记
+    open_month = resample_bars(daily[daily["datetime"] < "2024-01-30"], "m", calendar)
+    assert open_month["datetime"].iloc[-1] == pd.Timestamp("2024-01-29")
+
+
+@pytest.mark.parametrize("frequency", ["w", "m"])
+@pytest.mark.parametrize("split", ["2024-01-04", "2024-01-30", "2024-02-21", "2024-03-04"])
+def test_incremental_update_equals_full_rebuild(make_bars, calendar, frequency, split):
+    dates = SESSIONS[(SESSIONS != "2024-01-04") & (SESSIONS != "2024-01-05")]
+    dates = dates[(dates < "2024-01-30") | (dates >= "2024-02-01")]
+    daily = make_bars(dates=dates)
+    head = daily[daily["datetime"] < split]
+    existing = resample_bars(head, frequency, calendar)
+    since = daily["datetime"][daily["datetime"] >= split].iloc[0]
+
+    updated = update_periods(existing, daily, frequency, calendar, since=since)
+    pd.testing.assert_frame_equal(updated, resample_bars(daily, frequency, calendar), check_dtype=False)
+
+
+def test_service_maintains_periods_on_fetch_and_update(tmp_path, make_bars, stub_provider, calendar):
+    daily = make_bars(dates=SESSIONS)
+    provider = stub_provider(daily.iloc[:30])
+    service = DataService({"stub": provider}, CsvRepository(tmp_path), calendar=calendar)
+    request = DataRequest("000001", "stock", "20240101", "20240331")
+    service.fetch_and_save(request, "stub")
+
+    provider.bars = daily
+    service.update(request, "stub")
+    stored = service.repository.load("000001", "stock")
+    for frequency in ["w", "m"]:
+        bars = service.repository.load_periods("000001", "stock", frequency)
+        pd.testing.assert_frame_equal(
+            bars, resample_bars(stored, frequency, calendar), check_dtype=False, check_exact=False
+        )
+    march = service.repository.load_periods("000001", "stock", "m", start="20240301")
+    assert march["datetime"].tolist() == [pd.Timestamp("2024-03-29")]
+
+    service.repository.period_path_for("000001", "stock", "w").unlink()
+    assert service.rebuild_periods() == 1
+    assert service.repository.period_path_for("000001", "stock", "w").exists()
@@ -0,0 +1,100 @@
+import threading
+import time
+
+import pandas as pd
+
+from balancewheel.data.interfaces import DataRequest
+from balancewheel.data.providers.cache import CachedProvider, ProviderCache
+
+
+def frame(rows=10, value=1.0):
+    return pd.DataFrame({"日期": pd.bdate_range("2024-01-01", periods=rows), "收盘": [value] * rows})
+
+
+def test_put_then_get_round_trips_and_counts_hits(tmp_path):
+    cache = ProviderCache(tmp_path)
+    assert cache.get("a") is None
+    cache.put("a", frame(), fetched_on="20240131")
+    data, entry = cache.get("a")
+    pd.testing.assert_frame_equal(data, frame())
+    assert entry["fetched_on"] == "20240131"
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.entries) == (1, 1, 1)
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_expired_entries_are_removed(tmp_path):
+    cache = ProviderCache(tmp_path, ttl=0.01)
+    cache.put("a", frame())
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert not (tmp_path / "a.pkl.gz").exists()
+    assert cache.stats.entries == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ProviderCache(tmp_path)
+    cache.put("a", frame(200))
+    size = cache.stats.bytes
+    cache.max_bytes = int(size * 2.5)
+    cache.put("b", frame(200, 2.0))
+    cache.get("a")
+    cache.put("c", frame(200, 3.0))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats.evictions == 1
+
+
+def test_index_survives_reopening(tmp_path):
+    ProviderCache(tmp_path).put("a", frame())
+    assert ProviderCache(tmp_path).get("a") is not None
+
+
+def test_corrupt_entry_is_a_miss_and_is_dropped(tmp_path):
+    cache = ProviderCache(tmp_path)
+    cache.put("a", frame())
+    (tmp_path / "a.pkl.gz").write_bytes(b"\x1f\x8b\x08truncated")
+    assert cache.get("a") is None
+    assert cache.stats.entries == 0
+    assert not (tmp_path / "a.pkl.gz").exists()
+    cache.put("a", frame())
+    assert cache.get("a") is not None
+
+
+def test_concurrent_put_and_get_never_read_partial_files(tmp_path):
+    cache = ProviderCache(tmp_path)
+    cache.put("a", frame(2000))
+    errors = []
+
+    def writer(value):
+        for _ in range(20):
+            cache.put("a", frame(2000, value))
+
+    def reader():
+        for _ in range(50):
+            try:
+                cached = cache.get("a")
+            except Exception as error:  # noqa: BLE001
+                errors.append(error)
+                return
+            if cached is not None:
+                assert len(cached[0]) == 2000
+
+    threads = [threading.Thread(target=writer, args=(value,)) for value in (1.0, 2.0)]
+    threads += [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_cached_provider_serves_repeated_requests(tmp_path, stub_provider):
+    bars = frame(20).rename(columns={"日期": "datetime", "收盘": "close"})
+    provider = stub_provider(bars)
+    cached = CachedProvider(provider, ProviderCache(tmp_path))
+    request = DataRequest("000001", "stock", "20240101", "20240131")
+    first = cached.fetch_daily_ohlcv(request)
+    second = cached.fetch_daily_ohlcv(request)
+    assert len(provider.requests) == 1
+    pd.testing.assert_frame_equal(first, second)
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from balancewheel.data.interfaces import DataRequest
+from balancewheel.data.panel import build_panel
+from balancewheel.data.quality import check_frames, check_panel, check_repository
+from balancewheel.data.repository import CsvRepository
+from balancewheel.data.service import DataService
+
+
+def issues_of(report, symbol):
+    issues = report.issues[report.issues["symbol"] == symbol]
+    return dict(zip(issues["row"], issues["check"]))
+
+
+def test_each_check_flags_the_offending_row(make_bars):
+    bars = make_bars(periods=30)
+    bars.loc[3, "datetime"] = bars.loc[2, "datetime"]
+    bars.loc[6, "high"] = bars.loc[6, "low"] - 0.5
+    bars.loc[9, "close"] = -1.0
+    bars.loc[12, "volume"] = 0
+    bars.loc[15, ["open", "high", "low", "close"]] = bars.loc[14, "close"] * 1.2
+    report = check_frames({"600000": bars})
+    found = issues_of(report, "600000")
+    assert found[3] == "duplicate"
+    assert found[6] == "ohlc"
+    assert {"non_positive", "ohlc"} <= set(report.issues.query("row == 9")["check"])
+    assert found[12] == "zero_volume"
+    assert found[15] == "limit_breach"
+    assert not report.ok
+
+
+def test_limits_follow_the_board_and_boundaries_do_not_leak(make_bars):
+    main = make_bars(periods=10)
+    main.loc[5, ["open", "high", "low", "close"]] = main.loc[4, "close"] * 1.15
+    star = main.copy()
+    # 前一标的的最后一行不作为下一标的的前值
+    other = make_bars(periods=10)
+    other[["open", "high", "low", "close"]] *= 3
+    report = check_frames({"600000": main, "688001": star, "000001": other})
+    assert 5 in issues_of(report, "600000")
+    assert issues_of(report, "688001").get(5) != "limit_breach"
+    assert issues_of(report, "000001") == {}
+
+
+def test_stale_prices_are_counted_across_a_run(make_bars):
+    bars = make_bars(periods=12)
+    bars.loc[2:8, ["open", "high", "low", "close"]] = 12.0
+    report = check_frames({"000001": bars}, stale_bars=5)
+    stale = report.issues[report.issues["check"] == "stale"]
+    assert stale["row"].tolist() == [7, 8]
+    assert stale["value"].tolist() == [5.0, 6.0]
+
+
+def test_quarantine_splits_error_rows(make_bars):
+    bars = make_bars(periods=10)
+    bars.loc[4, "close"] = 0.0
+    report = check_frames({"000001": bars})
+    clean, rows = report.quarantine({"000001": bars})
+    assert len(clean["000001"]) == 9
+    assert rows["symbol"].tolist() == ["000001"]
+    assert "non_positive" in rows["checks"].iloc[0]
+    summary = report.summary().set_index("symbol")
+    assert summary.loc["000001", "rows"] == 10
+
+
+def test_panel_and_frames_agree(tmp_path, make_bars):
+    repository = CsvRepository(tmp_path / "data")
+    bars = make_bars(periods=20)
+    bars.loc[7, "volume"] = 0
+    repository.save("000001", "stock", bars)
+    panel = build_panel(repository, tmp_path / "panel")
+    pd.testing.assert_frame_equal(check_panel(panel).issues, check_frames({"000001": bars}).issues, check_dtype=False)
+
+
+def test_repository_check_uses_adjusted_prices(tmp_path, make_bars):
+    repository = CsvRepository(tmp_path)
+    bars = make_bars(periods=20)
+    # 10 送 10：不复权价格在除权日腰斩
+    bars.loc[10:, ["open", "high", "low", "close"]] /= 2
+    repository.save("000001", "stock", bars)
+    repository.save_factors("000001", "stock", pd.DataFrame({"datetime": [bars["datetime"][10]], "factor": [2.0]}))
+    assert issues_of(check_repository(repository), "000001") == {}
+    assert issues_of(check_repository(repository, adjust="none"), "000001") == {10: "limit_breach"}
+
+
+def test_service_quarantines_bad_rows_instead_of_failing(tmp_path, make_bars, stub_provider):
+    bars = make_bars(periods=20)
+    bars.loc[5, "high"] = bars.loc[5, "low"] - 1
+    service = DataService({"stub": stub_provider(bars)}, CsvRepository(tmp_path), quarantine=True)
+    stored = service.fetch_and_save(DataRequest("000001", "stock", "20240101", "20240331"), "stub")
+    assert len(stored) == 19
+    quarantined = pd.read_csv(tmp_path / "_meta" / "quarantine" / "stub_stock_000001.csv")
+    assert quarantined["checks"].tolist() == ["ohlc"]
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from balancewheel.data.reconcile import ReconciliationError, Tolerance, compare_frames, reconcile
+
+
+def bars(dates, close, volume=None):
+    close = np.asarray(close, dtype="float64")
+    return pd.DataFrame(
+        {
+            "datetime": pd.to_datetime(dates),
+            "open": close,
+            "high": close + 0.1,
+            "low": close - 0.1,
+            "close": close,
+            "volume": np.full(len(close), 1000.0) if volume is None else np.asarray(volume, dtype="float64"),
+        }
+    )
+
+
+def test_identical_frames_reconcile_cleanly():
+    data = bars(["2024-01-02", "2024-01-03"], [10.0, 10.5])
+    report = reconcile({"a": data, "b": data.copy()}, primary="a")
+    assert report.ok
+    assert report.summary["b"] == {"rows": 2, "value": 0, "missing_in_primary": 0, "missing_in_other": 0}
+
+
+def test_outer_join_reports_rows_missing_on_either_side():
+    primary = bars(["2024-01-02", "2024-01-03", "2024-01-04"], [10.0, 10.5, 11.0])
+    other = bars(["2024-01-03", "2024-01-04", "2024-01-05"], [10.5, 11.0, 11.5])
+    mismatches, counts = compare_frames(primary, other, "b")
+    assert counts == {"rows": 2, "value": 0, "missing_in_primary": 1, "missing_in_other": 1}
+    kinds = dict(zip(mismatches["datetime"].dt.strftime("%Y%m%d"), mismatches["kind"]))
+    assert kinds == {"20240102": "missing_in_other", "20240105": "missing_in_primary"}
+
+
+def test_unsorted_inputs_are_aligned_on_datetime():
+    primary = bars(["2024-01-02", "2024-01-03"], [10.0, 10.5])
+    other = primary.iloc[::-1].reset_index(drop=True)
+    mismatches, counts = compare_frames(primary, other, "b")
+    assert mismatches.empty
+    assert counts["rows"] == 2
+
+
+def test_default_tolerances_allow_one_lot_of_volume():
+    # 成交量统一以股比较，容差为一手（100 股）
+    primary = bars(["2024-01-02", "2024-01-03"], [10.0, 10.5], volume=[100000, 100000])
+    other = bars(["2024-01-02", "2024-01-03"], [10.0, 10.5], volume=[100100, 100200])
+    mismatches, counts = compare_frames(primary, other, "b")
+    assert counts["value"] == 1
+    assert mismatches.iloc[0][["column", "primary_value", "other_value"]].tolist() == ["volume", 100000.0, 100200.0]
+
+
+def test_price_differences_beyond_tolerance_are_reported_per_column():
+    primary = bars(["2024-01-02"], [10.0])
+    other = bars(["2024-01-02"], [10.01])
+    mismatches, _ = compare_frames(primary, other, "b")
+    assert set(mismatches["column"]) == {"open", "high", "low", "close"}
+    assert (mismatches["kind"] == "value").all()
+
+
+def test_relative_tolerance_scales_with_the_other_value():
+    primary = bars(["2024-01-02", "2024-01-03"], [100.0, 100.0])
+    other = bars(["2024-01-02", "2024-01-03"], [100.05, 100.2])
+    tolerances = {column: Tolerance(rel=1e-3) for column in ["open", "high", "low", "close", "volume"]}
+    mismatches, counts = compare_frames(primary, other, "b", tolerances=tolerances)
+    assert counts["value"] == 4
+    assert set(mismatches["datetime"].dt.strftime("%Y%m%d")) == {"20240103"}
+
+
+def test_nan_on_one_side_is_a_mismatch_and_on_both_sides_is_not():
+    primary = bars(["2024-01-02", "2024-01-03"], [10.0, 10.5])
+    other = primary.copy()
+    primary.loc[0, "volume"] = np.nan
+    other.loc[:, "volume"] = [np.nan, np.nan]
+    mismatches, counts = compare_frames(primary, other, "b")
+    assert counts["value"] == 1
+    assert mismatches.iloc[0]["datetime"] == pd.Timestamp("2024-01-03")
+
+
+def test_reconciliation_error_carries_the_report():
+    primary = bars(["2024-01-02"], [10.0])
+    report = reconcile({"a": primary, "b": bars(["2024-01-02"], [11.0])}, primary="a")
+    assert not report.ok
+    error = ReconciliationError(report)
+    assert error.report is report
+    assert "a vs b" in str(error)
+
+
+def test_unknown_primary_is_rejected():
+    with pytest.raises(ValueError):
+        reconcile({"a": bars(["2024-01-02"], [10.0])}, primary="b")
@@ -0,0 +1,103 @@
+import pandas as pd
+
+from balancewheel.data.batch import RetryPolicy
+from balancewheel.data.interfaces import DataRequest
+from balancewheel.data.refresh import PRIORITY_MISSING, PRIORITY_STALE, WorkQueue, plan_refresh, run_refresh
+from balancewheel.data.repository import CsvRepository
+from balancewheel.data.service import DataService
+
+START, END = "20240101", "20240329"
+
+
+def make_service(tmp_path, provider):
+    return DataService({provider.name: provider}, CsvRepository(tmp_path), retry=RetryPolicy(attempts=1))
+
+
+def test_plan_puts_missing_before_stale_oldest_first(tmp_path, make_bars, stub_provider):
+    # 65 个工作日恰好到 2024-03-29
+    provider = stub_provider(make_bars(periods=65))
+    service = make_service(tmp_path, provider)
+    service.fetch_and_save(DataRequest("000002", "stock", START, "20240201"), "stub")
+    service.fetch_and_save(DataRequest("000003", "stock", START, "20240115"), "stub")
+    service.fetch_and_save(DataRequest("000004", "stock", START, END), "stub")
+
+    universe = [("stock", symbol) for symbol in ["000001", "000002", "000003", "000004"]]
+    tasks = plan_refresh(service, universe, "stub", END)
+    assert [(task[0], task[2]) for task in tasks] == [
+        ("000001", PRIORITY_MISSING),
+        ("000003", PRIORITY_STALE),
+        ("000002", PRIORITY_STALE),
+    ]
+
+
+def test_rerun_resumes_and_requeues_only_running_tasks(tmp_path, make_bars, stub_provider):
+    provider = stub_provider(make_bars(periods=60))
+    service = make_service(tmp_path, provider)
+    universe = [("stock", f"00000{i}") for i in range(1, 7)]
+    queue = WorkQueue(tmp_path / "_meta" / "refresh.sqlite")
+    job = {"provider": "stub", "start": START, "end": END, "adjust": "none"}
+    queue.reset(job, plan_refresh(service, universe, "stub", END))
+    # 模拟中途崩溃：两个任务已完成，一个仍停在 running
+    queue.complete(queue.claim(2))
+    queue.claim(1)
+
+    counts = run_refresh(service, universe, "stub", START, END, queue=queue, workers=1)
+    assert counts == {"done": 6}
+    fetched = sorted(request.symbol for request in provider.requests)
+    assert fetched == ["000003", "000004", "000005", "000006"]
+    queue.close()
+
+
+def test_unfinished_job_keeps_its_end_across_midnight(tmp_path, make_bars, stub_provider):
+    provider = stub_provider(make_bars(periods=60))
+    service = make_service(tmp_path, provider)
+    universe = [("stock", "000001"), ("stock", "000002")]
+    queue = WorkQueue(tmp_path / "_meta" / "refresh.sqlite")
+    job = {"provider": "stub", "start": START, "end": "20240301", "adjust": "none"}
+    queue.reset(job, plan_refresh(service, universe, "stub", "20240301"))
+    queue.complete(queue.claim(1))
+
+    counts = run_refresh(service, universe, "stub", START, queue=queue, workers=1)
+    assert counts == {"done": 2}
+    assert queue.job()["end"] == "20240301"
+    assert [request.end for request in provider.requests] == ["20240301"]
+    queue.close()
+
+
+def test_failures_retry_then_fail_without_blocking_others(tmp_path, make_bars, stub_provider):
+    provider = stub_provider(make_bars(periods=60))
+    fetch = provider.fetch_daily_ohlcv
+
+    def fetch_daily_ohlcv(request):
+        if request.symbol == "000002":
+            raise OSError("connection reset")
+        return fetch(request)
+
+    provider.fetch_daily_ohlcv = fetch_daily_ohlcv
+    service = make_service(tmp_path, provider)
+    universe = [("stock", "000001"), ("stock", "000002"), ("stock", "000003")]
+    queue = WorkQueue(tmp_path / "_meta" / "refresh.sqlite")
+
+    counts = run_refresh(
+        service, universe, "stub", START, END, queue=queue, workers=1, max_attempts=2, retry_delay=0.01
+    )
+    assert counts == {"done": 2, "failed": 1}
+    failed = queue.tasks("failed")
+    assert failed["symbol"].tolist() == ["000002"]
+    assert failed["attempts"].tolist() == [2]
+    assert "connection reset" in failed["error"].iloc[0]
+    queue.close()
+
+
+def test_deadline_stops_claiming_new_work(tmp_path, make_bars, stub_provider):
+    provider = stub_provider(make_bars(periods=60))
+    service = make_service(tmp_path, provider)
+    universe = [("stock", "000001"), ("stock", "000002")]
+    queue = WorkQueue(tmp_path / "_meta" / "refresh.sqlite")
+
+    counts = run_refresh(
+        service, universe, "stub", START, END, queue=queue, deadline=pd.Timestamp.now() - pd.Timedelta(seconds=1)
+    )
+    assert counts == {"pending": 2}
+    assert provider.requests == []
+    queue.close()
@@ -0,0 +1,93 @@
+import pandas as pd
+import pytest
+
+from balancewheel.data.repository import CsvRepository, FrameCache, ParquetRepository
+from balancewheel.data.schema import STANDARD_DTYPES
+
+
+def test_parquet_round_trip_keeps_standard_dtypes(tmp_path, make_bars):
+    data = make_bars()
+    data["volume"] = data["volume"].astype("float64") + 0.4
+    repository = ParquetRepository(tmp_path)
+    repository.save("000001", "stock", data)
+    loaded = repository.load("000001", "stock")
+    assert {column: str(dtype) for column, dtype in loaded.dtypes.items()} == STANDARD_DTYPES
+    assert (loaded["volume"] == data["volume"].round()).all()
+    pd.testing.assert_frame_equal(loaded.drop(columns="volume"), data.drop(columns="volume"), check_dtype=False)
+
+
+def test_parquet_load_reads_only_requested_columns_and_dates(tmp_path, make_bars):
+    data = make_bars(periods=300)
+    repository = ParquetRepository(tmp_path)
+    repository.save("000001", "stock", data)
+    loaded = repository.load("000001", "stock", start="20240301", end="20240329", columns=["datetime", "close"])
+    expected = data[(data["datetime"] >= "2024-03-01") & (data["datetime"] <= "2024-03-29")]
+    assert list(loaded.columns) == ["datetime", "close"]
+    assert loaded["datetime"].tolist() == expected["datetime"].tolist()
+    assert loaded["close"].tolist() == expected["close"].tolist()
+
+
+def test_repositories_share_the_meta_layout(tmp_path, make_bars):
+    for repository in (CsvRepository(tmp_path / "csv"), ParquetRepository(tmp_path / "parquet")):
+        path = repository.save("510300", "etf", make_bars(periods=5))
+        assert path == repository.root / f"etf_510300{repository.suffix}"
+        assert repository.meta_root.is_dir()
+
+
+def test_load_is_served_from_the_cache_until_the_file_changes(tmp_path, make_bars):
+    repository = CsvRepository(tmp_path)
+    repository.save("000001", "stock", make_bars(periods=20))
+    first = repository.load("000001", "stock")
+    first.loc[0, "close"] = -1.0
+    second = repository.load("000001", "stock")
+    assert (repository.cache.hits, repository.cache.misses) == (1, 1)
+    assert second.loc[0, "close"] != -1.0
+
+    # 绕过 write_meta 直接重写文件，也不能读到旧缓存
+    repository.save("000001", "stock", make_bars(periods=30, seed=1))
+    third = repository.load("000001", "stock")
+    assert len(third) == 30
+    assert repository.cache.misses == 2
+
+
+def test_recorded_fingerprint_avoids_rehashing(tmp_path, make_bars, monkeypatch):
+    from balancewheel.data import repository as module
+
+    repository = CsvRepository(tmp_path)
+    path = repository.save("000001", "stock", make_bars(periods=20))
+    repository.write_meta(
+        {"timestamp": "2024-01-01T00:00:00", "symbol": "000001", "asset_type": "stock", "path": str(path), "fingerprint": "recorded"}
+    )
+    monkeypatch.setattr(module, "file_fingerprint", lambda path: pytest.fail("file was re-hashed"))
+    repository.load("000001", "stock")
+    assert repository._fingerprint(path) == "recorded"
+    # 新进程首次读取时从目录库取指纹
+    assert CsvRepository(tmp_path)._fingerprint(path) == "recorded"
+
+
+def test_csv_slice_reads_in_chunks(tmp_path, make_bars):
+    data = make_bars(periods=300)
+    repository = CsvRepository(tmp_path, cache_bytes=0)
+    repository.chunk_rows = 16
+    repository.save("000001", "stock", data)
+    loaded = repository.load("000001", "stock", start="20240301", end="20240329", columns=["close"])
+    expected = data[(data["datetime"] >= "2024-03-01") & (data["datetime"] <= "2024-03-29")]
+    assert loaded["close"].tolist() == expected["close"].tolist()
+    empty = repository.load("000001", "stock", start="20300101", end="20300201")
+    assert empty.empty and "close" in empty.columns
+
+
+def test_frame_cache_evicts_least_recently_used_within_budget():
+    frame = pd.DataFrame({"value": range(100)})
+    size = int(frame.memory_usage(deep=True).sum())
+    cache = FrameCache(2 * size)
+    cache.put(("a", "f1"), frame)
+    cache.put(("b", "f1"), frame)
+    cache.get(("a", "f1"))
+    cache.put(("c", "f1"), frame)
+    assert cache.get(("b", "f1")) is None
+    assert cache.get(("a", "f1")) is frame
+    # 同一文件换了指纹，旧条目直接释放
+    cache.put(("a", "f2"), frame)
+    assert cache.get(("a", "f1")) is None
+    assert cache.bytes <= cache.max_bytes
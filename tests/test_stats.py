@@ -0,0 +1,64 @@
+import pytest
+
+from balancewheel.data.__main__ import stats as stats_command
+from balancewheel.data.interfaces import DataRequest
+from balancewheel.data.repository import CsvRepository
+from balancewheel.data.service import DataService
+from balancewheel.data.stats import PipelineStats, breakdown
+
+
+def test_child_timings_roll_up_to_the_parent():
+    parent = PipelineStats()
+    child = parent.child()
+    child.record("fetch", 0.2)
+    child.record("fetch.stub", 0.15)
+    child.record("save", 0.05)
+    child.count("rows", 10)
+    assert child.snapshot()["counters"] == {"rows": 10}
+    assert parent.snapshot()["timers"]["fetch"] == {"calls": 1, "seconds": 0.2, "max": 0.2}
+
+    table = breakdown([child.snapshot(), child.snapshot()]).set_index("stage")
+    assert table.loc["fetch", "calls"] == 2
+    # 嵌套阶段不计入占比的分母
+    assert table.loc["fetch", "share"] == pytest.approx(0.8)
+    assert table.loc["fetch.stub", "mean_ms"] == pytest.approx(150.0)
+
+
+def test_disabled_stats_record_nothing():
+    stats = PipelineStats(enabled=False)
+    with stats.stage("fetch"):
+        pass
+    stats.count("rows", 5)
+    assert stats.snapshot() == {"timers": {}, "counters": {}}
+    assert stats.breakdown().empty
+
+
+def test_service_records_stages_per_request(tmp_path, make_bars, stub_provider):
+    service = DataService({"stub": stub_provider(make_bars(periods=30))}, CsvRepository(tmp_path))
+    request = DataRequest("000001", "stock", "20240101", "20240331")
+    service.fetch_and_save(request, "stub")
+    snapshot = service.pipeline_stats()
+    assert {"fetch", "normalize", "validate", "save", "meta"} <= set(snapshot["timers"])
+    assert snapshot["counters"]["rows"] == 30
+    assert snapshot["retries"] == {"stub": 0}
+
+    record = service.repository.latest_meta("000001", "stock", "none")
+    # 元信息写入前的快照随记录保存
+    assert set(record["stats"]["timers"]) == set(snapshot["timers"]) - {"meta"}
+    runs = service.repository.catalog.run_stats()
+    assert len(runs) == 1
+
+
+def test_uninstrumented_service_keeps_no_stats(tmp_path, make_bars, stub_provider):
+    service = DataService({"stub": stub_provider(make_bars(periods=10))}, CsvRepository(tmp_path), instrument=False)
+    service.fetch_and_save(DataRequest("000001", "stock", "20240101", "20240331"), "stub")
+    assert service.pipeline_stats()["timers"] == {}
+    assert service.repository.latest_meta("000001", "stock", "none").get("stats") is None
+
+
+def test_stats_command_prints_the_breakdown(tmp_path, make_bars, stub_provider, capsys):
+    service = DataService({"stub": stub_provider(make_bars(periods=10))}, CsvRepository(tmp_path))
+    service.fetch_and_save(DataRequest("000001", "stock", "20240101", "20240331"), "stub")
+    service.repository.catalog.close()
+    stats_command(str(tmp_path))
+    assert "fetch" in capsys.readouterr().out
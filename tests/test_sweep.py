@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from balancewheel.data.panel import build_panel
+from balancewheel.data.repository import CsvRepository
+from balancewheel.engine.rules import AShareRules
+from balancewheel.engine.sweep import parameter_grid, run_sweep
+
+
+def top_weight(panel, params):
+    """Hold `share` of equity in each symbol whose close is above its `window`-bar mean."""
+    close = np.asarray(panel.array("close"))
+    window = int(params["window"])
+    kernel = np.ones(window) / window
+    mean = np.apply_along_axis(lambda column: np.convolve(column, kernel, mode="full")[: len(column)], 0, close)
+    return np.where(close > mean, float(params["share"]), 0.0)
+
+
+@pytest.fixture
+def panel_root(tmp_path, make_bars):
+    repository = CsvRepository(tmp_path / "data")
+    for seed, symbol in enumerate(["600000", "600001", "600002"]):
+        repository.save(symbol, "stock", make_bars(periods=80, seed=seed))
+    build_panel(repository, tmp_path / "panel")
+    return tmp_path / "panel"
+
+
+GRID = {"top": {"window": [3, 5], "share": [0.2, 0.3]}}
+
+
+def test_parameter_grid_expands_the_product():
+    assert parameter_grid({"a": [1, 2], "b": ["x"]}) == [{"a": 1, "b": "x"}, {"a": 2, "b": "x"}]
+
+
+def test_sweep_runs_every_combination_and_resumes(tmp_path, panel_root):
+    results_path = tmp_path / "results.csv"
+    first = run_sweep({"top": top_weight}, GRID, panel_root, results_path, max_workers=2)
+    assert len(first) == 4
+    assert first["key"].is_unique
+    assert (first["final_equity"] > 0).all()
+
+    rerun = run_sweep({"top": top_weight}, GRID, panel_root, results_path, max_workers=2)
+    assert sorted(rerun["key"]) == sorted(first["key"])
+    assert len(results_path.read_text(encoding="utf-8").splitlines()) == 5
+
+
+def test_changed_inputs_are_not_served_from_earlier_results(tmp_path, panel_root):
+    results_path = tmp_path / "results.csv"
+    base = run_sweep({"top": top_weight}, GRID, panel_root, results_path, max_workers=2)
+    richer = run_sweep(
+        {"top": top_weight}, GRID, panel_root, results_path, max_workers=2, initial_cash=2_000_000.0
+    )
+    assert set(richer["key"]).isdisjoint(base["key"])
+    np.testing.assert_allclose(richer["final_equity"] / 2_000_000.0 - 1, richer["total_return"])
+    costly = run_sweep(
+        {"top": top_weight},
+        GRID,
+        panel_root,
+        results_path,
+        max_workers=2,
+        rules=AShareRules(commission_rate=0.003),
+    )
+    assert set(costly["key"]).isdisjoint(base["key"])
+    by_params = base.set_index("params")["commission"]
+    assert (costly.set_index("params")["commission"] > by_params.loc[costly["params"]].to_numpy()).all()
+    assert len(results_path.read_text(encoding="utf-8").splitlines()) == 13
+
+
+def test_rebuilt_panel_invalidates_results(tmp_path, panel_root, make_bars):
+    results_path = tmp_path / "results.csv"
+    base = run_sweep({"top": top_weight}, GRID, panel_root, results_path, max_workers=1)
+    repository = CsvRepository(tmp_path / "data")
+    repository.save("600003", "stock", make_bars(periods=80, seed=9))
+    build_panel(repository, panel_root)
+    rebuilt = run_sweep({"top": top_weight}, GRID, panel_root, results_path, max_workers=1)
+    assert set(rebuilt["key"]).isdisjoint(base["key"])
@@ -0,0 +1,96 @@
+import pandas as pd
+import pytest
+
+from balancewheel.data.interfaces import DataRequest
+from balancewheel.data.refresh import plan_refresh
+from balancewheel.data.repository import CsvRepository
+from balancewheel.data.service import DataService
+from balancewheel.data.symbols import NotListedError, SymbolMaster
+
+
+@pytest.fixture
+def symbols():
+    return SymbolMaster(
+        pd.DataFrame(
+            {
+                "symbol": ["sh.600000", "000001", "300750", "000001"],
+                "asset_type": ["stock", "stock", "stock", "index"],
+                "name": ["浦发银行", "平安银行", "宁德时代", "上证指数"],
+                "list_date": ["1999-11-10", "1991-04-03", "2024-02-01", "1991-07-15"],
+                "delist_date": [None, "2024-01-31", None, None],
+            }
+        )
+    )
+
+
+def test_master_infers_exchange_and_board_and_keys_by_asset_type(symbols):
+    stock = symbols.get("000001", "stock")
+    index = symbols.get("000001", "index")
+    assert (stock.name, stock.exchange, stock.board) == ("平安银行", "sz", "main")
+    assert (index.name, index.board) == ("上证指数", "index")
+    assert symbols.get("600000", "stock").exchange == "sh"
+    assert symbols.get("300750", "stock").board == "chinext"
+    assert symbols.get("688001", "stock") is None
+
+
+def test_listed_and_universe_filter_by_date(symbols):
+    assert symbols.universe("2024-01-15") == [("stock", "000001"), ("stock", "600000")]
+    assert symbols.universe("2024-03-01") == [("stock", "300750"), ("stock", "600000")]
+    assert len(symbols.listed("2024-03-01", asset_types=None)) == 3
+
+
+def test_clip_restricts_requests_to_the_listing_range(symbols):
+    request = DataRequest("300750", "stock", "20240101", "20240331")
+    assert symbols.clip(request) == DataRequest("300750", "stock", "20240201", "20240331")
+    delisted = DataRequest("000001", "stock", "20240101", "20240331")
+    assert symbols.clip(delisted).end == "20240131"
+    assert symbols.clip(DataRequest("000001", "stock", "20240201", "20240331")) is None
+    inside = DataRequest("600000", "stock", "20240101", "20240331")
+    assert symbols.clip(inside) is inside
+    unknown = DataRequest("688001", "stock", "20240101", "20240331")
+    assert symbols.clip(unknown) is unknown
+
+
+def test_format_converts_codes_per_provider_style(symbols):
+    codes = ["600000", "sz000001", "510300"]
+    assert symbols.format(codes, "akshare") == ["600000", "000001", "510300"]
+    assert symbols.format(codes, "sina") == ["sh600000", "sz000001", "sh510300"]
+    assert symbols.format(codes, "baostock") == ["sh.600000", "sz.000001", "sh.510300"]
+    with pytest.raises(ValueError):
+        symbols.format(codes, "tushare")
+
+
+def test_save_and_load_round_trip(tmp_path, symbols):
+    loaded = SymbolMaster.load(symbols.save(tmp_path / "symbols.csv"))
+    pd.testing.assert_frame_equal(loaded.frame, symbols.frame)
+
+
+def test_service_clips_fetches_and_skips_unlisted_requests(tmp_path, make_bars, stub_provider, symbols):
+    provider = stub_provider(make_bars(periods=65))
+    service = DataService({"stub": provider}, CsvRepository(tmp_path), symbols=symbols)
+
+    service.fetch_and_save(DataRequest("300750", "stock", "20240101", "20240329"), "stub")
+    assert [(request.start, request.end) for request in provider.requests] == [("20240201", "20240329")]
+    with pytest.raises(NotListedError):
+        service.fetch_and_save(DataRequest("000001", "stock", "20240201", "20240329"), "stub")
+
+    provider.requests.clear()
+    requests = [
+        DataRequest("000001", "stock", "20240201", "20240329"),
+        DataRequest("600000", "stock", "20240101", "20240329"),
+    ]
+    result = service.fetch_many(requests, "stub")
+    assert result.skipped == requests[:1]
+    assert list(result.results) == requests[1:]
+    assert [request.symbol for request in provider.requests] == ["600000"]
+    assert result.summary().set_index("symbol").loc["000001", "status"] == "skipped"
+
+
+def test_refresh_plan_leaves_out_unlisted_and_finished_delisted_series(tmp_path, make_bars, stub_provider, symbols):
+    provider = stub_provider(make_bars(periods=65))
+    service = DataService({"stub": provider}, CsvRepository(tmp_path), symbols=symbols)
+    service.fetch_and_save(DataRequest("000001", "stock", "20240101", "20240329"), "stub")
+
+    universe = [("stock", "000001"), ("stock", "300750")]
+    assert plan_refresh(service, universe, "stub", "20240329")[0][0] == "300750"
+    assert [task[0] for task in plan_refresh(service, universe, "stub", "20240115")] == []
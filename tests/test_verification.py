@@ -0,0 +1,111 @@
+import pandas as pd
+import pytest
+
+from balancewheel.data.interfaces import DataRequest
+from balancewheel.data.reconcile import ReconciliationError, reconcile
+from balancewheel.data.repository import CsvRepository
+from balancewheel.data.service import DataService
+from balancewheel.data.verification import VerificationPolicy, Verifier, window_mask
+
+REQUEST = DataRequest("000001", "stock", "20200101", "20231231")
+
+
+def make_service(tmp_path, bars, stub_provider, policy):
+    providers = {"primary": stub_provider(bars, "primary"), "backup": stub_provider(bars.copy(), "backup")}
+    return DataService(providers, CsvRepository(tmp_path), verification=policy)
+
+
+def test_policy_rejects_invalid_settings():
+    with pytest.raises(ValueError):
+        VerificationPolicy(mode="never")
+    with pytest.raises(ValueError):
+        VerificationPolicy(rate=0.5, max_rate=0.2)
+
+
+def test_full_and_new_rows_windows():
+    assert Verifier().windows(REQUEST, "main") == [("20200101", "20231231")]
+    verifier = Verifier(VerificationPolicy(mode="new_rows"))
+    assert verifier.windows(REQUEST, "main") == [("20200101", "20231231")]
+    assert verifier.windows(REQUEST, "main", pd.Timestamp("2023-06-30")) == [("20230701", "20231231")]
+    assert verifier.windows(REQUEST, "main", pd.Timestamp("2023-12-31")) == []
+
+
+def test_sample_windows_are_stratified_and_deterministic_per_run():
+    policy = VerificationPolicy(mode="sample", rate=1.0, windows=4, window_days=20, seed=7)
+    windows = Verifier(policy).windows(REQUEST, "main")
+    assert windows == Verifier(policy).windows(REQUEST, "main")
+    assert len(windows) == 4
+    for start, end in windows:
+        assert (pd.Timestamp(end) - pd.Timestamp(start)).days == 19
+        assert "20200101" <= start <= end <= "20231231"
+    assert windows == sorted(windows)
+    assert Verifier(VerificationPolicy(mode="sample", rate=0.0, seed=7)).windows(REQUEST, "main") == []
+
+
+def test_disagreements_raise_the_stratum_rate_and_clean_checks_decay_it(tmp_path, make_bars):
+    bars = make_bars(periods=5)
+    changed = bars.copy()
+    changed.loc[2, "close"] += 1.0
+    policy = VerificationPolicy(mode="sample", rate=0.1, max_rate=0.3, decay=0.5)
+    verifier = Verifier(policy, tmp_path / "verification.json")
+
+    verifier.record("main", reconcile({"a": bars, "b": changed}, primary="a"))
+    assert verifier.rate("main") == pytest.approx(0.2)
+    verifier.record("main", reconcile({"a": bars, "b": changed}, primary="a"))
+    assert verifier.rate("main") == pytest.approx(0.3)
+    verifier.record("main", reconcile({"a": bars, "b": bars.copy()}, primary="a"))
+    assert verifier.rate("main") == pytest.approx(0.2)
+    assert verifier.rate("chinext") == pytest.approx(0.1)
+
+    verifier.save()
+    summary = Verifier(policy, tmp_path / "verification.json").summary().set_index("stratum")
+    assert summary.loc["main", ["checked", "disagreements", "rows", "mismatched_rows"]].tolist() == [3, 2, 15, 2]
+
+
+def test_window_mask(make_bars):
+    dates = make_bars(periods=10)["datetime"]
+    mask = window_mask(dates, [("20240102", "20240103"), ("20240111", "20240120")])
+    assert dates[mask].dt.strftime("%Y%m%d").tolist() == ["20240102", "20240103", "20240111", "20240112"]
+
+
+def test_new_rows_verifies_full_rewrites_over_the_whole_range(tmp_path, make_bars, stub_provider):
+    bars = make_bars(periods=60)
+    service = make_service(tmp_path, bars.iloc[:40], stub_provider, VerificationPolicy(mode="new_rows"))
+    service.fetch_and_save(DataRequest("000001", "stock", "20240101", "20240331"), "primary")
+
+    backup = service.providers["backup"]
+    backup.requests.clear()
+    # 已存序列后再次全量重写：仍比对整个区间
+    service.fetch_and_save(DataRequest("000001", "stock", "20240101", "20240331"), "primary")
+    assert [(request.start, request.end) for request in backup.requests] == [("20240101", "20240331")]
+
+
+def test_new_rows_verifies_only_appended_rows_on_incremental_updates(tmp_path, make_bars, stub_provider):
+    bars = make_bars(periods=60)
+    service = make_service(tmp_path, bars.iloc[:40], stub_provider, VerificationPolicy(mode="new_rows"))
+    service.fetch_and_save(DataRequest("000001", "stock", "20240101", "20240331"), "primary")
+    last = bars["datetime"].iloc[39]
+
+    for provider in service.providers.values():
+        provider.bars = bars
+        provider.requests.clear()
+    service.update(DataRequest("000001", "stock", "20240101", "20240331"), "primary")
+    first_new = (last + pd.Timedelta(days=1)).strftime("%Y%m%d")
+    assert [request.start for request in service.providers["backup"].requests] == [first_new]
+
+
+def test_sampled_out_requests_skip_secondary_providers(tmp_path, make_bars, stub_provider):
+    bars = make_bars(periods=60)
+    service = make_service(tmp_path, bars, stub_provider, VerificationPolicy(mode="sample", rate=0.0))
+    service.fetch_and_save(DataRequest("000001", "stock", "20240101", "20240331"), "primary")
+    assert service.providers["backup"].requests == []
+
+
+def test_sampled_disagreement_still_raises(tmp_path, make_bars, stub_provider):
+    bars = make_bars(periods=60)
+    service = make_service(tmp_path, bars, stub_provider, VerificationPolicy(mode="sample", rate=1.0, seed=1))
+    backup = service.providers["backup"].bars
+    backup[["open", "high", "low", "close"]] += 1.0
+    with pytest.raises(ReconciliationError):
+        service.fetch_and_save(DataRequest("000001", "stock", "20240101", "20240331"), "primary")
+    assert service.verifier.summary()["disagreements"].tolist() == [1]